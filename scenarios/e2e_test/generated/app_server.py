@@ -0,0 +1,131 @@
+# テスト対象アプリを配信するインメモリ HTTP サーバー
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+# テスト対象アプリのディレクトリ
+APP_DIR = os.path.normpath(
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+        "..",
+        "spec_driven_flows",
+        "generated",
+    )
+)
+
+# gzip 圧縮する Content-Type
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+
+
+class StaticFile:
+    """配信用に事前計算したファイル（本文・gzip 本文・ETag）"""
+
+    def __init__(self, body: bytes, content_type: str):
+        self.body = body
+        self.content_type = content_type
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        self.gzip_body = None
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip_body = compressed
+
+
+def load_files(root: str) -> dict:
+    """root 配下のファイルを読み込み、URLパス → StaticFile の辞書を返す"""
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            url_path = "/" + os.path.relpath(path, root).replace(os.sep, "/")
+            content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type.endswith("javascript"):
+                content_type += "; charset=utf-8"
+            with open(path, "rb") as f:
+                files[url_path] = StaticFile(f.read(), content_type)
+    if "/index.html" in files:
+        files["/"] = files["/index.html"]
+    return files
+
+
+class InMemoryHandler(BaseHTTPRequestHandler):
+    """メモリ上のファイルを配信するハンドラ（ETag 再検証・gzip 対応）"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body: bool):
+        path = unquote(urlsplit(self.path).path)
+        static = self.server.files.get(path)
+        if static is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if static.etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", static.etag)
+            self.end_headers()
+            return
+        body = static.body
+        gzip_accepted = "gzip" in self.headers.get("Accept-Encoding", "")
+        self.send_response(200)
+        if static.gzip_body is not None and gzip_accepted:
+            body = static.gzip_body
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", static.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", static.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticAppServer:
+    """空きポートでアプリをメモリから配信するバックグラウンドサーバー
+
+    ファイルは起動時に1度だけ読み込み、ETag と gzip 本文を事前計算する。
+    """
+
+    def __init__(self, root: str = APP_DIR, host: str = "127.0.0.1"):
+        self.httpd = ThreadingHTTPServer((host, 0), InMemoryHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.files = load_files(root)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        """配信中のベースURL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "StaticAppServer":
+        """配信を開始"""
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """配信を停止"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
@@ -0,0 +1,156 @@
+# テスト失敗時の成果物（スクリーンショット・DOM・コンソールログ・アプリ状態）の保存
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import pytest
+from playwright.sync_api import Error, Page
+
+from results import safe_name, write_json
+
+# セッション中のライターを pytest の設定オブジェクトに保持するキー
+ARTIFACT_WRITER_KEY = pytest.StashKey["ArtifactWriter"]()
+
+# テストごとのコンソールバッファをテスト項目に保持するキー
+CONSOLE_BUFFER_KEY = pytest.StashKey["ConsoleBuffer"]()
+
+# 成果物の出力先（test-results/ 配下）
+ARTIFACTS_DIR = "artifacts"
+
+# アプリの状態を JSON で取り出すスクリプト
+APP_STATE_SCRIPT = """
+() => {
+    try { return JSON.parse(JSON.stringify(window.__appState ?? null)); }
+    catch (e) { return { error: String(e) }; }
+}
+"""
+
+
+class ConsoleBuffer:
+    """ページのコンソールメッセージを直近 limit 件だけ保持するリングバッファ"""
+
+    def __init__(self, page: Page, limit: int = 200):
+        self.page = page
+        self.messages = deque(maxlen=limit)
+        page.on("console", self.append)
+
+    def append(self, message):
+        """コンソールメッセージを追加（古いものから捨てる）"""
+        self.messages.append(
+            {"type": message.type, "text": message.text, "time": time.time()}
+        )
+
+    def detach(self):
+        """ページのイベントから外す"""
+        self.page.remove_listener("console", self.append)
+
+
+class ArtifactWriter:
+    """失敗時に取得した成果物を、バックグラウンドで圧縮して書き出す
+
+    ページからの取得（Playwright の呼び出し）はテストのスレッドで行い、圧縮と
+    書き込みは上限付きのキューを介して別スレッドで行う。キューが満杯のときは
+    空くまで待つ。成功したテストでは何もせず、スレッドも最初の失敗まで起動しない。
+    """
+
+    def __init__(self, directory: str, manifest_name: str = "manifest.json", maxsize=8):
+        self.directory = directory
+        self.manifest_name = manifest_name
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.entries = []
+        self.errors = []
+        self.thread = None
+
+    @property
+    def manifest_path(self) -> str:
+        """今回の実行のマニフェストのパス"""
+        return os.path.join(self.directory, self.manifest_name)
+
+    def capture(self, nodeid: str, page: Page, console: ConsoleBuffer = None):
+        """失敗したテストのページから成果物を取得し、書き込みキューに入れる"""
+        job = {"test": nodeid, "captured_at": time.time(), "files": {}, "errors": {}}
+        for name, get in (
+            ("screenshot.png", lambda: page.screenshot(full_page=True)),
+            ("dom.html", page.content),
+            ("app-state.json", lambda: page.evaluate(APP_STATE_SCRIPT)),
+        ):
+            try:
+                job["files"][name] = get()
+            except Error as error:
+                job["errors"][name] = str(error)
+        if console is not None:
+            job["files"]["console.json"] = list(console.messages)
+        job["url"] = page.url if not page.is_closed() else None
+        self.start()
+        self.queue.put(job)
+
+    def start(self):
+        """書き込みスレッドを起動（起動済みなら何もしない）"""
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self.work, name="artifact-writer", daemon=True
+            )
+            self.thread.start()
+
+    def work(self):
+        """キューの成果物を書き出し続ける（None で終了）"""
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                self.entries.append(self.write(job))
+            except Exception as error:
+                # 1件の失敗で書き込みスレッドを止めない（以降の成果物も書き出す）
+                self.errors.append(f"{job['test']}: {type(error).__name__}: {error}")
+            finally:
+                self.queue.task_done()
+
+    def write(self, job: dict) -> dict:
+        """成果物1件分をファイルに書き出し、マニフェストの項目を返す"""
+        directory = os.path.join(self.directory, safe_name(job["test"]))
+        os.makedirs(directory, exist_ok=True)
+        files = {}
+        for name, data in job["files"].items():
+            if name.endswith(".png"):
+                path = os.path.join(directory, name)  # PNG は圧縮済み
+                with open(path, "wb") as f:
+                    f.write(data)
+            else:
+                if not isinstance(data, str):
+                    data = json.dumps(data, indent=2, ensure_ascii=False)
+                path = os.path.join(directory, name + ".gz")
+                with gzip.open(path, "wt", encoding="utf-8") as f:
+                    f.write(data)
+            files[name] = {
+                "path": os.path.relpath(path, self.directory),
+                "bytes": os.path.getsize(path),
+            }
+        return {
+            "test": job["test"],
+            "url": job["url"],
+            "captured_at": job["captured_at"],
+            "files": files,
+            "errors": job["errors"],
+        }
+
+    def close(self):
+        """キューを書き切ってからマニフェストを書き出す"""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+        write_json(
+            self.manifest_path, {"artifacts": self.entries, "errors": self.errors}
+        )
+
+    def summary(self) -> str:
+        """成果物のサマリー"""
+        return (
+            f"{len(self.entries)} failure artifact(s) indexed in {self.manifest_path}"
+        )
@@ -0,0 +1,97 @@
+# アプリファイルをネットワークを経由せずに応答するルートキャッシュ
+import hashlib
+import mimetypes
+import os
+from urllib.parse import unquote, urlsplit
+
+import pytest
+from playwright.sync_api import Route
+
+from app_server import APP_DIR
+
+# セッション中のキャッシュを pytest の設定オブジェクトに保持するキー
+ASSET_CACHE_KEY = pytest.StashKey["AssetCache"]()
+
+
+class CachedAsset:
+    """キャッシュ済みアセット（内容は content_hash で共有）"""
+
+    def __init__(self, mtime_ns: int, content_hash: str, content_type: str):
+        self.mtime_ns = mtime_ns
+        self.content_hash = content_hash
+        self.content_type = content_type
+
+
+class AssetCache:
+    """base_url 配下のリクエストをアプリのファイルから直接応答するキャッシュ
+
+    URL ごとにファイルの mtime とコンテンツハッシュを保持し、本文はハッシュで
+    共有する。ファイルの mtime が変わったエントリは次のアクセスで読み直す。
+    """
+
+    def __init__(self, base_url: str, root: str = APP_DIR):
+        self.base_url = base_url
+        self.root = os.path.realpath(root)
+        self.entries = {}
+        self.bodies = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def matches(self, url: str) -> bool:
+        """キャッシュ対象の URL かどうか（context.route の URL マッチャー）"""
+        return url.startswith(self.base_url)
+
+    def file_path(self, url: str):
+        """URL に対応するアプリのファイルパス（存在しなければ None）"""
+        relative = unquote(urlsplit(url[len(self.base_url) :]).path) or "index.html"
+        path = os.path.realpath(os.path.join(self.root, relative))
+        if not path.startswith(self.root + os.sep) or not os.path.isfile(path):
+            return None
+        return path
+
+    def lookup(self, url: str):
+        """URL に対応する (本文, CachedAsset) を返す（対象外なら None）"""
+        path = self.file_path(url)
+        if path is None:
+            return None
+        mtime_ns = os.stat(path).st_mtime_ns
+        entry = self.entries.get(url)
+        if entry is not None and entry.mtime_ns == mtime_ns:
+            self.hits += 1
+            return self.bodies[entry.content_hash], entry
+        if entry is not None:
+            self.invalidations += 1
+        self.misses += 1
+        with open(path, "rb") as f:
+            body = f.read()
+        content_hash = hashlib.sha256(body).hexdigest()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        entry = CachedAsset(mtime_ns, content_hash, content_type)
+        self.entries[url] = entry
+        self.bodies[content_hash] = body
+        return body, entry
+
+    def handle(self, route: Route):
+        """キャッシュから応答し、対象外のリクエストはそのまま通す"""
+        cached = self.lookup(route.request.url)
+        if cached is None:
+            route.continue_()
+            return
+        body, entry = cached
+        route.fulfill(
+            status=200,
+            body=body,
+            content_type=entry.content_type,
+            headers={"ETag": f'"{entry.content_hash}"'},
+        )
+
+    def summary(self) -> str:
+        """ヒット／ミス数のサマリー"""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return (
+            f"asset cache: {self.hits} hits, {self.misses} misses "
+            f"({rate:.1f}% hit rate), {self.invalidations} invalidations, "
+            f"{len(self.bodies)} bodies cached"
+        )
@@ -0,0 +1,154 @@
+# 非同期 API（playwright.async_api）用の Page Object
+#
+# 操作のフローは pages.py のものをそのまま使い、run だけを非同期のドライバに
+# 差し替える。1つのイベントループで複数ページを並行して操作できる。
+#
+# 同期 API の Playwright はメインスレッドに自身のイベントループを「実行中」として
+# 設定したまま残すため、同じセッションで同期 API のテストが先に動くと、メイン
+# スレッドでは asyncio.run も新しいループも実行できない。非同期 API の操作は
+# LoopThread（専用スレッドで動き続けるループ）で実行する。
+import asyncio
+import contextvars
+import threading
+from contextlib import asynccontextmanager
+
+import pytest
+from playwright.async_api import Page
+
+from pages import (
+    BasePage,
+    CartDialog,
+    EmployeePage,
+    MenuDetailDialog,
+    MenuPage,
+    PageComponent,
+    TableSessionPage,
+    arm_settle,
+    probe_for,
+)
+from step_timing import step
+
+# セッションで共有する LoopThread を pytest の設定オブジェクトに保持するキー
+ASYNC_LOOP_KEY = pytest.StashKey["LoopThread"]()
+
+
+class LoopThread:
+    """専用スレッドで動き続けるイベントループ
+
+    run はコルーチンをこのループで実行して結果を待つ。呼び出し元の contextvars
+    （ステップの記録先・ロケーターの計測）はコルーチンに引き継ぐ。
+    スレッドは最初の run で起動する。
+    """
+
+    def __init__(self, name: str = "async-playwright"):
+        self.name = name
+        self.loop = None
+        self.thread = None
+
+    def start(self) -> "LoopThread":
+        """ループのスレッドを起動（起動済みなら何もしない）"""
+        if self.thread is None:
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(
+                target=self.loop.run_forever, name=self.name, daemon=True
+            )
+            self.thread.start()
+        return self
+
+    def run(self, coro):
+        """coro をループのスレッドで実行し、結果を返す（例外はそのまま送出）"""
+        self.start()
+        future = contextvars.copy_context().run(
+            asyncio.run_coroutine_threadsafe, coro, self.loop
+        )
+        return future.result()
+
+    async def cancel_pending(self):
+        """ループに残ったタスクを取り消し、非同期ジェネレータを閉じる"""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.loop.shutdown_asyncgens()
+
+    def stop(self):
+        """残ったタスクを片付けてループとスレッドを終了"""
+        if self.thread is None:
+            return
+        self.run(self.cancel_pending())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.loop = self.thread = None
+
+
+def run_in_thread(coro):
+    """coro を新しいループのスレッドで1回だけ実行し、結果を返す（asyncio.run の代わり）"""
+    loop_thread = LoopThread()
+    try:
+        return loop_thread.run(coro)
+    finally:
+        loop_thread.stop()
+
+
+async def run_async(page: Page, flow):
+    """フローを非同期 API のページで実行し、フローの戻り値を返す"""
+    send, value = flow.send, None
+    while True:
+        try:
+            call = send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            probe = probe_for(call)
+            if probe is not None:
+                await run_async(page, probe)
+            send, value = flow.send, await call.bind(page)
+        except Exception as error:
+            send, value = flow.throw, error
+
+
+class AsyncPageComponent(PageComponent):
+    """フローを非同期 API で実行するページ部品の基底クラス"""
+
+    def run(self, flow):
+        """フローを実行するコルーチンを返す"""
+        return run_async(self.page, flow)
+
+    async def run_step(self, name: str, flow):
+        """フローを name のステップとして実行"""
+        with step(name):
+            return await self.run(flow)
+
+
+class AsyncBasePage(AsyncPageComponent, BasePage):
+    """非同期ベースページクラス"""
+
+    @asynccontextmanager
+    async def settle(self, selector: str, quiet_ms: int = None, timeout_ms: int = None):
+        """ブロック内の操作で selector 配下が変化し、静止するまで待機"""
+        with step(f"{type(self).__name__}.settle"):
+            await self.run(arm_settle(selector))
+            yield
+            await self.run(self.wait_settle(selector, quiet_ms, timeout_ms))
+
+
+class AsyncTableSessionPage(AsyncBasePage, TableSessionPage):
+    """テーブルセッション開始ページ（非同期）"""
+
+
+class AsyncMenuPage(AsyncBasePage, MenuPage):
+    """メニューページ（非同期）"""
+
+
+class AsyncMenuDetailDialog(AsyncPageComponent, MenuDetailDialog):
+    """メニュー詳細ダイアログ（非同期）"""
+
+
+class AsyncCartDialog(AsyncPageComponent, CartDialog):
+    """カートダイアログ（非同期）"""
+
+
+class AsyncEmployeePage(AsyncBasePage, EmployeePage):
+    """従業員ページ（非同期）"""
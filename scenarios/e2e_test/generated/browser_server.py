@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""pytest の実行をまたいで使い回す常駐ブラウザ
+
+Chromium をリモートデバッグ有効で常駐させ、ロックファイルに接続先を書き出す。
+以降の pytest は起動の代わりに connect_over_cdp で接続する。一定時間使われ
+なければ自動で終了する。
+
+使用例:
+    python -m pytest tests/ --browser-server   # 未起動なら起動して接続
+    python browser_server.py status
+    python browser_server.py stop
+
+常駐ブラウザの終了（stop）はシグナルを使うため POSIX 環境のみ対応。
+"""
+
+import argparse
+import getpass
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import pytest
+
+# 常駐ブラウザへの接続状態を pytest の設定オブジェクトに保持するキー
+BROWSER_SERVER_KEY = pytest.StashKey[str]()
+
+
+def user_name() -> str:
+    """一時ファイル名に使うユーザー名（取得できなければ "user"）"""
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):  # 環境変数にもパスワードデータベースにもない場合
+        return "user"
+
+
+# 接続先を書き出すロックファイル（ユーザーごと）
+DEFAULT_LOCKFILE = os.path.join(
+    tempfile.gettempdir(), f"restaurant-e2e-browser-{user_name()}.json"
+)
+
+# 既定のアイドルタイムアウト（秒）
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+
+# Playwright の headless 起動に合わせた Chromium の引数
+CHROMIUM_ARGS = [
+    "--headless",
+    "--no-sandbox",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--remote-debugging-address=127.0.0.1",
+    "--remote-debugging-port=0",
+]
+
+
+def http_json(url: str, timeout: float = 1.0):
+    """DevTools の HTTP エンドポイントから JSON を取得（失敗時は None）"""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+
+class BrowserServer:
+    """ロックファイルで共有する常駐ブラウザ"""
+
+    def __init__(self, lockfile: str = DEFAULT_LOCKFILE):
+        self.lockfile = lockfile
+        self.starting = lockfile + ".starting"
+
+    def read(self) -> dict:
+        """ロックファイルの内容（なければ None）"""
+        try:
+            with open(self.lockfile, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def endpoint(self) -> str:
+        """ヘルスチェックに通った接続先（常駐していなければ None）"""
+        info = self.read()
+        if info is None:
+            return None
+        version = http_json(info["endpoint"] + "/json/version")
+        if not version or "webSocketDebuggerUrl" not in version:
+            return None
+        return info["endpoint"]
+
+    def touch(self):
+        """使用中であることを記録（アイドル時間をリセット）"""
+        try:
+            os.utime(self.lockfile)
+        except OSError:
+            pass
+
+    def idle_seconds(self) -> float:
+        """最後に使われてからの秒数"""
+        try:
+            return time.time() - os.stat(self.lockfile).st_mtime
+        except OSError:
+            return float("inf")
+
+    def start(self, executable: str, idle_timeout: float, timeout: float = 10.0):
+        """常駐ブラウザを起動して接続先を返す（起動できなければ None）
+
+        複数のプロセスが同時に起動しようとした場合は1つだけが起動し、他は
+        ロックファイルに接続先が書かれるまで待つ。
+        """
+        try:
+            fd = os.open(self.starting, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.close(fd)
+            owner = True
+        except FileExistsError:
+            owner = False
+            try:
+                if time.time() - os.stat(self.starting).st_mtime > timeout:
+                    os.remove(self.starting)  # 起動に失敗したプロセスの残骸
+            except OSError:
+                pass
+        if owner:
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "serve",
+                    "--lockfile",
+                    self.lockfile,
+                    "--idle-timeout",
+                    str(idle_timeout),
+                    "--executable",
+                    executable,
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            endpoint = self.endpoint()
+            if endpoint is not None:
+                return endpoint
+            time.sleep(0.05)
+        return None
+
+    def stop(self) -> bool:
+        """常駐ブラウザを終了する（常駐していなければ False）
+
+        SIGTERM で後片付けさせるため POSIX 環境のみ対応。Windows の os.kill は
+        後片付けせずに強制終了し Chromium が残るので、アイドルタイムアウトに任せる。
+        """
+        if os.name != "posix":
+            raise NotImplementedError("stop は POSIX 環境のみ対応しています")
+        info = self.read()
+        if info is None:
+            return False
+        try:
+            os.kill(info["pid"], signal.SIGTERM)
+        except OSError:  # 異常終了したプロセスのロックファイル
+            os.remove(self.lockfile)
+            return False
+        return True
+
+    def connect(self, playwright, executable: str = None, idle_timeout=None):
+        """常駐ブラウザに接続し、(ブラウザ, 状態) を返す
+
+        常駐していなければ起動する。接続できなければ (None, 理由) を返し、
+        呼び出し側は通常どおりブラウザを起動する。
+        """
+        endpoint, state = self.endpoint(), "reused"
+        if endpoint is None:
+            endpoint, state = (
+                self.start(
+                    executable or playwright.chromium.executable_path,
+                    DEFAULT_IDLE_TIMEOUT if idle_timeout is None else idle_timeout,
+                ),
+                "started",
+            )
+        if endpoint is None:
+            return None, "server did not start"
+        try:
+            browser = playwright.chromium.connect_over_cdp(endpoint)
+        except Exception as error:  # 接続直前に終了した場合など
+            return None, f"connect failed: {error}"
+        self.touch()
+        return browser, f"{state} {endpoint}"
+
+
+def devtools_port(user_data_dir: str, process, timeout: float = 10.0) -> int:
+    """Chromium が書き出す DevToolsActivePort からポート番号を読む"""
+    path = os.path.join(user_data_dir, "DevToolsActivePort")
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return int(f.readline())
+        except (OSError, ValueError):
+            time.sleep(0.02)
+    raise RuntimeError("Chromium のリモートデバッグポートを取得できませんでした")
+
+
+def in_use(endpoint: str) -> bool:
+    """アプリのページを開いている接続があるか"""
+    targets = http_json(endpoint + "/json/list") or []
+    return any(
+        target.get("type") == "page" and target.get("url", "").startswith("http")
+        for target in targets
+    )
+
+
+def serve(lockfile: str, idle_timeout: float, executable: str):
+    """Chromium を起動し、アイドルタイムアウトまで見守る"""
+    server = BrowserServer(lockfile)
+    user_data_dir = tempfile.mkdtemp(prefix="restaurant-e2e-chromium-")
+    process = subprocess.Popen(
+        [executable, *CHROMIUM_ARGS, f"--user-data-dir={user_data_dir}"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        endpoint = f"http://127.0.0.1:{devtools_port(user_data_dir, process)}"
+        info = {"pid": os.getpid(), "endpoint": endpoint, "started_at": time.time()}
+        with open(lockfile + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(lockfile + ".tmp", lockfile)
+        if os.path.exists(server.starting):
+            os.remove(server.starting)
+        while process.poll() is None:
+            time.sleep(min(idle_timeout, 5))
+            if in_use(endpoint):
+                server.touch()
+            elif server.idle_seconds() > idle_timeout:
+                break
+    finally:
+        info = server.read()
+        if info is not None and info["pid"] == os.getpid():
+            os.remove(lockfile)
+        if os.path.exists(server.starting):
+            os.remove(server.starting)  # 起動に失敗した場合
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["status", "stop", "serve"])
+    parser.add_argument("--lockfile", default=DEFAULT_LOCKFILE)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--executable", help="Chromium の実行ファイル（serve 用）")
+    args = parser.parse_args(argv)
+
+    server = BrowserServer(args.lockfile)
+    if args.command == "serve":
+        serve(args.lockfile, args.idle_timeout, args.executable)
+        return 0
+    if args.command == "stop":
+        try:
+            stopped = server.stop()
+        except NotImplementedError as error:
+            print(error)
+            return 1
+        print("stopped" if stopped else "not running")
+        return 0
+    endpoint = server.endpoint()
+    if endpoint is None:
+        print("not running")
+        return 1
+    print(f"running at {endpoint} (idle {server.idle_seconds():.0f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
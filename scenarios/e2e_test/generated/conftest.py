@@ -1,243 +1,711 @@
+import os
+
 import pytest
+from playwright.async_api import Page as AsyncPage
+from playwright.async_api import async_playwright
 from playwright.sync_api import Playwright, Browser, BrowserContext, Page
 
+from app_server import StaticAppServer
+from artifacts import CONSOLE_BUFFER_KEY, ConsoleBuffer
+from async_pages import (
+    ASYNC_LOOP_KEY,
+    AsyncCartDialog,
+    AsyncEmployeePage,
+    AsyncMenuDetailDialog,
+    AsyncMenuPage,
+    AsyncTableSessionPage,
+    LoopThread,
+)
+from asset_cache import ASSET_CACHE_KEY, AssetCache
+from browser_server import BROWSER_SERVER_KEY, BrowserServer
+from devices import (
+    DEFAULT_DEVICE,
+    DEVICE_RESULTS_KEY,
+    DEVICES,
+    LOCALES,
+    DeviceMatrix,
+    matrix,
+    parse_names,
+)
+from har import (
+    DEFAULT_HAR_DIR,
+    HAR_MODES,
+    HAR_RESULTS_KEY,
+    HarReplay,
+    annotate_recording,
+    describe_stale,
+    har_path,
+    record_options,
+    stale_assets,
+)
+from impact_map import CALL_PASSED_KEY, DEFAULT_MAP, CoverageRecorder, ImpactMap
+from context_pool import CONTEXT_POOL_KEY, ContextPool
+from perf_baseline import (
+    DEFAULT_STORE,
+    PERF_COMPARISONS_KEY,
+    BaselineStore,
+    PerfBaseline,
+    environment_fingerprint,
+)
+from locators import LOCATOR_PROFILE_KEY
+from latency import APP_PROFILE, PROFILES, LatencyProfile, resolve as resolve_latency
+from perf_metrics import PerformanceRecorder
+from menu_benchmark import DEFAULT_MENU_SIZES
+from render_benchmark import DEFAULT_VOLUMES
+from pages import (
+    CartDialog,
+    EmployeePage,
+    MenuDetailDialog,
+    MenuPage,
+    TableSessionPage,
+)
+from seeding import AppSeed
+from step_timing import STEP_TIMINGS_KEY, StepRecorder
+from results import (
+    PERFORMANCE_RESULTS_DIR,
+    TEST_RESULTS_DIR,
+    result_path,
+    safe_name,
+    write_json,
+)
+from visual import (
+    DEFAULT_BASELINE_DIR,
+    VISUAL_REPORT,
+    BaselineCache,
+    VisualSnapshot,
+    describe as describe_visual,
+)
+
+pytest_plugins = ["pytest_plugins"]
+
+# ページに初期化スクリプトを追加するため、使い回したコンテキストでは実行できないフィクスチャ
+ISOLATING_FIXTURES = ("perf_metrics", "app_seed")
+
+
+def pytest_addoption(parser):
+    """コマンドラインオプションの追加"""
+    group = parser.getgroup("restaurant-e2e", "家族向けレストラン注文システム E2E")
+    group.addoption(
+        "--strict-waits",
+        action="store_true",
+        default=False,
+        help="wait_for_timeout による固定スリープを呼んだテストを失敗させる",
+    )
+    group.addoption(
+        "--shard-count",
+        type=int,
+        default=1,
+        help="テストを実行時間に基づいて N 個のシャードに分割する（run_parallel.py が使用）",
+    )
+    group.addoption(
+        "--shard-index",
+        type=int,
+        default=0,
+        help="このプロセスが担当するシャード番号（0 始まり）",
+    )
+    group.addoption(
+        "--browser-server",
+        action="store_true",
+        default=False,
+        help="実行をまたいで常駐するブラウザに接続する（未起動なら起動、接続できなければ通常起動）",
+    )
+    group.addoption(
+        "--browser-server-idle",
+        type=float,
+        default=15,
+        help="常駐ブラウザが使われないまま終了するまでの時間（分）",
+    )
+    group.addoption(
+        "--asset-cache",
+        action="store_true",
+        default=False,
+        help="アプリのファイルを context.route でプロセス内キャッシュから応答する",
+    )
+    group.addoption(
+        "--context-pool-size",
+        type=int,
+        default=0,
+        help="リセットして使い回すブラウザコンテキストの数（0 で無効）",
+    )
+    group.addoption(
+        "--perf-store",
+        default=DEFAULT_STORE,
+        help="パフォーマンスのベースラインを保存する SQLite ファイル",
+    )
+    group.addoption(
+        "--perf-samples",
+        type=int,
+        default=5,
+        help="パフォーマンステストで1指標あたりに取るサンプル数",
+    )
+    group.addoption(
+        "--perf-gate",
+        action="store_true",
+        default=False,
+        help="ベースラインに対して有意な性能劣化があった場合に実行を失敗させる",
+    )
+    group.addoption(
+        "--perf-alpha",
+        type=float,
+        default=0.01,
+        help="回帰判定の有意水準（Mann-Whitney U 検定）",
+    )
+    group.addoption(
+        "--perf-min-change",
+        type=float,
+        default=0.05,
+        help="回帰と判定する中央値の最小悪化率（0.05 = 5%%）",
+    )
+    group.addoption(
+        "--devices",
+        default=None,
+        help=f"devices マーカーのテストを実行するデバイス（{', '.join(DEVICES)} のカンマ区切り、"
+        "マーカーの指定より優先）",
+    )
+    group.addoption(
+        "--device-locales",
+        default=None,
+        help="devices マーカーのテストで組み合わせるロケール（例: ja,en,zh、マーカーの指定より優先）",
+    )
+    group.addoption(
+        "--har",
+        choices=HAR_MODES,
+        default=None,
+        help="record: テストごとにアプリへのリクエストを HAR に記録する、"
+        "replay: 記録した HAR だけで応答する（記録にないリクエストは失敗）",
+    )
+    group.addoption(
+        "--har-dir",
+        default=DEFAULT_HAR_DIR,
+        help="HAR ファイルの保存先",
+    )
+    group.addoption(
+        "--visual",
+        action="store_true",
+        default=False,
+        help="visual マーカーのテスト（スクリーンショットのベースライン比較）を実行する",
+    )
+    group.addoption(
+        "--update-snapshots",
+        action="store_true",
+        default=False,
+        help="visual マーカーのテストを実行し、スクリーンショットを比較せずにベースラインとして"
+        "保存する（ベースラインがないスナップショットは、指定しない限り失敗する）",
+    )
+    group.addoption(
+        "--marker-reports",
+        default=None,
+        help="指定マーカー（例: smoke,e2e,integration）のいずれかを持つテストを1回ずつ実行し、"
+        "マーカーごとの JUnit XML を test-results/ に出力",
+    )
+    group.addoption(
+        "--impact-map",
+        default=DEFAULT_MAP,
+        help="テストごとに実行したアプリの JS 関数を記録する SQLite ファイル",
+    )
+    group.addoption(
+        "--no-coverage",
+        action="store_true",
+        default=False,
+        help="JS カバレッジの記録（影響範囲マップの更新）を行わない",
+    )
+    group.addoption(
+        "--affected",
+        action="store_true",
+        default=False,
+        help="前回の記録以降に変更されたアプリの関数を実行するテストだけを実行",
+    )
+    group.addoption(
+        "--slow-steps",
+        type=int,
+        default=10,
+        help="セッション終了時に表示する、合計時間の長い Page Object 操作の件数（0 で非表示）",
+    )
+    group.addoption(
+        "--profile-locators",
+        action="store_true",
+        default=False,
+        help="Page Object のロケーターごとに解決時間・一致数を記録し、高速な代替との一致を確認する",
+    )
+    group.addoption(
+        "--fast-locators",
+        action="store_true",
+        default=False,
+        help="高速な代替が宣言されたロケーターは代替のセレクタを使う",
+    )
+    group.addoption(
+        "--latency-profile",
+        default=APP_PROFILE,
+        choices=[APP_PROFILE, *PROFILES],
+        help="MockAPI の応答遅延（app: app.js のまま、zero: 遅延なし、realistic: ばらつきあり、"
+        "degraded: 長い遅延と失敗の注入）。@pytest.mark.latency_profile で個別に指定可能",
+    )
+    group.addoption(
+        "--load-tables",
+        default=None,
+        help="負荷テストで段階的に増やす同時テーブル数（例: 1,5,10,25）。指定時のみ load マーカーのテストを実行",
+    )
+    group.addoption(
+        "--benchmark-orders",
+        nargs="?",
+        const=DEFAULT_VOLUMES,
+        default=None,
+        help=f"従業員画面の注文リスト描画のベンチマークで段階的に増やす注文数（省略時 {DEFAULT_VOLUMES}）。"
+        "指定時のみ benchmark マーカーのテストを実行",
+    )
+    group.addoption(
+        "--benchmark-menu",
+        nargs="?",
+        const=DEFAULT_MENU_SIZES,
+        default=None,
+        help=f"生成した大規模メニューでのカテゴリ切り替え・検索のベンチマークで段階的に増やすメニュー件数"
+        f"（省略時 {DEFAULT_MENU_SIZES}）。指定時のみ menu_benchmark マーカーのテストを実行",
+    )
+    group.addoption(
+        "--leak-iterations",
+        type=int,
+        default=None,
+        help="リーク検出で操作を繰り返す回数（例: 20）。指定時のみ leak マーカーのテストを実行",
+    )
+    group.addoption(
+        "--soak-minutes",
+        type=float,
+        default=None,
+        help="ソークテストで1シフト分の操作を圧縮して流す実時間（分、例: 10）。"
+        "指定時のみ soak マーカーのテストを実行",
+    )
+    group.addoption(
+        "--soak-hours",
+        type=float,
+        default=8,
+        help="ソークテストで再現するシフトの長さ（時間）",
+    )
+    group.addoption(
+        "--soak-tables",
+        type=int,
+        default=6,
+        help="ソークテストで客が入れ替わりで着席するテーブル数",
+    )
+    group.addoption(
+        "--load-orders",
+        type=int,
+        default=3,
+        help="負荷テストで1テーブルあたりに確定する注文数",
+    )
+
+
+# ブラウザコンテキストの共通設定
+CONTEXT_ARGS = DEVICES[DEFAULT_DEVICE]
+
 
 @pytest.fixture(scope="session")
-def browser(playwright: Playwright) -> Browser:
-    """セッション全体で使用するブラウザインスタンス"""
+def browser(playwright: Playwright, request) -> Browser:
+    """セッション全体で使用するブラウザインスタンス
+
+    --browser-server 指定時は常駐ブラウザに接続する（close は切断のみ）。
+    """
+    if request.config.getoption("browser_server"):
+        server = BrowserServer()
+        browser, state = server.connect(
+            playwright,
+            idle_timeout=request.config.getoption("browser_server_idle") * 60,
+        )
+        if browser is not None:
+            request.config.stash[BROWSER_SERVER_KEY] = state
+            yield browser
+            browser.close()
+            server.touch()
+            return
+        request.config.stash[BROWSER_SERVER_KEY] = f"launched locally ({state})"
     browser = playwright.chromium.launch(headless=True)
     yield browser
     browser.close()
 
 
+@pytest.fixture(scope="session")
+def table_storage_state(browser: Browser, base_url: str):
+    """テーブルIDごとのログイン済みストレージステートを返すファクトリ
+
+    テーブルセッションの開始（scanTable の往復とメニュー表示待ち）は
+    テーブルIDごとに1度だけ行い、結果の localStorage（demo.session など）を
+    Playwright のストレージステートとしてワーカー内で使い回す。
+    """
+    states = {}
+
+    def get(table_id: str) -> dict:
+        if table_id not in states:
+            context = browser.new_context(**CONTEXT_ARGS)
+            page = context.new_page()
+            page.goto(base_url)
+            page.fill("#tableIdInput", table_id)
+            page.click('#sessionForm button[type="submit"]')
+            page.wait_for_selector("#menuSection:not(.hidden)")
+            states[table_id] = context.storage_state()
+            context.close()
+        return states[table_id]
+
+    return get
+
+
+@pytest.fixture(scope="session")
+def asset_cache(request, base_url: str):
+    """--asset-cache 指定時にセッション全体で共有するアセットキャッシュ"""
+    if not request.config.getoption("asset_cache"):
+        return None
+    cache = AssetCache(base_url)
+    request.config.stash[ASSET_CACHE_KEY] = cache
+    return cache
+
+
+@pytest.fixture(scope="session")
+def setup_context(asset_cache):
+    """新規・リセット後のコンテキストに共通のルートを設定する関数"""
+
+    def setup(context: BrowserContext):
+        if asset_cache is not None:
+            context.route(asset_cache.matches, asset_cache.handle)
+
+    return setup
+
+
+@pytest.fixture(scope="session")
+def run_latency_profile(request) -> LatencyProfile:
+    """--latency-profile で指定した実行全体のレイテンシプロファイル（app の場合は None）"""
+    return resolve_latency(request.config.getoption("latency_profile"))
+
+
 @pytest.fixture(scope="function")
-def context(browser: Browser) -> BrowserContext:
-    """各テスト関数で新しいブラウザコンテキストを作成"""
+def latency_profile(request, run_latency_profile) -> LatencyProfile:
+    """このテストのレイテンシプロファイル（マーカー優先）をテストレポートに記録して返す"""
+    marker = request.node.get_closest_marker("latency_profile")
+    profile = resolve_latency(marker.args[0]) if marker else run_latency_profile
+    request.node.user_properties.append(
+        ("latency_profile", profile.name if profile is not None else APP_PROFILE)
+    )
+    return profile
+
+
+@pytest.fixture(scope="session")
+def context_pool(request, browser: Browser, setup_context, run_latency_profile):
+    """--context-pool-size 指定時に使い回すコンテキストのプール"""
+    size = request.config.getoption("context_pool_size")
+    if size <= 0:
+        yield None
+        return
+    pool = ContextPool(
+        browser,
+        size,
+        CONTEXT_ARGS,
+        setup=setup_context,
+        init_script=(
+            run_latency_profile.script() if run_latency_profile is not None else None
+        ),
+    )
+    request.config.stash[CONTEXT_POOL_KEY] = pool
+    yield pool
+    pool.close()
+
+
+@pytest.fixture(scope="function")
+def context(
+    browser: Browser,
+    request,
+    table_storage_state,
+    setup_context,
+    context_pool,
+    latency_profile,
+    run_latency_profile,
+    har_replay,
+    base_url: str,
+) -> BrowserContext:
+    """各テスト関数で新しいブラウザコンテキストを作成
+
+    ``@pytest.mark.table_session("T1")`` が付いたテストでは、
+    指定テーブルのセッションが開始済みのコンテキストを返す。
+    コンテキストプールが有効な場合は、``@pytest.mark.isolated`` が付いた
+    テスト、ISOLATING_FIXTURES を使うテスト、実行全体と異なるレイテンシ
+    プロファイルを指定したテスト、HAR を記録するテストを除き、プールの
+    コンテキストを使い回す。
+    """
+    marker = request.node.get_closest_marker("table_session")
+    storage_state = None
+    if marker is not None:
+        storage_state = table_storage_state(marker.args[0] if marker.args else "T1")
+
+    recording = request.config.getoption("har") == "record"
+    isolated = (
+        request.node.get_closest_marker("isolated") is not None
+        or any(name in request.fixturenames for name in ISOLATING_FIXTURES)
+        or latency_profile is not run_latency_profile
+        or recording
+    )
+    if context_pool is not None and not isolated:
+        context = context_pool.acquire()
+        if storage_state is not None:
+            context_pool.apply_storage_state(context, storage_state)
+        if har_replay is not None:
+            har_replay.attach(context)
+        yield context
+        if har_replay is not None:
+            har_replay.detach(context)
+        context_pool.release(context)
+        return
+
+    har_file = har_path(request.config.getoption("har_dir"), request.node.nodeid)
     context = browser.new_context(
-        viewport={"width": 375, "height": 667},  # モバイルサイズ（iPhone SE）
-        user_agent="Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15",
+        **CONTEXT_ARGS,
+        storage_state=storage_state,
+        **(record_options(har_file, base_url) if recording else {}),
     )
+    if latency_profile is not None:
+        context.add_init_script(latency_profile.script())
+    setup_context(context)
+    if har_replay is not None:
+        har_replay.attach(context)
     yield context
     context.close()
+    if recording:
+        annotate_recording(har_file, base_url)
+        request.config.stash.setdefault(HAR_RESULTS_KEY, []).append(
+            {"test": request.node.nodeid, "file": har_file}
+        )
 
 
 @pytest.fixture(scope="function")
-def page(context: BrowserContext) -> Page:
-    """各テスト関数で新しいページを作成"""
-    page = context.new_page()
-    return page
+def har_replay(request, base_url: str) -> HarReplay:
+    """--har replay 指定時にこのテストの記録から応答する再生（それ以外は None）
+
+    記録がない場合と、記録したアプリのファイルの内容が現在と異なる場合は
+    テストを失敗させる。テスト終了時に記録にないリクエストがあれば失敗させる。
+    """
+    if request.config.getoption("har") != "replay":
+        yield None
+        return
+    har_file = har_path(request.config.getoption("har_dir"), request.node.nodeid)
+    if not os.path.exists(har_file):
+        pytest.fail(f"HAR が記録されていません（--har record で記録）: {har_file}")
+    stale = stale_assets(har_file)
+    if stale:
+        pytest.fail(
+            f"HAR の記録後にアプリが変更されています（--har record で記録し直す）: "
+            f"{describe_stale(stale)}"
+        )
+    replay = HarReplay(har_file, base_url)
+    yield replay
+    request.config.stash.setdefault(HAR_RESULTS_KEY, []).append(
+        {
+            "test": request.node.nodeid,
+            "file": har_file,
+            "served": replay.served,
+            "unmatched": replay.unmatched,
+        }
+    )
+    if replay.unmatched:
+        pytest.fail(
+            f"HAR に記録されていないリクエストがありました: {', '.join(replay.unmatched)}"
+        )
 
 
 @pytest.fixture(scope="session")
-def base_url() -> str:
-    """テスト対象のベースURL"""
-    return "http://127.0.0.1:5500/scenarios/spec_driven_flows/generated/"
+def impact_map(request):
+    """テスト → 実行したアプリの JS 関数のマップ（--no-coverage 指定時は None）"""
+    if request.config.getoption("no_coverage"):
+        yield None
+        return
+    mapping = ImpactMap(request.config.getoption("impact_map"))
+    yield mapping
+    mapping.close()
 
 
-class BasePage:
-    """ベースページクラス"""
-
-    def __init__(self, page: Page, base_url: str):
-        self.page = page
-        self.base_url = base_url
-
-    def navigate(self):
-        """ページに移動"""
-        self.page.goto(self.base_url)
-        self.page.wait_for_load_state("networkidle")
-
-
-class TableSessionPage(BasePage):
-    """テーブルセッション開始ページ"""
+@pytest.fixture(scope="function")
+def page(
+    context: BrowserContext, context_pool, request, impact_map, base_url: str
+) -> Page:
+    """各テスト関数で新しいページを作成（プール使用時はウォームなページ）
+
+    失敗時の成果物用に直近のコンソールメッセージを保持し、影響範囲マップ用に
+    実行されたアプリの JS 関数と、読み込んだアプリのファイルを記録する。
+    """
+    page = context_pool.page_for(context) if context_pool is not None else None
+    if page is None:
+        page = context.new_page()
+    console = ConsoleBuffer(page)
+    request.node.stash[CONSOLE_BUFFER_KEY] = console
+    coverage = CoverageRecorder(page) if impact_map is not None else None
+    yield page
+    console.detach()
+    if coverage is not None:
+        impact_map.record(
+            request.node.nodeid,
+            impact_map.covered_functions(coverage.stop(), base_url),
+            request.node.stash.get(CALL_PASSED_KEY, False),
+            impact_map.loaded_files(coverage.urls, base_url),
+        )
 
-    # ロケーター
-    TABLE_ID_INPUT = 'input[name="テーブルID"]'
-    START_BUTTON = 'button:has-text("開始")'
 
-    def start_session(self, table_id: str):
-        """テーブルセッションを開始"""
-        self.page.fill(self.TABLE_ID_INPUT, table_id)
-        self.page.click(self.START_BUTTON)
-        self.page.wait_for_selector("text=メニュー")
+@pytest.fixture(scope="function")
+def app_seed(page: Page, request) -> AppSeed:
+    """``@pytest.mark.seed(...)`` の状態を UI 操作なしでページに用意
 
+    ページの読み込みごとに、テーブルセッション・カート・注文を書き込んでから
+    アプリの描画処理を呼ぶ。例::
 
-class MenuPage(BasePage):
-    """メニューページ"""
+        @pytest.mark.seed("T1", orders=["placed", "placed", "in_kitchen"])
+        def test_orders(app_seed, employee_page): ...
+    """
+    marker = request.node.get_closest_marker("seed")
+    seed = AppSeed.from_marker(marker) if marker is not None else AppSeed()
+    seed.apply(page)
+    return seed
 
-    # ロケーター
-    CATEGORY_FILTER = 'select[name="Category"]'
-    SEARCH_INPUT = 'input[placeholder="Search"]'
-    CART_BUTTON = 'button:has(text("🛒"))'
-    CART_COUNT = ".cart-count"
 
-    def menu_item_selector(self, item_name: str) -> str:
-        """メニューアイテムのセレクタを返す"""
-        return f'button:has-text("{item_name}")'
+@pytest.fixture(scope="function")
+def perf_metrics(page: Page, request) -> PerformanceRecorder:
+    """ページのパフォーマンス指標を記録し、performance-results/ に JSON で保存"""
+    recorder = PerformanceRecorder(page)
+    yield recorder
+    recorder.close()
+    if recorder.captures:
+        nodeid = request.node.nodeid
+        path = result_path(
+            request.config, PERFORMANCE_RESULTS_DIR, f"{safe_name(nodeid)}.json"
+        )
+        write_json(path, recorder.to_json(nodeid))
 
-    def filter_by_category(self, category: str):
-        """カテゴリでフィルタリング"""
-        self.page.select_option(self.CATEGORY_FILTER, category)
-        self.page.wait_for_timeout(500)  # フィルタリング完了を待機
 
-    def search_menu(self, keyword: str):
-        """メニューを検索"""
-        self.page.fill(self.SEARCH_INPUT, keyword)
-        self.page.wait_for_timeout(500)
+@pytest.fixture(scope="session")
+def baseline_store(request) -> BaselineStore:
+    """パフォーマンスのベースラインストア"""
+    store = BaselineStore(request.config.getoption("perf_store"))
+    request.config.stash[PERF_COMPARISONS_KEY] = []
+    yield store
+    store.close()
 
-    def click_menu_item(self, item_name: str):
-        """メニューアイテムをクリック"""
-        self.page.click(self.menu_item_selector(item_name))
-        self.page.wait_for_selector("dialog")
 
-    def open_cart(self):
-        """カートを開く"""
-        self.page.click(self.CART_BUTTON)
-        self.page.wait_for_selector('dialog:has-text("カート")')
+@pytest.fixture(scope="function")
+def perf_baseline(
+    request, baseline_store: BaselineStore, browser: Browser, latency_profile
+):
+    """指標のサンプルを集め、テスト終了時にベースラインと比較して保存
+
+    レイテンシプロファイルを差し替えた計測は、別の環境のベースラインとして扱う。
+    失敗したテストのサンプルはベースラインを汚さないよう保存しない。
+    """
+    extra = () if latency_profile is None else (f"latency={latency_profile.name}",)
+    recorder = PerfBaseline(
+        request.node.nodeid,
+        baseline_store,
+        environment_fingerprint(browser.version, *extra),
+    )
+    yield recorder
+    request.config.stash[PERF_COMPARISONS_KEY].extend(
+        recorder.finish(
+            request.config.getoption("perf_alpha"),
+            request.config.getoption("perf_min_change"),
+            record=request.node.stash.get(CALL_PASSED_KEY, False),
+        )
+    )
 
-    def get_cart_count(self) -> int:
-        """カート内の商品数を取得"""
-        count_text = self.page.text_content(self.CART_COUNT)
-        return int(count_text) if count_text.isdigit() else 0
 
+@pytest.fixture(scope="session")
+def visual_baseline_cache(request) -> BaselineCache:
+    """デコード済みのベースライン画像のキャッシュ（numpy・Pillow が必要）"""
+    pytest.importorskip("numpy")
+    pytest.importorskip("PIL")
+    return BaselineCache()
 
-class MenuDetailDialog:
-    """メニュー詳細ダイアログ"""
 
-    def __init__(self, page: Page):
-        self.page = page
+@pytest.fixture(scope="function")
+def visual_snapshot(page: Page, request, visual_baseline_cache: BaselineCache):
+    """スクリーンショットをベースラインと比較し、許容値を超えたら失敗させる関数
+
+    例::
+
+        visual_snapshot("cart", CartDialog.DIALOG, mask=[BasePage.TOAST])
+    """
+    config = request.config
+    snapshot = VisualSnapshot(
+        page,
+        visual_baseline_cache,
+        DEFAULT_BASELINE_DIR,
+        str(config.rootpath / TEST_RESULTS_DIR / "visual"),
+        update=config.getoption("update_snapshots"),
+    )
 
-    # ロケーター
-    DIALOG = "dialog"
-    CLOSE_BUTTON = 'dialog button:has-text("✕")'
-    ADD_TO_CART_BUTTON = 'dialog button:has-text("カートに追加")'
-    CANCEL_BUTTON = 'dialog button:has-text("キャンセル")'
-    QUANTITY_INPUT = 'dialog input[type="number"]'
-    ALLERGY_INFO = 'dialog :text("アレルギー:")'
+    def check(name: str, target: str = None, **options) -> dict:
+        result = snapshot(name, target, **options)
+        VISUAL_REPORT.add(config, result)
+        if result["status"] == "missing":
+            pytest.fail(
+                f"{describe_visual(result)}（--update-snapshots で作成: {result['baseline']}）"
+            )
+        if result["status"] == "changed":
+            pytest.fail(
+                f"{describe_visual(result)}（差分: {result.get('diff', result['actual'])}）"
+            )
+        return result
+
+    return check
+
+
+@pytest.fixture(autouse=True)
+def step_timings(request) -> StepRecorder:
+    """Page Object の操作ごとの所要時間をテストごとのステップツリーとして記録"""
+    recorder = StepRecorder()
+    with recorder.activate():
+        yield recorder
+    request.config.stash[STEP_TIMINGS_KEY].add(request.node.nodeid, recorder)
+
+
+@pytest.fixture(autouse=True)
+def locator_profile(request):
+    """--profile-locators 指定時に、テスト中のロケーターの使用を計測"""
+    profile = request.config.stash.get(LOCATOR_PROFILE_KEY, None)
+    if profile is None:
+        yield None
+        return
+    with profile.activate():
+        yield profile
+
+
+@pytest.fixture(autouse=True)
+def forbid_fixed_sleeps(request, monkeypatch):
+    """--strict-waits 指定時に wait_for_timeout の呼び出しを禁止"""
+    if not request.config.getoption("strict_waits"):
+        return
+
+    def wait_for_timeout(self, timeout: float):
+        pytest.fail(
+            f"wait_for_timeout({timeout}) による固定スリープは禁止されています"
+            "（--strict-waits）。BasePage.settle() などのイベント待機を使用してください"
+        )
+
+    async def async_wait_for_timeout(self, timeout: float):
+        wait_for_timeout(self, timeout)
+
+    monkeypatch.setattr(Page, "wait_for_timeout", wait_for_timeout)
+    monkeypatch.setattr(AsyncPage, "wait_for_timeout", async_wait_for_timeout)
 
-    def size_option_selector(self, size: str) -> str:
-        """サイズオプションのセレクタを返す"""
-        return f'dialog input[value="{size}"]'
 
-    def select_size(self, size: str):
-        """サイズを選択"""
-        self.page.check(self.size_option_selector(size))
+@pytest.fixture(scope="session")
+def app_server() -> StaticAppServer:
+    """ワーカー専用の空きポートでテスト対象アプリをメモリから配信するサーバー"""
+    server = StaticAppServer().start()
+    yield server
+    server.stop()
 
-    def set_quantity(self, quantity: int):
-        """数量を設定"""
-        self.page.fill(self.QUANTITY_INPUT, str(quantity))
 
-    def add_to_cart(self):
-        """カートに追加"""
-        self.page.click(self.ADD_TO_CART_BUTTON)
-        self.page.wait_for_selector("text=追加しました")
+@pytest.fixture(scope="session")
+def base_url(request) -> str:
+    """テスト対象のベースURL
 
-    def cancel(self):
-        """キャンセル"""
-        self.page.click(self.CANCEL_BUTTON)
-
-    def close(self):
-        """ダイアログを閉じる"""
-        self.page.click(self.CLOSE_BUTTON)
-
-    def get_allergy_info(self) -> str:
-        """アレルギー情報を取得"""
-        return self.page.text_content(self.ALLERGY_INFO)
-
-
-class CartDialog:
-    """カートダイアログ"""
-
-    def __init__(self, page: Page):
-        self.page = page
-
-    # ロケーター
-    DIALOG = 'dialog:has-text("カート")'
-    CLOSE_BUTTON = 'dialog button:has-text("✕")'
-    CHECKOUT_REQUEST_BUTTON = 'dialog button:has-text("会計リクエスト")'
-    PLACE_ORDER_BUTTON = 'dialog button:has-text("注文確定")'
-    TOTAL_AMOUNT = 'dialog strong:near(:text("合計"))'
-    QUANTITY_DECREASE = 'dialog button:has-text("-")'
-    QUANTITY_INCREASE = 'dialog button:has-text("+")'
-    REMOVE_BUTTON = 'dialog button:has-text("Remove")'
-
-    def cart_item_selector(self, item_name: str) -> str:
-        """カートアイテムのセレクタを返す"""
-        return f'dialog :text("{item_name}")'
-
-    def place_order(self):
-        """注文を確定"""
-        self.page.click(self.PLACE_ORDER_BUTTON)
-        self.page.wait_for_selector("text=注文送信")
-
-    def request_checkout(self):
-        """会計をリクエスト"""
-        self.page.click(self.CHECKOUT_REQUEST_BUTTON)
-
-    def close(self):
-        """カートを閉じる"""
-        self.page.click(self.CLOSE_BUTTON)
-
-    def get_total_amount(self) -> str:
-        """合計金額を取得"""
-        return self.page.text_content(self.TOTAL_AMOUNT)
-
-    def increase_quantity(self):
-        """数量を増加"""
-        self.page.click(self.QUANTITY_INCREASE)
-
-    def decrease_quantity(self):
-        """数量を減少"""
-        self.page.click(self.QUANTITY_DECREASE)
-
-    def remove_item(self):
-        """商品を削除"""
-        self.page.click(self.REMOVE_BUTTON)
-
-
-class EmployeePage(BasePage):
-    """従業員ページ"""
-
-    # ロケーター
-    EMPLOYEE_MODE_BUTTON = 'button:has-text("従業員モード")'
-    CUSTOMER_MODE_BUTTON = 'button:has-text("顧客モード")'
-    ORDER_LIST = 'list[aria-label="Orders"]'
-
-    def order_item_selector(self, order_id: str) -> str:
-        """注文アイテムのセレクタを返す"""
-        return f'text="{order_id}"'
-
-    def status_button_selector(self, status: str) -> str:
-        """ステータスボタンのセレクタを返す"""
-        return f'button:has-text("{status}")'
-
-    def switch_to_employee_mode(self):
-        """従業員モードに切り替え"""
-        self.page.click(self.EMPLOYEE_MODE_BUTTON)
-        self.page.wait_for_selector("text=注文管理")
-
-    def switch_to_customer_mode(self):
-        """顧客モードに切り替え"""
-        self.page.click(self.CUSTOMER_MODE_BUTTON)
-        self.page.wait_for_selector("text=メニュー")
-
-    def get_orders_count(self) -> int:
-        """注文数を取得"""
-        orders = self.page.query_selector_all(f"{self.ORDER_LIST} > li")
-        return len(orders)
-
-    def change_order_status(self, status: str):
-        """注文ステータスを変更"""
-        self.page.click(self.status_button_selector(status))
-        self.page.wait_for_timeout(500)
-
-    def get_order_details(self, order_id: str) -> dict:
-        """注文詳細を取得"""
-        # 注文詳細の情報を抽出するロジックを実装
-        return {
-            "id": order_id,
-            "status": "placed",  # 実際の実装では要素から取得
-            "table": "T1",  # 実際の実装では要素から取得
-        }
+    既定では組み込みサーバー（ワーカーごとに専用のオリジン）を使用する。
+    --base-url を指定した場合は外部のサーバー（Live Server など）を使用する。
+    """
+    external_url = request.config.getoption("base_url")
+    if external_url:
+        return external_url
+    return request.getfixturevalue("app_server").url
 
 
 @pytest.fixture
@@ -268,3 +736,186 @@ def cart_dialog(page: Page) -> CartDialog:
 def employee_page(page: Page, base_url: str) -> EmployeePage:
     """従業員ページのフィクスチャ"""
     return EmployeePage(page, base_url)
+
+
+@pytest.fixture(scope="session")
+def async_loop(request) -> LoopThread:
+    """非同期 API のフィクスチャ・テストを実行する専用スレッドのループ
+
+    同期 API の Playwright が残すメインスレッドのループとは別のスレッドで動くため、
+    同期 API のテストの後でも非同期 API のテストを同じセッションで実行できる。
+    ``async def`` のテストはこのループで実行される（pytest_plugins.pytest_pyfunc_call）。
+    """
+    return request.config.stash[ASYNC_LOOP_KEY]
+
+
+@pytest.fixture(scope="session")
+def async_browser(request, async_loop: LoopThread):
+    """非同期 API のブラウザインスタンス（セッション全体で共有）
+
+    --browser-server 指定時は、常駐ブラウザが起動済みならそれに接続する。
+    """
+    endpoint = None
+    if request.config.getoption("browser_server"):
+        endpoint = BrowserServer().endpoint()
+
+    async def launch():
+        playwright = await async_playwright().start()
+        if endpoint is not None:
+            browser = await playwright.chromium.connect_over_cdp(endpoint)
+        else:
+            browser = await playwright.chromium.launch(headless=True)
+        return playwright, browser
+
+    async def close():
+        await browser.close()
+        await playwright.stop()
+
+    playwright, browser = async_loop.run(launch())
+    yield browser
+    async_loop.run(close())
+
+
+@pytest.fixture
+def async_context_factory(async_browser, async_loop: LoopThread, latency_profile):
+    """非同期 API のブラウザコンテキストを作成する関数（テスト終了時にすべて閉じる）
+
+    引数で CONTEXT_ARGS の設定（viewport、locale など）を上書きできる。
+    """
+    contexts = []
+
+    async def new_context(**overrides):
+        context = await async_browser.new_context(**{**CONTEXT_ARGS, **overrides})
+        if latency_profile is not None:
+            await context.add_init_script(latency_profile.script())
+        contexts.append(context)
+        return context
+
+    async def close_all():
+        for context in contexts:
+            await context.close()
+
+    yield new_context
+    async_loop.run(close_all())
+
+
+@pytest.fixture
+def async_context(
+    async_context_factory, async_loop: LoopThread, request, base_url: str
+):
+    """非同期 API の新しいブラウザコンテキスト
+
+    ``@pytest.mark.table_session("T1")`` が付いたテストでは、指定テーブルの
+    セッションを開始したコンテキストを返す。同期 API のフィクスチャ
+    （コンテキストプール、アセットキャッシュ）とは共有しない。
+    """
+
+    async def create():
+        context = await async_context_factory()
+        marker = request.node.get_closest_marker("table_session")
+        if marker is not None:
+            await start_table_session(
+                context, base_url, marker.args[0] if marker.args else "T1"
+            )
+        return context
+
+    return async_loop.run(create())
+
+
+async def start_table_session(context, base_url: str, table_id: str):
+    """非同期 API のコンテキストでテーブルセッションを開始する"""
+    page = await context.new_page()
+    session_page = AsyncTableSessionPage(page, base_url)
+    await session_page.navigate()
+    await session_page.start_session(table_id)
+    await page.close()
+
+
+@pytest.fixture
+def device_matrix(async_context_factory, request, base_url: str):
+    """``@pytest.mark.devices(...)`` の組み合わせを1つのブラウザで並行実行する DeviceMatrix
+
+    例::
+
+        @pytest.mark.devices("mobile", "tablet", "desktop", locales=["ja", "en"])
+        async def test_layout(device_matrix):
+            async def scenario(page, variant): ...
+            await device_matrix.run(scenario)
+
+    --devices / --device-locales はマーカーの指定より優先する。
+    ``@pytest.mark.table_session`` が付いていれば、各コンテキストでセッションを開始する。
+    """
+    config = request.config
+    marker = request.node.get_closest_marker("devices")
+    devices = list(marker.args) if marker is not None and marker.args else list(DEVICES)
+    locales = marker.kwargs.get("locales") if marker is not None else None
+    if config.getoption("devices"):
+        devices = parse_names(config.getoption("devices"), DEVICES, "--devices")
+    if config.getoption("device_locales"):
+        locales = parse_names(
+            config.getoption("device_locales"), LOCALES, "--device-locales"
+        )
+
+    session = request.node.get_closest_marker("table_session")
+    prepare = None
+    if session is not None:
+        table_id = session.args[0] if session.args else "T1"
+
+        async def prepare(context):
+            await start_table_session(context, base_url, table_id)
+
+    device_matrix = DeviceMatrix(
+        async_context_factory, matrix(devices, locales), prepare
+    )
+    yield device_matrix
+    results = [
+        {"test": request.node.nodeid, **result} for result in device_matrix.results
+    ]
+    config.stash.setdefault(DEVICE_RESULTS_KEY, []).extend(results)
+    request.node.user_properties.append(
+        (
+            "devices",
+            ", ".join(
+                f"{r['variant']}={'passed' if r['passed'] else 'failed'}"
+                for r in results
+            ),
+        )
+    )
+
+
+@pytest.fixture
+def async_page(async_context, async_loop: LoopThread) -> AsyncPage:
+    """非同期 API の新しいページ"""
+    return async_loop.run(async_context.new_page())
+
+
+@pytest.fixture
+def async_table_session_page(
+    async_page: AsyncPage, base_url: str
+) -> AsyncTableSessionPage:
+    """テーブルセッションページのフィクスチャ（非同期）"""
+    return AsyncTableSessionPage(async_page, base_url)
+
+
+@pytest.fixture
+def async_menu_page(async_page: AsyncPage, base_url: str) -> AsyncMenuPage:
+    """メニューページのフィクスチャ（非同期）"""
+    return AsyncMenuPage(async_page, base_url)
+
+
+@pytest.fixture
+def async_menu_detail_dialog(async_page: AsyncPage) -> AsyncMenuDetailDialog:
+    """メニュー詳細ダイアログのフィクスチャ（非同期）"""
+    return AsyncMenuDetailDialog(async_page)
+
+
+@pytest.fixture
+def async_cart_dialog(async_page: AsyncPage) -> AsyncCartDialog:
+    """カートダイアログのフィクスチャ（非同期）"""
+    return AsyncCartDialog(async_page)
+
+
+@pytest.fixture
+def async_employee_page(async_page: AsyncPage, base_url: str) -> AsyncEmployeePage:
+    """従業員ページのフィクスチャ（非同期）"""
+    return AsyncEmployeePage(async_page, base_url)
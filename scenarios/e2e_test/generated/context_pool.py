@@ -0,0 +1,141 @@
+# テスト間で使い回すブラウザコンテキストのプール
+import pytest
+from playwright.sync_api import Browser, BrowserContext, Error, Page
+
+# セッション中のプールを pytest の設定オブジェクトに保持するキー
+CONTEXT_POOL_KEY = pytest.StashKey["ContextPool"]()
+
+# ストレージ復元時にオリジン上で表示する空のドキュメント
+SEED_PATH = "__context_pool_seed__"
+
+# 現在のオリジンのストレージとアプリの状態を破棄するスクリプト
+CLEAR_STORAGE_SCRIPT = """
+() => {
+    try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+    delete window.__appState;
+}
+"""
+
+
+class ContextPool:
+    """リセットして使い回すブラウザコンテキストとページのプール
+
+    テスト終了時にストレージ・Cookie・ルート・アプリ状態を消去して about:blank に
+    戻し、リセット確認に通ったものだけを次のテストへ渡す。確認に失敗したものは
+    閉じて作り直す。
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        size: int,
+        context_args: dict,
+        setup=None,
+        init_script: str = None,
+    ):
+        self.browser = browser
+        self.size = size
+        self.context_args = context_args
+        self.setup = setup
+        self.init_script = init_script
+        self.idle = []
+        self.pages = {}
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    def acquire(self) -> BrowserContext:
+        """待機中のコンテキストを取り出す（なければ新規作成）"""
+        if self.idle:
+            self.reused += 1
+            return self.idle.pop()
+        context = self.browser.new_context(**self.context_args)
+        if self.init_script is not None:
+            # 初期化スクリプトはリセット後も残るため、作成時に1回だけ追加する
+            context.add_init_script(self.init_script)
+        if self.setup is not None:
+            self.setup(context)
+        self.pages[context] = context.new_page()
+        self.created += 1
+        return context
+
+    def page_for(self, context: BrowserContext) -> Page:
+        """プールのコンテキストに紐づくウォームなページ（対象外なら None）"""
+        return self.pages.get(context)
+
+    def apply_storage_state(self, context: BrowserContext, storage_state: dict):
+        """Playwright のストレージステートを既存のコンテキストへ復元"""
+        page = self.pages[context]
+        if storage_state.get("cookies"):
+            context.add_cookies(storage_state["cookies"])
+        for origin in storage_state.get("origins", []):
+            seed_url = origin["origin"].rstrip("/") + "/" + SEED_PATH
+            page.route(seed_url, lambda route: route.fulfill(body="<html></html>"))
+            page.goto(seed_url)
+            page.evaluate(
+                "items => items.forEach(i => localStorage.setItem(i.name, i.value))",
+                origin["localStorage"],
+            )
+            page.unroute(seed_url)
+        page.goto("about:blank")
+
+    def release(self, context: BrowserContext):
+        """テスト終了後にリセットしてプールへ戻す（失敗したら作り直し）"""
+        if len(self.idle) < self.size and self.reset(context):
+            self.idle.append(context)
+            return
+        self.recycled += 1
+        self.discard(context)
+
+    def reset(self, context: BrowserContext) -> bool:
+        """コンテキストを初期状態に戻し、リセット確認の結果を返す"""
+        page = self.pages.get(context)
+        try:
+            if page is None or page.is_closed():
+                return False
+            for other in context.pages:
+                if other is not page:
+                    other.close()
+            if page.url.startswith("http"):
+                page.evaluate(CLEAR_STORAGE_SCRIPT)
+            page.unroute_all()
+            context.unroute_all()
+            context.clear_cookies()
+            context.clear_permissions()
+            context.set_extra_http_headers({})
+            context.set_offline(False)
+            if self.setup is not None:
+                self.setup(context)
+            page.goto("about:blank")
+            return self.is_clean(context, page)
+        except Error:
+            return False
+
+    def is_clean(self, context: BrowserContext, page: Page) -> bool:
+        """リセット確認: 空のページ1枚のみで、Cookie とストレージが残っていないこと"""
+        if page.url != "about:blank" or context.pages != [page]:
+            return False
+        state = context.storage_state()
+        return not state["cookies"] and not any(
+            origin["localStorage"] for origin in state["origins"]
+        )
+
+    def discard(self, context: BrowserContext):
+        """コンテキストを閉じてプールから外す"""
+        self.pages.pop(context, None)
+        try:
+            context.close()
+        except Error:
+            pass
+
+    def close(self):
+        """待機中のコンテキストをすべて閉じる"""
+        while self.idle:
+            self.discard(self.idle.pop())
+
+    def summary(self) -> str:
+        """プールの利用状況のサマリー"""
+        return (
+            f"context pool (size {self.size}): {self.created} created, "
+            f"{self.reused} reused, {self.recycled} recycled"
+        )
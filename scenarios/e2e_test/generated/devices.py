@@ -0,0 +1,140 @@
+# デバイス（ビューポート・UA・ロケール）のマトリクスを1つのブラウザで並行実行
+import asyncio
+import time
+
+import pytest
+
+# セッション中のデバイスごとの結果を pytest の設定オブジェクトに保持するキー
+DEVICE_RESULTS_KEY = pytest.StashKey[list]()
+
+# デバイスごとのブラウザコンテキストの設定
+DEVICES = {
+    "mobile": {
+        "viewport": {"width": 375, "height": 667},  # モバイルサイズ（iPhone SE）
+        "user_agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15",
+    },
+    "tablet": {
+        "viewport": {"width": 768, "height": 1024},  # iPad（第9世代）
+        "user_agent": "Mozilla/5.0 (iPad; CPU OS 15_0 like Mac OS X) AppleWebKit/605.1.15",
+    },
+    "desktop": {
+        "viewport": {"width": 1280, "height": 800},
+        "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+    },
+}
+
+# マトリクスを指定しないテスト・コンテキストで使うデバイス
+DEFAULT_DEVICE = "mobile"
+
+# アプリが対応するロケール（UX-002）
+LOCALES = ("ja", "en", "zh")
+
+
+def parse_names(value: str, choices, label: str) -> list:
+    """カンマ区切りの名前を検証してリストに変換"""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in choices]
+    if not names or unknown:
+        raise pytest.UsageError(
+            f"{label} が不正です: {value}（{', '.join(choices)} から選択）"
+        )
+    return names
+
+
+class DeviceVariant:
+    """マトリクスの1つの組み合わせ（デバイスと、任意のロケール）"""
+
+    def __init__(self, device: str, locale: str = None):
+        if device not in DEVICES:
+            raise ValueError(f"不明なデバイスです: {device}")
+        self.device = device
+        self.locale = locale
+
+    @property
+    def id(self) -> str:
+        """結果の表示用の名前（例: tablet-en）"""
+        return self.device if self.locale is None else f"{self.device}-{self.locale}"
+
+    def context_args(self) -> dict:
+        """ブラウザコンテキストの設定"""
+        args = dict(DEVICES[self.device])
+        if self.locale is not None:
+            args["locale"] = self.locale
+        return args
+
+    def __repr__(self):
+        return f"DeviceVariant({self.id})"
+
+
+def matrix(devices, locales=None) -> list:
+    """デバイスとロケールのすべての組み合わせ"""
+    return [
+        DeviceVariant(device, locale)
+        for device in devices
+        for locale in (locales or [None])
+    ]
+
+
+class DeviceMatrix:
+    """マトリクスの各組み合わせを、1つのブラウザの別コンテキストで並行して実行する
+
+    シナリオは ``async def scenario(page, variant)`` の形で書く。すべての組み合わせを
+    最後まで実行し、失敗した組み合わせがあればまとめて AssertionError にする。
+    """
+
+    def __init__(self, new_context, variants: list, prepare=None):
+        self.new_context = new_context
+        self.variants = variants
+        self.prepare = prepare
+        self.results = []
+
+    async def run_variant(self, scenario, variant: DeviceVariant) -> dict:
+        """1つの組み合わせを実行して結果を返す（例外は結果に記録）"""
+        started = time.perf_counter()
+        error = None
+        try:
+            context = await self.new_context(**variant.context_args())
+            if self.prepare is not None:
+                await self.prepare(context)
+            page = await context.new_page()
+            await scenario(page, variant)
+        except Exception as exc:  # 他の組み合わせは続けて実行する
+            error = f"{type(exc).__name__}: {exc}"
+        return {
+            "variant": variant.id,
+            "device": variant.device,
+            "locale": variant.locale,
+            "passed": error is None,
+            "duration": time.perf_counter() - started,
+            "error": error,
+        }
+
+    async def run(self, scenario) -> list:
+        """すべての組み合わせを並行して実行"""
+        self.results = list(
+            await asyncio.gather(
+                *(self.run_variant(scenario, variant) for variant in self.variants)
+            )
+        )
+        failed = [result for result in self.results if not result["passed"]]
+        if failed:
+            raise AssertionError(
+                "; ".join(
+                    f"[{result['variant']}] {result['error']}" for result in failed
+                )
+            )
+        return self.results
+
+
+def group_by_device(results: list) -> dict:
+    """テストごとの結果をデバイスごとの (成功数, 失敗数, 合計時間) に集計"""
+    groups = {}
+    for result in results:
+        passed, failed, duration = groups.get(result["device"], (0, 0, 0.0))
+        if result["passed"]:
+            passed += 1
+        else:
+            failed += 1
+        groups[result["device"]] = (passed, failed, duration + result["duration"])
+    return groups
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""HAR によるアプリのリクエストの記録と再生
+
+--har record ではテストごとにアプリへのリクエストを HAR に記録し、--har replay
+では記録した応答だけでリクエストに応答する（ネットワークもアプリの配信も
+使わない）。記録にないリクエストは遮断してテストを失敗させる。
+
+使用例:
+    python -m pytest tests/ --har record
+    python -m pytest tests/ --har replay
+    python har.py check   # アプリのファイルと内容が変わった HAR を一覧
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+from urllib.parse import unquote, urlsplit
+
+import pytest
+
+from app_server import APP_DIR
+from results import safe_name
+
+# セッション中の記録・再生の結果を pytest の設定オブジェクトに保持するキー
+HAR_RESULTS_KEY = pytest.StashKey[list]()
+
+# HAR の既定の保存先（tests/ 配下）
+DEFAULT_HAR_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tests", "har"
+)
+
+HAR_MODES = ("record", "replay")
+
+# 再生時に応答から除くヘッダー（HAR の本文は圧縮を解いた状態で記録される）
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def har_path(directory: str, nodeid: str) -> str:
+    """テストの HAR ファイルのパス"""
+    return os.path.join(directory, f"{safe_name(nodeid)}.har")
+
+
+def record_options(path: str, base_url: str) -> dict:
+    """記録用にコンテキストへ渡す引数（base_url 配下だけを本文ごと記録）"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return {
+        "record_har_path": path,
+        "record_har_content": "embed",
+        "record_har_url_filter": f"{base_url}**",
+    }
+
+
+def annotate_recording(path: str, base_url: str):
+    """記録した HAR に記録時の base_url を書き込む（再生時の URL の対応付け用）"""
+    with open(path, encoding="utf-8") as f:
+        har = json.load(f)
+    har["log"]["_baseUrl"] = base_url
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(har, f, indent=1, ensure_ascii=False)
+
+
+def entry_body(entry: dict) -> bytes:
+    """HAR のエントリの応答本文"""
+    content = entry["response"]["content"]
+    text = content.get("text", "")
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+def relative_url(url: str, base_url: str) -> str:
+    """base_url からの相対パス（クエリ付き、base_url 外なら None）"""
+    base, target = urlsplit(base_url), urlsplit(url)
+    if (target.scheme, target.netloc) != (base.scheme, base.netloc):
+        return None
+    prefix = base.path if base.path.endswith("/") else base.path + "/"
+    path = target.path if target.path != base.path.rstrip("/") else prefix
+    if not path.startswith(prefix):
+        return None
+    relative = path[len(prefix) :]
+    return f"{relative}?{target.query}" if target.query else relative
+
+
+class HarReplay:
+    """記録した HAR の応答でリクエストに応答する
+
+    リクエストはメソッドと base_url からの相対 URL で照合する（記録時と再生時で
+    ポートが違っても同じ応答になる）。同じリクエストが複数記録されていれば
+    記録順に返し、使い切った後は最後の応答を返す。一致しないリクエストは
+    遮断して unmatched に記録する。
+    """
+
+    def __init__(self, path: str, base_url: str):
+        with open(path, encoding="utf-8") as f:
+            log = json.load(f)["log"]
+        self.path = path
+        self.base_url = base_url
+        self.recorded_base_url = log.get("_baseUrl", base_url)
+        self.entries = {}
+        for entry in log["entries"]:
+            request = entry["request"]
+            relative = relative_url(request["url"], self.recorded_base_url)
+            if relative is not None:
+                key = (request["method"], relative)
+                self.entries.setdefault(key, []).append(entry)
+        self.cursors = {}
+        self.served = 0
+        self.unmatched = []
+
+    def lookup(self, method: str, url: str) -> dict:
+        """リクエストに対応する記録済みのエントリ（なければ None）"""
+        relative = relative_url(url, self.base_url)
+        entries = self.entries.get((method, relative)) if relative is not None else None
+        if not entries:
+            return None
+        index = self.cursors.get((method, relative), 0)
+        self.cursors[(method, relative)] = index + 1
+        return entries[min(index, len(entries) - 1)]
+
+    def handle(self, route):
+        """記録済みの応答を返し、一致しないリクエストは遮断する"""
+        request = route.request
+        entry = self.lookup(request.method, request.url)
+        if entry is None:
+            self.unmatched.append(f"{request.method} {request.url}")
+            route.abort("blockedbyclient")
+            return
+        response = entry["response"]
+        self.served += 1
+        route.fulfill(
+            status=response["status"],
+            headers={
+                header["name"]: header["value"]
+                for header in response["headers"]
+                if header["name"].lower() not in DROPPED_HEADERS
+            },
+            body=entry_body(entry),
+        )
+
+    def attach(self, context):
+        """コンテキストのすべてのリクエストを再生で応答する（後から登録したルートが優先）"""
+        context.route("**/*", self.handle)
+
+    def detach(self, context):
+        """再生のルートを外す（プールに返すコンテキスト用）"""
+        context.unroute("**/*", self.handle)
+
+
+def stale_assets(path: str, root: str = APP_DIR) -> list:
+    """HAR に記録されたアプリのファイルのうち、現在の内容と異なるもの
+
+    (相対パス, 理由) のリストを返す。理由は changed（内容が変わった）または
+    missing（ファイルがなくなった）。
+    """
+    with open(path, encoding="utf-8") as f:
+        log = json.load(f)["log"]
+    base_url = log.get("_baseUrl")
+    stale, checked = [], set()
+    for entry in log["entries"]:
+        if entry["response"]["status"] != 200 or base_url is None:
+            continue
+        relative = relative_url(entry["request"]["url"], base_url)
+        if relative is None:
+            continue
+        relative = unquote(urlsplit(relative).path) or "index.html"
+        if relative in checked:
+            continue
+        checked.add(relative)
+        file_path = os.path.join(root, relative)
+        if not os.path.isfile(file_path):
+            stale.append((relative, "missing"))
+            continue
+        with open(file_path, "rb") as f:
+            current = hashlib.sha256(f.read()).digest()
+        if hashlib.sha256(entry_body(entry)).digest() != current:
+            stale.append((relative, "changed"))
+    return stale
+
+
+def describe_stale(stale: list) -> str:
+    """古くなったファイルの表示用の文字列"""
+    return ", ".join(f"{relative} ({reason})" for relative, reason in stale)
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["check"])
+    parser.add_argument("--har-dir", default=DEFAULT_HAR_DIR)
+    args = parser.parse_args(argv)
+
+    names = (
+        sorted(name for name in os.listdir(args.har_dir) if name.endswith(".har"))
+        if os.path.isdir(args.har_dir)
+        else []
+    )
+    stale_count = 0
+    for name in names:
+        stale = stale_assets(os.path.join(args.har_dir, name))
+        if stale:
+            stale_count += 1
+            print(f"{name}: {describe_stale(stale)}")
+    print(f"{stale_count} of {len(names)} HAR files are stale")
+    return 1 if stale_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,343 @@
+# JS カバレッジに基づくテスト影響範囲の選択
+import difflib
+import hashlib
+import os
+import sqlite3
+import time
+from urllib.parse import urlparse
+
+import pytest
+from playwright.sync_api import Error, Page
+
+from app_server import APP_DIR
+
+# セッション中の選択結果を pytest の設定オブジェクトに保持するキー
+AFFECTED_SELECTION_KEY = pytest.StashKey[dict]()
+
+# テストの call フェーズが成功したかをテスト項目に保持するキー
+CALL_PASSED_KEY = pytest.StashKey[bool]()
+
+# 影響範囲マップの既定の保存先（tests/ 配下）
+DEFAULT_MAP = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tests", ".impact-map.sqlite"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS functions (
+    hash TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tests (
+    test TEXT PRIMARY KEY,
+    passed INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    test TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (test, hash)
+);
+CREATE TABLE IF NOT EXISTS files (
+    hash TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS loads (
+    test TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (test, hash)
+);
+"""
+
+
+def function_hash(file: str, source: str) -> str:
+    """ファイル名と関数のソースから作る関数の識別子（ファイルの内容の識別にも使う）"""
+    return hashlib.sha1(f"{file}\0{source}".encode()).hexdigest()[:16]
+
+
+def changed_spans(old: str, new: str) -> list:
+    """old のうち new で変わった範囲 [(開始, 終了)]（挿入は開始 == 終了）
+
+    行単位で差分を取ってから、変わった行の中を文字単位で細かくする。
+    空白だけの変更は除く。
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    old_starts, new_starts = [0], [0]
+    for line in old_lines:
+        old_starts.append(old_starts[-1] + len(line))
+    for line in new_lines:
+        new_starts.append(new_starts[-1] + len(line))
+    spans = []
+    lines = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in lines.get_opcodes():
+        if tag == "equal":
+            continue
+        old_base, new_base = old_starts[i1], new_starts[j1]
+        old_block = old[old_base : old_starts[i2]]
+        new_block = new[new_base : new_starts[j2]]
+        chars = difflib.SequenceMatcher(None, old_block, new_block, autojunk=False)
+        for tag, a1, a2, b1, b2 in chars.get_opcodes():
+            if tag == "equal":
+                continue
+            if old_block[a1:a2].strip() or new_block[b1:b2].strip():
+                spans.append((old_base + a1, old_base + a2))
+    return spans
+
+
+def within(span: tuple, ranges: list) -> bool:
+    """変更範囲がいずれかの関数の中に収まるか（関数の境界への挿入は外とみなす）"""
+    start, end = span
+    for low, high in ranges:
+        if low < start and end < high or start != end and low <= start <= end <= high:
+            return True
+    return False
+
+
+class CoverageRecorder:
+    """CDP の Precise Coverage でページが実行した JS 関数を記録する
+
+    関数単位・実行有無のみ（callCount / detailed なし）の最も軽いモードを使う。
+    ページが読み込んだ URL はブラウザを問わず記録する。
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.urls = []
+        page.on("request", self.on_request)
+        try:
+            self.cdp = page.context.new_cdp_session(page)
+            self.cdp.send("Profiler.enable")
+            self.cdp.send(
+                "Profiler.startPreciseCoverage", {"callCount": False, "detailed": False}
+            )
+        except Error:
+            self.cdp = None
+
+    def on_request(self, request):
+        self.urls.append(request.url)
+
+    def stop(self) -> list:
+        """記録を終了し、スクリプトごとのカバレッジを返す"""
+        self.page.remove_listener("request", self.on_request)
+        if self.cdp is None:
+            return []
+        try:
+            result = self.cdp.send("Profiler.takePreciseCoverage")["result"]
+            self.cdp.send("Profiler.stopPreciseCoverage")
+            self.cdp.detach()
+        except Error:
+            return []
+        return result
+
+
+class ImpactMap:
+    """テスト → 実行したアプリの関数（ソースのハッシュ）の対応を SQLite に保存する
+
+    テストが読み込んだファイル（HTML・CSS・JS）も内容ごとに保存し、関数の外
+    （トップレベルの文、マークアップ、スタイル）の変更も検出する。
+    テストごとに記録を置き換えるため、実行したテストの分だけ差分で更新される。
+    """
+
+    def __init__(self, path: str = DEFAULT_MAP, root: str = APP_DIR):
+        self.root = root
+        self.sources = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 並列シャードが同じファイルに書き込むため、ロックを待ち WAL で読み書きを並行させる
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def source(self, file: str) -> str:
+        """アプリのファイルの内容（更新時刻が変わるまでキャッシュ）"""
+        path = os.path.join(self.root, file)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self.sources.get(file)
+        if cached is None or cached[0] != mtime:
+            with open(path, encoding="utf-8") as f:
+                cached = self.sources[file] = (mtime, f.read())
+        return cached[1]
+
+    def local_file(self, url: str, base_url: str) -> str:
+        """URL に対応するアプリのファイル（対象外なら None）"""
+        parsed, base = urlparse(url), urlparse(base_url)
+        if (parsed.scheme, parsed.netloc) != (base.scheme, base.netloc):
+            return None
+        file = parsed.path.lstrip("/")
+        if file == "" or file.endswith("/"):
+            file += "index.html"
+        if os.path.normpath(file).startswith(".."):
+            return None
+        if self.source(file) is None:
+            return None
+        return file
+
+    def loaded_files(self, urls: list, base_url: str) -> dict:
+        """読み込んだ URL からアプリのファイル（ハッシュ → (ファイル, 内容)）を取り出す"""
+        files = {}
+        for url in urls:
+            file = self.local_file(url, base_url)
+            if file is not None:
+                content = self.source(file)
+                files[function_hash(file, content)] = (file, content)
+        return files
+
+    def covered_functions(self, coverage: list, base_url: str) -> dict:
+        """カバレッジから実行された関数（ハッシュ → (ファイル, 関数名, ソース)）を取り出す
+
+        スクリプト全体（トップレベル）は除く（loaded_files のファイル単位の記録で
+        扱う）。HTML のインラインスクリプトも同様。オフセットは UTF-16 単位。
+        """
+        functions = {}
+        for script in coverage:
+            file = self.local_file(script["url"], base_url)
+            if file is None or not file.endswith(".js"):
+                continue
+            encoded = self.source(file).encode("utf-16-le")
+            length = len(encoded) // 2
+            for function in script["functions"]:
+                first = function["ranges"][0]
+                if first["count"] == 0:
+                    continue
+                start, end = first["startOffset"], first["endOffset"]
+                if start == 0 and end >= length:
+                    continue
+                source = encoded[start * 2 : end * 2].decode("utf-16-le")
+                functions[function_hash(file, source)] = (
+                    file,
+                    function["functionName"] or "(anonymous)",
+                    source,
+                )
+        return functions
+
+    def record(self, test: str, functions: dict, passed: bool, files: dict = None):
+        """テスト1件分の記録を置き換える"""
+        files = files or {}
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO functions (hash, file, name, source) "
+                "VALUES (?, ?, ?, ?)",
+                [(h, *function) for h, function in functions.items()],
+            )
+            self.connection.execute("DELETE FROM coverage WHERE test = ?", (test,))
+            self.connection.executemany(
+                "INSERT INTO coverage (test, hash) VALUES (?, ?)",
+                [(test, h) for h in functions],
+            )
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO files (hash, file, content) VALUES (?, ?, ?)",
+                [(h, *file) for h, file in files.items()],
+            )
+            self.connection.execute("DELETE FROM loads WHERE test = ?", (test,))
+            self.connection.executemany(
+                "INSERT INTO loads (test, hash) VALUES (?, ?)",
+                [(test, h) for h in files],
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO tests (test, passed, recorded_at) "
+                "VALUES (?, ?, ?)",
+                (test, int(passed), time.time()),
+            )
+
+    def changed_functions(self) -> set:
+        """記録後にソースが変わった（現在のファイルに同じソースがない）関数"""
+        changed = set()
+        rows = self.connection.execute("SELECT hash, file, source FROM functions")
+        for function, file, source in rows:
+            current = self.source(file)
+            if current is None or source not in current:
+                changed.add(function)
+        return changed
+
+    def changed_files(self) -> set:
+        """記録後に関数の外が変わったファイル（記録時の内容のハッシュ）
+
+        記録済みの関数の中だけの変更は changed_functions で扱うため除く。
+        JS 以外のファイルや、関数を記録していない JS はどの変更も対象になる。
+        """
+        functions = {}
+        for file, source in self.connection.execute(
+            "SELECT file, source FROM functions"
+        ):
+            functions.setdefault(file, []).append(source)
+        changed = set()
+        rows = self.connection.execute("SELECT hash, file, content FROM files")
+        for file_hash, file, content in rows:
+            current = self.source(file)
+            if current == content:
+                continue
+            if current is None:
+                changed.add(file_hash)
+                continue
+            ranges = []
+            for source in functions.get(file, []):
+                start = content.find(source)
+                if start >= 0:
+                    ranges.append((start, start + len(source)))
+            spans = changed_spans(content, current)
+            if not all(within(span, ranges) for span in spans):
+                changed.add(file_hash)
+        return changed
+
+    def affected(self, tests: list) -> dict:
+        """実行が必要なテストと、その理由
+
+        未記録のテスト、前回成功しなかったテスト、実行した関数が変わったテスト、
+        読み込んだファイルの関数の外が変わったテストを選ぶ。
+        """
+        changed = self.changed_functions()
+        changed_files = self.changed_files()
+        passed = dict(self.connection.execute("SELECT test, passed FROM tests"))
+        covering = set()
+        for test, function in self.connection.execute(
+            "SELECT test, hash FROM coverage"
+        ):
+            if function in changed:
+                covering.add(test)
+        loading = set()
+        for test, file_hash in self.connection.execute("SELECT test, hash FROM loads"):
+            if file_hash in changed_files:
+                loading.add(test)
+        reasons = {}
+        for test in tests:
+            if test not in passed:
+                reasons[test] = "not recorded"
+            elif not passed[test]:
+                reasons[test] = "did not pass last time"
+            elif test in covering:
+                reasons[test] = "covered function changed"
+            elif test in loading:
+                reasons[test] = "loaded file changed"
+        return {
+            "reasons": reasons,
+            "changed": changed,
+            "changed_files": changed_files,
+            "total": len(tests),
+        }
+
+    def close(self):
+        """どのテストからも参照されなくなった関数・ファイルを削除して接続を閉じる"""
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM functions WHERE hash NOT IN (SELECT hash FROM coverage)"
+            )
+            self.connection.execute(
+                "DELETE FROM files WHERE hash NOT IN (SELECT hash FROM loads)"
+            )
+        self.connection.close()
+
+
+def describe(selection: dict) -> str:
+    """選択結果のサマリー"""
+    return (
+        f"affected: {len(selection['reasons'])} of {selection['total']} tests selected "
+        f"({len(selection['changed'])} changed function(s), "
+        f"{len(selection['changed_files'])} changed file(s))"
+    )
@@ -0,0 +1,148 @@
+# MockAPI の応答遅延（レイテンシプロファイル）の差し替え
+import json
+
+# app.js の MockAPI が simulate() に渡している遅延（ミリ秒）
+APP_DELAYS = {
+    "scanTable": 200,
+    "listMenu": 100,
+    "placeOrder": 180,
+    "default": 120,  # requestCheckout / updateOrderStatus
+}
+
+# app.js の遅延をそのまま使う（差し替えない）プロファイル名
+APP_PROFILE = "app"
+
+# MockAPI のメソッドを包み、応答のタイマーの遅延だけを差し替える初期化スクリプト
+# 各メソッドは最後に simulate() で応答のタイマーを登録するため、呼び出し中に最後に
+# 登録されたタイマーを取り消して遅延を差し替え、それ以外（emit から呼ばれるトースト
+# など）のタイマーはそのまま残す。
+# app.js の init() より先に実行されるよう、同じ DOMContentLoaded に先に登録する。
+# 遅延と失敗の判定はシード付きの乱数（mulberry32）で決め、実行ごとに再現できる。
+LATENCY_SCRIPT = """
+(config => {
+    let seed = config.seed >>> 0;
+    const random = () => {
+        seed = (seed + 0x6D2B79F5) >>> 0;
+        let t = seed;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+    const calls = [];
+    window.__latencyProfile = { name: config.name, calls };
+    document.addEventListener('DOMContentLoaded', () => {
+        if (typeof MockAPI === 'undefined') return;
+        Object.keys(MockAPI).forEach(method => {
+            const original = MockAPI[method];
+            const rule = config.methods[method] || config.methods.default;
+            MockAPI[method] = function (...args) {
+                let delay = rule.base_ms + (random() * 2 - 1) * rule.jitter_ms;
+                if (random() < rule.tail_rate) delay *= rule.tail_factor;
+                delay = Math.max(0, Math.round(delay));
+                const failed = random() < rule.failure_rate;
+                calls.push({ method, delay, failed });
+                const setTimeoutOriginal = window.setTimeout;
+                if (failed) {
+                    return new Promise((_, reject) => setTimeoutOriginal(
+                        () => reject(new Error('SERVICE_UNAVAILABLE')), delay));
+                }
+                let response = null;
+                window.setTimeout = (callback, ms, ...rest) => {
+                    const id = setTimeoutOriginal(callback, ms, ...rest);
+                    response = { id, callback, rest };
+                    return id;
+                };
+                try {
+                    return original.apply(this, args);
+                } finally {
+                    window.setTimeout = setTimeoutOriginal;
+                    if (response !== null) {
+                        clearTimeout(response.id);
+                        setTimeoutOriginal(response.callback, delay, ...response.rest);
+                    }
+                }
+            };
+        });
+    }, { once: true });
+})(%s);
+"""
+
+
+class LatencyProfile:
+    """MockAPI の応答遅延の分布と、失敗を注入する割合
+
+    遅延は ``base ± jitter``（一様分布）で、``tail_rate`` の割合の呼び出しは
+    ``tail_factor`` 倍になる。``failure_rate`` の割合の呼び出しは、遅延の後に
+    ``SERVICE_UNAVAILABLE`` エラーで失敗する。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_ms: dict,
+        jitter: float = 0.0,
+        tail_rate: float = 0.0,
+        tail_factor: float = 1.0,
+        failure_rate: float = 0.0,
+        seed: int = 1,
+    ):
+        self.name = name
+        self.base_ms = base_ms
+        self.jitter = jitter
+        self.tail_rate = tail_rate
+        self.tail_factor = tail_factor
+        self.failure_rate = failure_rate
+        self.seed = seed
+
+    def rule(self, method: str) -> dict:
+        """メソッド1つ分の遅延の設定"""
+        base = self.base_ms.get(method, self.base_ms["default"])
+        return {
+            "base_ms": base,
+            "jitter_ms": base * self.jitter,
+            "tail_rate": self.tail_rate,
+            "tail_factor": self.tail_factor,
+            "failure_rate": self.failure_rate,
+        }
+
+    def to_json(self) -> dict:
+        """初期化スクリプトに渡す設定"""
+        return {
+            "name": self.name,
+            "seed": self.seed,
+            "methods": {method: self.rule(method) for method in self.base_ms},
+        }
+
+    def script(self) -> str:
+        """プロファイルを適用する初期化スクリプト"""
+        return LATENCY_SCRIPT % json.dumps(self.to_json())
+
+
+PROFILES = {
+    # 機能テストの高速実行用（遅延なし）
+    "zero": LatencyProfile("zero", {"default": 0}),
+    # app.js の遅延を中心に ±40% ばらつかせる
+    "realistic": LatencyProfile("realistic", APP_DELAYS, jitter=0.4),
+    # 3 倍の遅延、10% の呼び出しはさらに 10 倍、5% の呼び出しは失敗
+    "degraded": LatencyProfile(
+        "degraded",
+        {method: delay * 3 for method, delay in APP_DELAYS.items()},
+        jitter=0.5,
+        tail_rate=0.1,
+        tail_factor=10,
+        failure_rate=0.05,
+    ),
+}
+
+
+def resolve(name: str) -> LatencyProfile:
+    """プロファイル名から設定を取得（app の場合は差し替えないため None）"""
+    if name == APP_PROFILE:
+        return None
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"不明なレイテンシプロファイルです: {name}"
+            f"（{', '.join([APP_PROFILE, *PROFILES])} のいずれか）"
+        ) from None
@@ -0,0 +1,172 @@
+# 同じ操作の繰り返しによる JS ヒープ・DOM ノード・イベントリスナーの増加の検出
+import json
+from collections import Counter
+
+from playwright.sync_api import Page
+
+from results import opt_in_report
+
+# 1回の繰り返しあたりの増加の許容値（CDP Performance.getMetrics の指標名 → 値）
+DEFAULT_THRESHOLDS = {
+    "JSHeapUsedSize": 32 * 1024,  # バイト
+    "Nodes": 5,
+    "JSEventListeners": 1,
+}
+
+# ヒープスナップショットの差分で表示する型の数
+SNAPSHOT_DIFF_LIMIT = 30
+
+
+def slope(values: list) -> float:
+    """最小二乗法で当てはめた、繰り返し1回あたりの増加量"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    denominator = sum((x - mean_x) ** 2 for x in range(n))
+    return numerator / denominator
+
+
+def snapshot_summary(snapshot: dict) -> dict:
+    """ヒープスナップショットを型（コンストラクタ名）ごとの (個数, 合計サイズ) に集計"""
+    meta = snapshot["snapshot"]["meta"]
+    fields = meta["node_fields"]
+    types = meta["node_types"][0]
+    strings = snapshot["strings"]
+    nodes = snapshot["nodes"]
+    width = len(fields)
+    type_index = fields.index("type")
+    name_index = fields.index("name")
+    size_index = fields.index("self_size")
+    counts, sizes = Counter(), Counter()
+    for i in range(0, len(nodes), width):
+        node_type = types[nodes[i + type_index]]
+        if node_type in ("object", "native"):
+            key = strings[nodes[i + name_index]]
+        else:
+            key = f"({node_type})"
+        counts[key] += 1
+        sizes[key] += nodes[i + size_index]
+    return {key: (counts[key], sizes[key]) for key in counts}
+
+
+def diff_summaries(before: dict, after: dict, limit: int = SNAPSHOT_DIFF_LIMIT):
+    """2つのスナップショットの集計の差分（増加サイズの大きい順）"""
+    rows = []
+    for key in set(before) | set(after):
+        count_before, size_before = before.get(key, (0, 0))
+        count_after, size_after = after.get(key, (0, 0))
+        if count_after != count_before or size_after != size_before:
+            rows.append(
+                {
+                    "type": key,
+                    "count_delta": count_after - count_before,
+                    "size_delta": size_after - size_before,
+                    "count": count_after,
+                }
+            )
+    rows.sort(key=lambda row: (row["size_delta"], row["count_delta"]), reverse=True)
+    return rows[:limit]
+
+
+class LeakDetector:
+    """ページ上で同じ操作を繰り返し、GC 後の指標の増加の傾きを調べる（Chromium のみ）
+
+    最初の warmup 回は初回だけの初期化（キャッシュ・遅延読み込み）を除くため
+    計測しない。その後は毎回 CDP で GC を実行してから JSHeapUsedSize・Nodes・
+    JSEventListeners を取得する。
+    """
+
+    def __init__(self, page: Page, thresholds: dict = None):
+        self.page = page
+        self.thresholds = dict(DEFAULT_THRESHOLDS if thresholds is None else thresholds)
+        self.cdp = page.context.new_cdp_session(page)
+        self.cdp.send("Performance.enable")
+        self.cdp.send("HeapProfiler.enable")
+
+    def sample(self) -> dict:
+        """GC を実行してから指標を取得"""
+        self.cdp.send("HeapProfiler.collectGarbage")
+        metrics = self.cdp.send("Performance.getMetrics")["metrics"]
+        values = {m["name"]: m["value"] for m in metrics}
+        return {name: values.get(name) for name in self.thresholds}
+
+    def run(self, name: str, iteration, iterations: int, warmup: int = 2) -> dict:
+        """iteration（引数なしの関数）を繰り返し、指標の推移と傾きを返す"""
+        for _ in range(warmup):
+            iteration()
+        samples = [self.sample()]
+        for _ in range(iterations):
+            iteration()
+            samples.append(self.sample())
+        slopes = {
+            metric: slope([s[metric] for s in samples]) for metric in self.thresholds
+        }
+        exceeded = [
+            metric
+            for metric, limit in self.thresholds.items()
+            if slopes[metric] > limit
+        ]
+        return {
+            "flow": name,
+            "iterations": iterations,
+            "warmup": warmup,
+            "samples": samples,
+            "slopes": slopes,
+            "thresholds": self.thresholds,
+            "exceeded": exceeded,
+        }
+
+    def take_snapshot(self) -> dict:
+        """GC 後のヒープスナップショットを取得"""
+        chunks = []
+
+        def on_chunk(params):
+            chunks.append(params["chunk"])
+
+        self.cdp.on("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+        try:
+            self.cdp.send("HeapProfiler.collectGarbage")
+            self.cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        finally:
+            self.cdp.remove_listener("HeapProfiler.addHeapSnapshotChunk", on_chunk)
+        return json.loads("".join(chunks))
+
+    def snapshot_diff(self, iteration, iterations: int = 3) -> dict:
+        """iterations 回の繰り返しの前後のヒープスナップショットの差分"""
+        before = snapshot_summary(self.take_snapshot())
+        for _ in range(iterations):
+            iteration()
+        after = snapshot_summary(self.take_snapshot())
+        return {"iterations": iterations, "growth": diff_summaries(before, after)}
+
+    def close(self):
+        """CDP セッションを閉じる"""
+        self.cdp.detach()
+
+
+def describe(result: dict) -> str:
+    """検出結果の表示用の1行"""
+    growth = []
+    for metric, value in result["slopes"].items():
+        if metric == "JSHeapUsedSize":
+            growth.append(f"heap {value / 1024:+.1f}KB")
+        else:
+            growth.append(f"{metric} {value:+.2f}")
+    status = "LEAK " + ",".join(result["exceeded"]) if result["exceeded"] else "ok"
+    return (
+        f"{result['flow']}: {result['iterations']} iterations, per iteration "
+        f"{', '.join(growth)} [{status}]"
+    )
+
+
+# --leak-iterations 指定時だけ実行し、操作ごとの検出結果を表示する（許容値超過は赤）
+LEAK_REPORT = opt_in_report(
+    "leak",
+    "leak_iterations",
+    "leak detection (GC'd growth per iteration)",
+    describe,
+    failed=lambda result: result["exceeded"],
+)
@@ -0,0 +1,188 @@
+# 複数テーブルが同時に注文する負荷テストモード（ディナーラッシュ）
+import asyncio
+
+import pytest
+from playwright.async_api import BrowserContext
+
+from async_pages import (
+    AsyncCartDialog,
+    AsyncEmployeePage,
+    AsyncMenuDetailDialog,
+    AsyncMenuPage,
+    AsyncTableSessionPage,
+)
+from perf_baseline import percentile
+from results import opt_in_report
+
+# テーブル側: 確定した注文を従業員画面へ中継する
+TABLE_BRIDGE_SCRIPT = """
+localStorage.removeItem('demo.session');
+document.addEventListener('DOMContentLoaded', () => {
+    const channel = new BroadcastChannel('restaurant-load-mode');
+    const orders = window.__appState.orders;
+    const push = orders.push.bind(orders);
+    orders.push = (...items) => {
+        const placedAt = performance.timeOrigin + performance.now();
+        items.forEach(order => channel.postMessage({ order, placedAt }));
+        return push(...items);
+    };
+});
+"""
+
+# 従業員側: 受信した注文をアプリの order.created 経路で描画し、時刻を記録する
+STAFF_BRIDGE_SCRIPT = """
+document.addEventListener('DOMContentLoaded', () => {
+    const results = (window.__loadResults = []);
+    const channel = new BroadcastChannel('restaurant-load-mode');
+    channel.onmessage = ({ data }) => {
+        const receivedAt = performance.timeOrigin + performance.now();
+        window.__appState.orders.push(data.order);
+        emit('order.created', { order: data.order });
+        const renderedAt = performance.timeOrigin + performance.now();
+        requestAnimationFrame(() => results.push({
+            orderId: data.order.orderId,
+            tableId: data.order.tableId,
+            placedAt: data.placedAt,
+            receivedAt,
+            renderedAt,
+            paintedAt: performance.timeOrigin + performance.now(),
+        }));
+    };
+});
+"""
+
+
+def parse_levels(value: str) -> list:
+    """--load-tables の値（"1,5,10,25"）を同時テーブル数のリストに変換"""
+    try:
+        levels = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise pytest.UsageError(f"--load-tables が不正です: {value}") from None
+    if not levels or any(level < 1 for level in levels):
+        raise pytest.UsageError(f"--load-tables が不正です: {value}")
+    return levels
+
+
+def summarize(values: list) -> dict:
+    """パーセンタイルのサマリー（ミリ秒）"""
+    if not values:
+        return {}
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+class DinnerRush:
+    """N テーブルが同時に注文し、1つの従業員画面で受ける負荷シナリオ
+
+    非同期 API のコンテキストでテーブルごとに1ページを開き、各テーブルの注文を
+    1つのイベントループで並行して確定していく。placeOrder から従業員画面の
+    #ordersList に描画されるまでの時間はブラウザ内の時刻で計測する。
+    """
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        base_url: str,
+        orders_per_table: int = 3,
+        menu_items=("Margherita Pizza", "Iced Coffee", "Caesar Salad"),
+        timeout_ms: float = 60000,
+    ):
+        self.context = context
+        self.base_url = base_url
+        self.orders_per_table = orders_per_table
+        self.menu_items = menu_items
+        self.timeout_ms = timeout_ms
+
+    async def open_staff_view(self) -> AsyncEmployeePage:
+        """従業員画面を開く"""
+        page = await self.context.new_page()
+        await page.add_init_script(STAFF_BRIDGE_SCRIPT)
+        staff = AsyncEmployeePage(page, self.base_url)
+        await staff.navigate()
+        await staff.switch_to_employee_mode()
+        return staff
+
+    async def open_table(self, table_id: str) -> tuple:
+        """テーブルのページを開いてセッションを開始"""
+        page = await self.context.new_page()
+        await page.add_init_script(TABLE_BRIDGE_SCRIPT)
+        session = AsyncTableSessionPage(page, self.base_url)
+        await session.navigate()
+        await session.start_session(table_id)
+        return (
+            AsyncMenuPage(page, self.base_url),
+            AsyncMenuDetailDialog(page),
+            AsyncCartDialog(page),
+        )
+
+    async def place_orders(self, menu, dialog, cart):
+        """1テーブル分の注文を順番に確定"""
+        for round_index in range(self.orders_per_table):
+            await menu.click_menu_item(
+                self.menu_items[round_index % len(self.menu_items)]
+            )
+            await dialog.add_to_cart()
+            await menu.open_cart()
+            await cart.place_order()
+            await cart.close()
+
+    async def run(self, table_count: int) -> dict:
+        """table_count テーブルで注文を並行して流し、結果のサマリーを返す"""
+        staff = await self.open_staff_view()
+        tables = await asyncio.gather(
+            *(self.open_table(f"T{i + 1}") for i in range(table_count))
+        )
+        try:
+            await asyncio.gather(*(self.place_orders(*table) for table in tables))
+
+            expected = table_count * self.orders_per_table
+            await staff.page.wait_for_function(
+                "n => window.__loadResults.length >= n",
+                arg=expected,
+                timeout=self.timeout_ms,
+            )
+            results = await staff.page.evaluate("() => window.__loadResults")
+        finally:
+            for menu, _, _ in tables:
+                await menu.page.close()
+            await staff.page.close()
+        return self.summarize(table_count, results)
+
+    def summarize(self, table_count: int, results: list) -> dict:
+        """負荷テスト1段階分の結果"""
+        latencies = [r["paintedAt"] - r["placedAt"] for r in results]
+        renders = [r["renderedAt"] - r["receivedAt"] for r in results]
+        duration_s = (
+            max(r["paintedAt"] for r in results) - min(r["placedAt"] for r in results)
+        ) / 1000
+        order_ids = [r["orderId"] for r in results]
+        return {
+            "tables": table_count,
+            "orders": len(results),
+            "duration_s": duration_s,
+            "throughput_ops": len(results) / duration_s if duration_s > 0 else None,
+            "latency_ms": summarize(latencies),
+            "render_ms": summarize(renders),
+            "duplicate_order_ids": len(order_ids) - len(set(order_ids)),
+        }
+
+
+def describe(summary: dict) -> str:
+    """サマリー表示用の1行"""
+    latency = summary["latency_ms"]
+    throughput = summary["throughput_ops"] or 0.0
+    return (
+        f"{summary['tables']:>4} tables: {summary['orders']} orders, "
+        f"{throughput:.2f} orders/s, placeOrder→#ordersList "
+        f"p50 {latency['p50']:.1f}ms p95 {latency['p95']:.1f}ms "
+        f"p99 {latency['p99']:.1f}ms, render p95 "
+        f"{summary['render_ms']['p95']:.1f}ms"
+    )
+
+
+# --load-tables 指定時だけ実行し、同時テーブル数の段階ごとの結果を表示する
+LOAD_REPORT = opt_in_report("load", "load_tables", "dinner rush load", describe)
@@ -0,0 +1,173 @@
+# Page Object のロケーターのレジストリと、解決コストのプロファイラ
+import contextvars
+from contextlib import contextmanager
+
+import pytest
+
+from results import write_json
+
+# セッション全体の集計を pytest の設定オブジェクトに保持するキー
+LOCATOR_PROFILE_KEY = pytest.StashKey["LocatorProfile"]()
+
+# 計測中のプロファイル（非同期タスクにも引き継がれる）
+_profile = contextvars.ContextVar("locator_profile", default=None)
+
+
+class Selector(str):
+    """レジストリに登録されるロケーター（文字列としてそのまま使える）
+
+    Page Object のクラス属性として定義すると「クラス名.属性名」で登録される。
+    ``fast`` には同じ要素に一致する、より安価なセレクタ（ID・属性の CSS など）を
+    宣言でき、プロファイル時に一致を確認し、--fast-locators 指定時に使われる。
+    ``{0}`` を含むものはテンプレートとして ``format`` で値を埋めて使う。
+    """
+
+    def __new__(cls, selector: str, fast: str = None):
+        obj = super().__new__(cls, selector)
+        obj.fast = fast
+        obj.name = None
+        return obj
+
+    def __set_name__(self, owner, name):
+        self.name = f"{owner.__name__}.{name}"
+        REGISTRY.register(self)
+
+    def format(self, *args, **kwargs) -> "Selector":
+        """テンプレートに値を埋めたロケーター（登録名は引き継ぐ）"""
+        formatted = Selector(
+            str.format(self, *args, **kwargs),
+            self.fast.format(*args, **kwargs) if self.fast else None,
+        )
+        formatted.name = self.name
+        return formatted
+
+
+class LocatorRegistry:
+    """ロケーターの一元的な登録先"""
+
+    def __init__(self):
+        self.selectors = {}
+        self.prefer_fast = False
+
+    def register(self, selector: Selector):
+        """ロケーターを登録"""
+        self.selectors[selector.name] = selector
+
+    def resolve(self, selector: Selector) -> str:
+        """実際に使うセレクタ（--fast-locators 指定時は高速な代替）"""
+        if self.prefer_fast and selector.fast:
+            return selector.fast
+        return str(selector)
+
+
+REGISTRY = LocatorRegistry()
+
+
+class LocatorStats:
+    """ロケーター1つ分の解決時間・一致数と、高速な代替との比較"""
+
+    def __init__(self, selector: Selector):
+        self.name = selector.name or str(selector)
+        self.selector = str(selector)
+        self.fast = selector.fast
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.min_matches = None
+        self.max_matches = 0
+        self.fast_total_ms = 0.0
+        self.mismatches = 0
+
+    def add(self, duration_ms: float, matches: int, fast_ms=None, same=None):
+        """1回分の計測を追加"""
+        self.calls += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if self.min_matches is None or matches < self.min_matches:
+            self.min_matches = matches
+        self.max_matches = max(self.max_matches, matches)
+        if fast_ms is not None:
+            self.fast_total_ms += fast_ms
+            if not same:
+                self.mismatches += 1
+
+    @property
+    def verdict(self) -> str:
+        """高速な代替の判定（none: 代替なし、equivalent: 常に一致、mismatch: 不一致あり）"""
+        if not self.fast:
+            return "none"
+        return "mismatch" if self.mismatches else "equivalent"
+
+    def to_json(self) -> dict:
+        """集計の JSON 表現"""
+        data = {
+            "name": self.name,
+            "selector": self.selector,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3),
+            "max_ms": round(self.max_ms, 3),
+            "matches": [self.min_matches, self.max_matches],
+        }
+        if self.fast:
+            data["fast"] = {
+                "selector": self.fast,
+                "mean_ms": round(self.fast_total_ms / self.calls, 3),
+                "mismatches": self.mismatches,
+            }
+        return data
+
+
+class LocatorProfile:
+    """Page Object が使ったロケーターの解決コストをロケーターごとに集計する"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stats = {}
+
+    @contextmanager
+    def activate(self):
+        """ブロック内のロケーターの使用を計測する"""
+        token = _profile.set(self)
+        try:
+            yield self
+        finally:
+            _profile.reset(token)
+
+    def record(self, selector: Selector, duration_ms: float, matches: int, **fast):
+        """ロケーター1回分の計測を記録"""
+        key = selector.name or str(selector)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = LocatorStats(selector)
+        stats.add(duration_ms, matches, **fast)
+
+    def ranking(self) -> list:
+        """合計時間の長い順のロケーター"""
+        return sorted(self.stats.values(), key=lambda s: s.total_ms, reverse=True)
+
+    def write(self):
+        """集計を JSON で書き出す"""
+        if self.stats:
+            write_json(self.path, [stats.to_json() for stats in self.ranking()])
+
+    def table(self, limit: int) -> list:
+        """サマリー表示用の行"""
+        lines = [
+            f"{'locator':<40} {'calls':>6} {'total ms':>10} {'mean':>7} "
+            f"{'matches':>8} {'fast':>7}  verdict"
+        ]
+        for stats in self.ranking()[:limit]:
+            matches = f"{stats.min_matches}-{stats.max_matches}"
+            fast = f"{stats.fast_total_ms / stats.calls:.1f}" if stats.fast else "-"
+            lines.append(
+                f"{stats.name:<40} {stats.calls:>6} {stats.total_ms:>10.1f} "
+                f"{stats.total_ms / stats.calls:>7.1f} {matches:>8} {fast:>7}  "
+                f"{stats.verdict}"
+            )
+        return lines
+
+
+def active_profile() -> LocatorProfile:
+    """計測中のプロファイル（計測していなければ None）"""
+    return _profile.get()
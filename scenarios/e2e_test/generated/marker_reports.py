@@ -0,0 +1,167 @@
+# マーカーごとの結果セット（1回の実行を smoke / e2e / integration などに振り分ける）
+import os
+import xml.etree.ElementTree as ET
+
+# 指定マーカーを持たないテストを除外するモジュール（E2E テスト）
+# それ以外のモジュール（ハーネスのユニットテストなど）のテストは、マーカーの有無に
+# かかわらず通常どおり実行し、マーカーごとの結果セットには含めない。
+SCENARIO_MODULES = ("test_restaurant_ordering_e2e.py",)
+
+
+def parse_markers(value: str) -> list:
+    """--marker-reports の値（"smoke,e2e,integration"）をマーカー名のリストに変換"""
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+class CaseResult:
+    """テスト1件分の結果（setup / call / teardown をまとめたもの）"""
+
+    def __init__(self, nodeid: str):
+        self.nodeid = nodeid
+        self.outcome = "passed"
+        self.duration = 0.0
+        self.message = ""
+        self.details = ""
+        self.properties = []
+
+    def update(self, report):
+        """各フェーズのレポートを反映"""
+        self.duration += report.duration
+        self.properties = list(report.user_properties)
+        if report.failed:
+            self.outcome = "failure" if report.when == "call" else "error"
+            lines = report.longreprtext.splitlines()
+            self.message = lines[-1] if lines else ""
+            self.details = report.longreprtext
+        elif report.skipped and self.outcome == "passed":
+            self.outcome = "skipped"
+            if isinstance(report.longrepr, tuple):
+                self.message = str(report.longrepr[2])
+
+    def to_element(self) -> ET.Element:
+        """JUnit XML の testcase 要素"""
+        path, *classes, name = self.nodeid.split("::")
+        module = path.removesuffix(".py").replace("/", ".")
+        case = ET.Element(
+            "testcase",
+            classname=".".join([module, *classes]),
+            name=name,
+            time=f"{self.duration:.3f}",
+        )
+        if self.properties:
+            properties = ET.SubElement(case, "properties")
+            for name, value in self.properties:
+                ET.SubElement(properties, "property", name=name, value=str(value))
+        if self.outcome != "passed":
+            detail = ET.SubElement(case, self.outcome, message=self.message)
+            detail.text = self.details
+        return case
+
+
+class MarkerReports:
+    """指定マーカーのいずれかを持つテストを1回ずつ実行し、マーカーごとに結果を出力するプラグイン
+
+    複数のマーカーを持つテスト（例: integration と e2e）も実行は1回だけで、
+    それぞれのマーカーの結果セットに含まれる。マーカーを持たないテストを除外するのは
+    modules（既定は SCENARIO_MODULES）のテストだけ。
+    """
+
+    def __init__(
+        self,
+        markers: list,
+        directory: str,
+        suffix: str = "",
+        modules=SCENARIO_MODULES,
+    ):
+        self.markers = markers
+        self.directory = directory
+        self.suffix = suffix
+        self.modules = modules
+        self.membership = {}
+        self.results = {}
+
+    def pytest_collection_modifyitems(self, config, items):
+        selected = []
+        deselected = []
+        for item in items:
+            names = [m for m in self.markers if item.get_closest_marker(m) is not None]
+            if names:
+                self.membership[item.nodeid] = names
+                selected.append(item)
+            elif self.in_scope(item):
+                deselected.append(item)
+            else:
+                selected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    def in_scope(self, item) -> bool:
+        """マーカーがなければ除外するモジュールのテストか"""
+        path = item.nodeid.split("::")[0]
+        return os.path.basename(path) in self.modules
+
+    def pytest_runtest_logreport(self, report):
+        if report.nodeid not in self.membership:
+            return
+        result = self.results.setdefault(report.nodeid, CaseResult(report.nodeid))
+        result.update(report)
+
+    def counts(self, marker: str) -> dict:
+        """マーカーの結果セットの件数"""
+        counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+        for result in self.results_for(marker):
+            counts["tests"] += 1
+            if result.outcome == "failure":
+                counts["failures"] += 1
+            elif result.outcome == "error":
+                counts["errors"] += 1
+            elif result.outcome == "skipped":
+                counts["skipped"] += 1
+        return counts
+
+    def results_for(self, marker: str) -> list:
+        """マーカーを持つテストの結果（実行順）"""
+        return [
+            result
+            for nodeid, result in self.results.items()
+            if marker in self.membership[nodeid]
+        ]
+
+    def junit_path(self, marker: str) -> str:
+        """マーカーごとの JUnit XML のパス"""
+        return os.path.join(self.directory, f"junit-{marker}{self.suffix}.xml")
+
+    def write_junit(self, marker: str):
+        """マーカーごとの JUnit XML を書き出す"""
+        results = self.results_for(marker)
+        suite = ET.Element("testsuite", name=marker)
+        for key, value in self.counts(marker).items():
+            suite.set(key, str(value))
+        suite.set("time", f"{sum(r.duration for r in results):.3f}")
+        suite.extend(result.to_element() for result in results)
+        root = ET.Element("testsuites")
+        root.append(suite)
+        os.makedirs(self.directory, exist_ok=True)
+        ET.ElementTree(root).write(
+            self.junit_path(marker), encoding="utf-8", xml_declaration=True
+        )
+
+    def pytest_sessionfinish(self, session):
+        if self.results:
+            for marker in self.markers:
+                self.write_junit(marker)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.results:
+            return
+        terminalreporter.write_sep("-", "results by marker")
+        for marker in self.markers:
+            counts = self.counts(marker)
+            failed = counts["failures"] + counts["errors"]
+            passed = counts["tests"] - failed - counts["skipped"]
+            terminalreporter.write_line(
+                f"{marker}: {passed} passed, {failed} failed, "
+                f"{counts['skipped']} skipped -> {self.junit_path(marker)}",
+                red=failed > 0,
+            )
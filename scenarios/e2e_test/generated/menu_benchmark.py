@@ -0,0 +1,354 @@
+# 大規模メニューの生成と、カテゴリ切り替え・検索の応答時間ベンチマーク
+import colorsys
+import json
+import os
+import random
+import re
+
+import pytest
+
+from app_server import APP_DIR
+from load_mode import summarize
+from pages import MenuPage
+from results import opt_in_report
+
+# メニュー件数の既定の段階
+DEFAULT_MENU_SIZES = "100,1000,10000,50000"
+
+# 実際の店舗のメニュー件数の想定と、その規模で守るべき操作への応答時間
+# （RAIL モデルの Response: 入力から 100ms 以内）
+REALISTIC_MENU_SIZE = 200
+RESPONSE_BUDGET_MS = 100
+
+# app.js の検索ボックスの debounce（ミリ秒）
+SEARCH_DEBOUNCE_MS = 250
+
+# 生成するメニューのカテゴリ・アレルギー・名前の部品
+CATEGORIES = (
+    "food",
+    "drink",
+    "dessert",
+    "appetizer",
+    "salad",
+    "soup",
+    "pasta",
+    "pizza",
+    "rice",
+    "noodle",
+    "kids",
+    "seasonal",
+)
+ALLERGENS = ("dairy", "gluten", "egg", "soy", "peanut", "shrimp", "wheat", "buckwheat")
+ADJECTIVES = (
+    "Classic",
+    "Spicy",
+    "Grilled",
+    "Crispy",
+    "Creamy",
+    "Smoky",
+    "Fresh",
+    "Garlic",
+    "Honey",
+    "Tomato",
+)
+DISHES = (
+    "Ramen",
+    "Curry",
+    "Burger",
+    "Pizza",
+    "Salad",
+    "Soup",
+    "Pasta",
+    "Gyoza",
+    "Omelette",
+    "Sandwich",
+    "Tacos",
+    "Risotto",
+    "Dumpling",
+    "Pancake",
+    "Parfait",
+    "Latte",
+    "Smoothie",
+    "Soda",
+    "Udon",
+    "Karaage",
+)
+SIZE_OPTION = {
+    "type": "size",
+    "label": "Size",
+    "values": [
+        {"value": "S", "label": "S", "priceDelta": -100},
+        {"value": "M", "label": "M", "priceDelta": 0},
+        {"value": "L", "label": "L", "priceDelta": 200},
+    ],
+}
+
+# 検索の計測に使うキーワード（広く一致する語・少数に一致する語・一致しない語）
+SEARCH_TERMS = ("ramen", "spicy ramen", "no such dish")
+
+# mock-data.js の差し替える部分
+MOCK_MENU_PATTERN = re.compile(r"const MOCK_MENU = \[.*?\n\];", re.S)
+CATEGORIES_PATTERN = re.compile(r"const CATEGORIES = \[.*?\];")
+
+# メニューの描画を計測するフックを入れるスクリプト（ページごとに1回）
+INSTRUMENT_SCRIPT = """
+() => {
+    if (window.__menuBench) return;
+    const bench = (window.__menuBench = {});
+    const onInput = () => { bench.inputAt = performance.now(); };
+    document.addEventListener('input', onInput, true);
+    document.addEventListener('change', onInput, true);
+    const listMenu = MockAPI.listMenu;
+    MockAPI.listMenu = function (...args) {
+        const started = performance.now();
+        const result = listMenu.apply(this, args);
+        bench.filterMs = performance.now() - started;
+        return result;
+    };
+    const render = renderMenu;
+    window.renderMenu = function (...args) {
+        bench.renderStart = performance.now();
+        render.apply(this, args);
+        bench.renderEnd = performance.now();
+        requestAnimationFrame(() => setTimeout(() => {
+            bench.paintedAt = performance.now();
+        }, 0));
+    };
+}
+"""
+
+RESET_SCRIPT = """
+() => Object.assign(window.__menuBench, {
+    inputAt: null, filterMs: null, renderStart: null, renderEnd: null, paintedAt: null,
+})
+"""
+
+PAINTED_SCRIPT = "() => window.__menuBench.paintedAt !== null"
+
+READ_SCRIPT = """
+() => Object.assign({}, window.__menuBench, {
+    cards: document.querySelectorAll('#menuGrid > .card').length,
+})
+"""
+
+CARD_COUNT_SCRIPT = "n => document.querySelectorAll('#menuGrid > .card').length === n"
+
+
+def parse_sizes(value: str) -> list:
+    """--benchmark-menu の値（"100,1000"）をメニュー件数のリストに変換"""
+    try:
+        sizes = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise pytest.UsageError(f"--benchmark-menu が不正です: {value}") from None
+    if not sizes or any(size < 1 for size in sizes):
+        raise pytest.UsageError(f"--benchmark-menu が不正です: {value}")
+    return sorted(sizes)
+
+
+def image_url(category: str) -> str:
+    """カテゴリごとの軽量なプレースホルダー画像（data URI の SVG）"""
+    hue = CATEGORIES.index(category) / len(CATEGORIES)
+    color = "".join(f"{round(c * 255):02x}" for c in colorsys.hls_to_rgb(hue, 0.9, 0.8))
+    return (
+        'data:image/svg+xml;utf8,<svg xmlns="http://www.w3.org/2000/svg" '
+        'width="400" height="300"><rect width="400" height="300" '
+        f'fill="%23{color}"/></svg>'
+    )
+
+
+def generate_menu(size: int, seed: int = 1) -> list:
+    """MOCK_MENU と同じ形式のメニューを size 件生成（シードで再現可能）"""
+    rng = random.Random(seed)
+    menu = []
+    for i in range(size):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        adjective = ADJECTIVES[rng.randrange(len(ADJECTIVES))]
+        dish = DISHES[rng.randrange(len(DISHES))]
+        options = []
+        if i % 3 == 0:
+            options.append(SIZE_OPTION)
+        menu.append(
+            {
+                "id": f"g-{i + 1:05d}",
+                "name": f"{adjective} {dish} No.{i + 1}",
+                "description": f"{adjective.lower()} {dish.lower()} of the {category} menu",
+                "price": 300 + rng.randrange(40) * 50,
+                "imageUrl": image_url(category),
+                "allergies": sorted(rng.sample(ALLERGENS, rng.randrange(4))),
+                "category": category,
+                "options": options,
+            }
+        )
+    return menu
+
+
+def expected_count(menu: list, category: str = "all", q: str = "") -> int:
+    """MockAPI.listMenu の絞り込みで残る件数"""
+    return sum(
+        1
+        for item in menu
+        if (category == "all" or item["category"] == category)
+        and (not q or q.lower() in (item["name"] + item["description"]).lower())
+    )
+
+
+def mock_data_script(menu: list, source: str = None) -> str:
+    """mock-data.js の MOCK_MENU と CATEGORIES を差し替えたスクリプト"""
+    if source is None:
+        with open(os.path.join(APP_DIR, "mock-data.js"), encoding="utf-8") as f:
+            source = f.read()
+    categories = [{"value": "all", "label": "All"}] + [
+        {"value": category, "label": category.capitalize()} for category in CATEGORIES
+    ]
+    replaced, menu_count = MOCK_MENU_PATTERN.subn(
+        lambda _: "const MOCK_MENU = " + json.dumps(menu, ensure_ascii=False) + ";",
+        source,
+    )
+    replaced, category_count = CATEGORIES_PATTERN.subn(
+        lambda _: "const CATEGORIES = " + json.dumps(categories) + ";", replaced
+    )
+    if menu_count != 1 or category_count != 1:
+        raise ValueError("mock-data.js の MOCK_MENU / CATEGORIES が見つかりません")
+    return replaced
+
+
+class MenuBenchmark:
+    """生成したメニューに差し替え、カテゴリ切り替えと検索の応答時間を測る
+
+    mock-data.js への要求をルートで生成したスクリプトに差し替えてからメニュー
+    画面を開く。カテゴリの切り替え（change）と検索（キー入力）から、
+    listMenu の絞り込み・renderMenu の描画・次の描画フレームまでの時間を
+    ブラウザ内の時刻で記録し、描画されたカード数が絞り込みの結果と一致する
+    ことも確認する。
+    """
+
+    def __init__(self, menu_page: MenuPage, samples: int = 5, timeout_ms=120000):
+        self.menu_page = menu_page
+        self.page = menu_page.page
+        self.samples = samples
+        self.timeout_ms = timeout_ms
+        self.menu = []
+        self.script = None
+        self.mismatches = []
+
+    def serve(self, route):
+        """生成したメニューで mock-data.js に応答"""
+        route.fulfill(
+            status=200,
+            body=self.script,
+            content_type="application/javascript; charset=utf-8",
+        )
+
+    def open(self, size: int):
+        """size 件のメニューでメニュー画面を開き、最初の描画を待つ"""
+        self.menu = generate_menu(size)
+        self.script = mock_data_script(self.menu)
+        self.page.route("**/mock-data.js", self.serve)
+        self.menu_page.navigate()
+        self.page.wait_for_function(
+            CARD_COUNT_SCRIPT, arg=size, timeout=self.timeout_ms
+        )
+        self.page.evaluate(INSTRUMENT_SCRIPT)
+
+    def close(self):
+        """mock-data.js の差し替えを外す"""
+        self.page.unroute("**/mock-data.js", self.serve)
+
+    def measure(self, action, category: str, q: str) -> dict:
+        """action を実行し、描画と次の描画フレームまでを待って計測値を返す"""
+        self.page.evaluate(RESET_SCRIPT)
+        action()
+        self.page.wait_for_function(PAINTED_SCRIPT, timeout=self.timeout_ms)
+        sample = self.page.evaluate(READ_SCRIPT)
+        expected = expected_count(self.menu, category, q)
+        if sample["cards"] != expected:
+            self.mismatches.append(
+                f"{len(self.menu)} items, category={category}, q={q!r}: "
+                f"{sample['cards']} cards (expected {expected})"
+            )
+        return sample
+
+    def select_category(self, category: str) -> dict:
+        """カテゴリを切り替える"""
+        return self.measure(
+            lambda: self.page.select_option(MenuPage.CATEGORY_FILTER, category),
+            category,
+            "",
+        )
+
+    def type_search(self, term: str) -> dict:
+        """検索ボックスに1文字ずつ入力する"""
+        return self.measure(
+            lambda: self.page.locator(MenuPage.SEARCH_INPUT).press_sequentially(term),
+            "all",
+            term,
+        )
+
+    def clear_search(self):
+        """検索ボックスを空にする（全件の再描画を待つ）"""
+        self.measure(lambda: self.page.fill(MenuPage.SEARCH_INPUT, ""), "all", "")
+
+    def run_size(self, size: int) -> dict:
+        """size 件のメニューで各操作を samples 回ずつ計測"""
+        self.open(size)
+        try:
+            to_category, to_all = [], []
+            for i in range(self.samples):
+                to_category.append(
+                    self.select_category(CATEGORIES[i % len(CATEGORIES)])
+                )
+                to_all.append(self.select_category("all"))
+            search = {}
+            for term in SEARCH_TERMS:
+                samples = []
+                for _ in range(self.samples):
+                    samples.append(self.type_search(term))
+                    self.clear_search()
+                search[term] = {
+                    "matches": expected_count(self.menu, "all", term),
+                    "keystroke_to_render_ms": summarize(
+                        [s["renderEnd"] - s["inputAt"] for s in samples]
+                    ),
+                    **timings(samples),
+                }
+        finally:
+            self.close()
+        return {
+            "items": size,
+            "category_switch": timings(to_category),
+            "show_all": timings(to_all),
+            "search": search,
+        }
+
+    def run(self, sizes: list) -> list:
+        """メニュー件数の段階ごとに計測"""
+        return [self.run_size(size) for size in sizes]
+
+
+def timings(samples: list) -> dict:
+    """計測値の、入力から次の描画フレームまで・絞り込み・描画のパーセンタイル"""
+    return {
+        "response_ms": summarize([s["paintedAt"] - s["inputAt"] for s in samples]),
+        "filter_ms": summarize([s["filterMs"] for s in samples]),
+        "render_ms": summarize([s["renderEnd"] - s["renderStart"] for s in samples]),
+    }
+
+
+def describe(point: dict) -> str:
+    """メニュー件数1段階分の表示用の1行"""
+    search = point["search"][SEARCH_TERMS[0]]
+    return (
+        f"{point['items']:>6} items: category switch p95 "
+        f"{point['category_switch']['response_ms']['p95']:.1f}ms, show all p95 "
+        f"{point['show_all']['response_ms']['p95']:.1f}ms (render p50 "
+        f"{point['show_all']['render_ms']['p50']:.1f}ms), search "
+        f"{SEARCH_TERMS[0]!r} keystroke->render p95 "
+        f"{search['keystroke_to_render_ms']['p95']:.1f}ms (filter p50 "
+        f"{search['filter_ms']['p50']:.2f}ms)"
+    )
+
+
+# --benchmark-menu 指定時だけ実行し、メニュー件数ごとの結果をサマリーに表示する
+MENU_REPORT = opt_in_report(
+    "menu_benchmark", "benchmark_menu", "menu filter/search scaling", describe
+)
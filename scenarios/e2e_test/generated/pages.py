@@ -0,0 +1,520 @@
+# Page Object モデル
+#
+# 各操作はページへの呼び出し（PageCall）を yield するジェネレータ（フロー）として
+# 1度だけ定義し、同期 API 用のドライバ（run_sync）と非同期 API 用のドライバ
+# （async_pages.run_async）のどちらでも実行できるようにしている。
+import functools
+import time
+from contextlib import contextmanager
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from locators import REGISTRY, Selector, active_profile
+from step_timing import step
+
+# 監視対象要素の変更を MutationObserver で記録し始めるスクリプト
+SETTLE_ARM_SCRIPT = """
+selector => {
+    const watches = (window.__settleWatches = window.__settleWatches || {});
+    if (watches[selector]) watches[selector].observer.disconnect();
+    const target = document.querySelector(selector);
+    if (!target) return false;
+    const watch = { mutations: 0, last: performance.now() };
+    watch.observer = new MutationObserver(() => {
+        watch.mutations++;
+        watch.last = performance.now();
+    });
+    watch.observer.observe(target, {
+        childList: true, subtree: true, attributes: true, characterData: true,
+    });
+    watches[selector] = watch;
+    return true;
+}
+"""
+
+# 変更が起きた後、一定時間静止するまで待つスクリプト
+SETTLE_WAIT_SCRIPT = """
+({ selector, quietMs, timeoutMs }) => new Promise(resolve => {
+    const watches = window.__settleWatches || {};
+    const watch = watches[selector];
+    if (!watch) { resolve(false); return; }
+    const started = performance.now();
+    const done = settled => {
+        watch.observer.disconnect();
+        delete watches[selector];
+        resolve(settled);
+    };
+    const check = () => {
+        const now = performance.now();
+        if (watch.mutations > 0 && now - watch.last >= quietMs) { done(true); return; }
+        if (now - started >= timeoutMs) { done(false); return; }
+        setTimeout(check, Math.min(quietMs, 50));
+    };
+    check();
+})
+"""
+
+# ロケーターに一致した要素を控えて件数を返すスクリプト（DOM は変更しない）
+PROBE_SCRIPT = "elements => (window.__locatorProbe = elements).length"
+
+# 高速な代替に一致した要素が、控えた要素と同じ（同じ順序）か確かめるスクリプト
+PROBE_COMPARE_SCRIPT = """
+elements => {
+    const expected = window.__locatorProbe || [];
+    delete window.__locatorProbe;
+    return expected.length === elements.length
+        && expected.every((element, i) => element === elements[i]);
+}
+"""
+
+
+class PageCall:
+    """フローが yield するページのメソッド呼び出し"""
+
+    def __init__(self, method: str, *args, **kwargs):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def selector(self) -> Selector:
+        """対象のロケーター（レジストリのロケーターでなければ None）"""
+        if self.args and isinstance(self.args[0], Selector):
+            return self.args[0]
+        return None
+
+    def bind(self, page):
+        """page 上の呼び出し（同期 API では結果、非同期 API では awaitable）"""
+        args = self.args
+        if self.selector is not None:
+            args = (REGISTRY.resolve(self.selector), *args[1:])
+        return getattr(page, self.method)(*args, **self.kwargs)
+
+    def __repr__(self):
+        return f"PageCall({self.method!r}, *{self.args!r}, **{self.kwargs!r})"
+
+
+def probe_locator(profile, selector: Selector):
+    """ロケーターの解決時間と一致数を計測するフロー
+
+    高速な代替が宣言されていれば、その解決時間と一致する要素が同じかも記録する。
+    計測の失敗（ナビゲーション中など）はテストに影響させない。
+    """
+    try:
+        started = time.perf_counter()
+        matches = yield PageCall("eval_on_selector_all", str(selector), PROBE_SCRIPT)
+        duration_ms = (time.perf_counter() - started) * 1000
+        fast = {}
+        if selector.fast:
+            started = time.perf_counter()
+            same = yield PageCall(
+                "eval_on_selector_all", selector.fast, PROBE_COMPARE_SCRIPT
+            )
+            fast = {"fast_ms": (time.perf_counter() - started) * 1000, "same": same}
+    except PlaywrightError:
+        return
+    profile.record(selector, duration_ms, matches, **fast)
+
+
+def probe_for(call: PageCall):
+    """ロケーターの計測中なら、呼び出しの前に実行する計測フロー（対象外なら None）"""
+    profile = active_profile()
+    if profile is None or call.selector is None:
+        return None
+    return probe_locator(profile, call.selector)
+
+
+def run_sync(page: Page, flow):
+    """フローを同期 API のページで実行し、フローの戻り値を返す
+
+    呼び出しで発生した例外はフローへ送り返すため、フロー内の try/except が
+    同期・非同期のどちらでも同じように働く。
+    """
+    send, value = flow.send, None
+    while True:
+        try:
+            call = send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            probe = probe_for(call)
+            if probe is not None:
+                run_sync(page, probe)
+            send, value = flow.send, call.bind(page)
+        except Exception as error:
+            send, value = flow.throw, error
+
+
+def flow(func):
+    """ジェネレータのフローを、インスタンスのドライバで実行するメソッドにする
+
+    実行は「クラス名.メソッド名」のステップとして所要時間が記録される。
+    """
+
+    @functools.wraps(func)
+    def method(self, *args, **kwargs):
+        return self.run_step(
+            f"{type(self).__name__}.{func.__name__}", func(self, *args, **kwargs)
+        )
+
+    method.flow = func
+    return method
+
+
+def arm_settle(selector: str):
+    """selector 配下の変更の監視を開始するフロー"""
+    armed = yield PageCall("evaluate", SETTLE_ARM_SCRIPT, selector)
+    if not armed:
+        raise PlaywrightTimeoutError(f"監視対象の要素が見つかりません: {selector}")
+
+
+class PageComponent:
+    """フローを同期 API で実行するページ部品の基底クラス
+
+    公開する操作は @flow を付けたジェネレータとして定義する（@flow なしの
+    ジェネレータメソッドは、フローの中で yield from で使う部品）。非同期 API 用の
+    Page Object（async_pages.py）は run だけを差し替える。
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+
+    def run(self, flow):
+        """フローを実行"""
+        return run_sync(self.page, flow)
+
+    def run_step(self, name: str, flow):
+        """フローを name のステップとして実行"""
+        with step(name):
+            return self.run(flow)
+
+    def call(self, method: str, *args, **kwargs):
+        """ページのメソッドを1回呼び出すフロー"""
+        return (yield PageCall(method, *args, **kwargs))
+
+
+class BasePage(PageComponent):
+    """ベースページクラス"""
+
+    # 描画の安定待ち設定（ミリ秒）
+    SETTLE_QUIET_MS = 100
+    SETTLE_TIMEOUT_MS = 5000
+
+    # トースト通知
+    TOAST = "#toastRegion .toast"
+
+    def __init__(self, page: Page, base_url: str):
+        super().__init__(page)
+        self.base_url = base_url
+
+    @flow
+    def navigate(self):
+        """ページに移動"""
+        yield PageCall("goto", self.base_url)
+        yield PageCall("wait_for_load_state", "networkidle")
+
+    @flow
+    def wait_for_toasts_cleared(self, timeout_ms: int = None):
+        """表示中のトースト通知がすべて消えるまで待機"""
+        yield PageCall(
+            "wait_for_function",
+            f"() => !document.querySelector({self.TOAST!r})",
+            timeout=self.SETTLE_TIMEOUT_MS if timeout_ms is None else timeout_ms,
+        )
+
+    def wait_settle(self, selector: str, quiet_ms: int = None, timeout_ms: int = None):
+        """監視中の selector 配下が変化し、静止するまで待つフロー"""
+        quiet_ms = self.SETTLE_QUIET_MS if quiet_ms is None else quiet_ms
+        timeout_ms = self.SETTLE_TIMEOUT_MS if timeout_ms is None else timeout_ms
+        settled = yield PageCall(
+            "evaluate",
+            SETTLE_WAIT_SCRIPT,
+            {"selector": selector, "quietMs": quiet_ms, "timeoutMs": timeout_ms},
+        )
+        if not settled:
+            raise PlaywrightTimeoutError(
+                f"{selector} が {timeout_ms}ms 以内に安定しませんでした"
+            )
+
+    def settled(
+        self, selector: str, action, quiet_ms: int = None, timeout_ms: int = None
+    ):
+        """action フローで selector 配下が変化し、静止するまで待つフロー"""
+        yield from arm_settle(selector)
+        result = yield from action
+        yield from self.wait_settle(selector, quiet_ms, timeout_ms)
+        return result
+
+    @contextmanager
+    def settle(self, selector: str, quiet_ms: int = None, timeout_ms: int = None):
+        """ブロック内の操作で selector 配下が変化し、静止するまで待機
+
+        固定スリープの代わりに使用する。ブロックに入る前に監視を開始するため、
+        操作直後の描画も取りこぼさない。
+        """
+        with step(f"{type(self).__name__}.settle"):
+            self.run(arm_settle(selector))
+            yield
+            self.run(self.wait_settle(selector, quiet_ms, timeout_ms))
+
+
+class TableSessionPage(BasePage):
+    """テーブルセッション開始ページ"""
+
+    # ロケーター
+    TABLE_ID_INPUT = Selector("#tableIdInput")
+    START_BUTTON = Selector(
+        'button:has-text("開始")', fast='#sessionForm button[type="submit"]'
+    )
+    MENU_HEADING = Selector("text=メニュー")
+
+    @flow
+    def start_session(self, table_id: str):
+        """テーブルセッションを開始"""
+        yield PageCall("fill", self.TABLE_ID_INPUT, table_id)
+        yield PageCall("click", self.START_BUTTON)
+        yield PageCall("wait_for_selector", self.MENU_HEADING)
+
+
+class MenuPage(BasePage):
+    """メニューページ"""
+
+    # ロケーター
+    CATEGORY_FILTER = Selector('select[aria-label="Category"]', fast="#categoryFilter")
+    SEARCH_INPUT = Selector('input[placeholder="Search"]', fast="#searchInput")
+    CART_BUTTON = Selector("#cartToggle")
+    CART_COUNT = Selector(".cart-count")
+    MENU_GRID = Selector("#menuGrid")
+    MENU_ITEM = Selector(
+        'button:has-text("{0}")', fast='#menuGrid button[aria-label*="{0}" i]'
+    )
+
+    def menu_item_selector(self, item_name: str) -> str:
+        """メニューアイテムのセレクタを返す"""
+        return self.MENU_ITEM.format(item_name)
+
+    @flow
+    def filter_by_category(self, category: str):
+        """カテゴリでフィルタリング"""
+        yield from self.settled(  # フィルタリング完了を待機
+            self.MENU_GRID, self.call("select_option", self.CATEGORY_FILTER, category)
+        )
+
+    @flow
+    def search_menu(self, keyword: str):
+        """メニューを検索"""
+        yield from self.settled(
+            self.MENU_GRID, self.call("fill", self.SEARCH_INPUT, keyword)
+        )
+
+    @flow
+    def click_menu_item(self, item_name: str):
+        """メニューアイテムをクリック"""
+        yield PageCall("click", self.menu_item_selector(item_name))
+        yield PageCall("wait_for_selector", MenuDetailDialog.DIALOG)
+
+    @flow
+    def open_cart(self):
+        """カートを開く"""
+        yield PageCall("click", self.CART_BUTTON)
+        yield PageCall("wait_for_selector", CartDialog.DIALOG)
+
+    @flow
+    def get_cart_count(self) -> int:
+        """カート内の商品数を取得"""
+        count_text = yield PageCall("text_content", self.CART_COUNT)
+        return int(count_text) if count_text.isdigit() else 0
+
+
+class MenuDetailDialog(PageComponent):
+    """メニュー詳細ダイアログ"""
+
+    # ロケーター
+    DIALOG = Selector("dialog", fast="#itemDialog")
+    CLOSE_BUTTON = Selector(
+        'dialog button:has-text("✕")', fast='#itemDialog button[data-action="close"]'
+    )
+    ADD_TO_CART_BUTTON = Selector(
+        'dialog button:has-text("カートに追加")', fast="#addToCartBtn"
+    )
+    CANCEL_BUTTON = Selector(
+        'dialog button:has-text("キャンセル")',
+        fast='#itemDialog button[value="cancel"]',
+    )
+    QUANTITY_INPUT = Selector('dialog input[type="number"]', fast="#itemQty")
+    ALLERGY_INFO = Selector('dialog :text("アレルギー:")')
+    SIZE_OPTION = Selector('dialog input[value="{0}"]')
+    ADDED_TOAST = Selector("text=追加しました")
+
+    def size_option_selector(self, size: str) -> str:
+        """サイズオプションのセレクタを返す"""
+        return self.SIZE_OPTION.format(size)
+
+    @flow
+    def select_size(self, size: str):
+        """サイズを選択"""
+        yield PageCall("check", self.size_option_selector(size))
+
+    @flow
+    def set_quantity(self, quantity: int):
+        """数量を設定"""
+        yield PageCall("fill", self.QUANTITY_INPUT, str(quantity))
+
+    @flow
+    def add_to_cart(self):
+        """カートに追加"""
+        yield PageCall("click", self.ADD_TO_CART_BUTTON)
+        yield PageCall("wait_for_selector", self.ADDED_TOAST)
+
+    @flow
+    def cancel(self):
+        """キャンセル"""
+        yield PageCall("click", self.CANCEL_BUTTON)
+
+    @flow
+    def close(self):
+        """ダイアログを閉じる"""
+        yield PageCall("click", self.CLOSE_BUTTON)
+
+    @flow
+    def get_allergy_info(self) -> str:
+        """アレルギー情報を取得"""
+        return (yield PageCall("text_content", self.ALLERGY_INFO))
+
+
+class CartDialog(PageComponent):
+    """カートダイアログ"""
+
+    # ロケーター
+    # カートは <dialog> ではなく role="dialog" のドロワー（#cartDrawer）
+    DIALOG = Selector("#cartDrawer")
+    CLOSE_BUTTON = Selector('#cartDrawer button:has-text("✕")', fast="#closeCart")
+    CHECKOUT_REQUEST_BUTTON = Selector(
+        '#cartDrawer button:has-text("会計リクエスト")', fast="#requestCheckoutBtn"
+    )
+    PLACE_ORDER_BUTTON = Selector(
+        '#cartDrawer button:has-text("注文確定")', fast="#placeOrderBtn"
+    )
+    TOTAL_AMOUNT = Selector('#cartDrawer strong:near(:text("合計"))', fast="#cartTotal")
+    QUANTITY_DECREASE = Selector(
+        '#cartDrawer button:has-text("-")', fast='#cartItems button[data-act="dec"]'
+    )
+    QUANTITY_INCREASE = Selector(
+        '#cartDrawer button:has-text("+")', fast='#cartItems button[data-act="inc"]'
+    )
+    REMOVE_BUTTON = Selector(
+        '#cartDrawer button:has-text("Remove")',
+        fast='#cartItems button[data-act="remove"]',
+    )
+    CART_ITEM = Selector('#cartDrawer :text("{0}")')
+    ORDER_SENT_TOAST = Selector("text=注文送信")
+    CHECKOUT_SENT_TOAST = Selector("text=会計リクエスト送信")
+
+    def cart_item_selector(self, item_name: str) -> str:
+        """カートアイテムのセレクタを返す"""
+        return self.CART_ITEM.format(item_name)
+
+    @flow
+    def place_order(self):
+        """注文を確定"""
+        yield PageCall("click", self.PLACE_ORDER_BUTTON)
+        yield PageCall("wait_for_selector", self.ORDER_SENT_TOAST)
+
+    @flow
+    def request_checkout(self):
+        """会計をリクエスト"""
+        yield PageCall("click", self.CHECKOUT_REQUEST_BUTTON)
+        yield PageCall("wait_for_selector", self.CHECKOUT_SENT_TOAST)
+
+    @flow
+    def close(self):
+        """カートを閉じる"""
+        yield PageCall("click", self.CLOSE_BUTTON)
+
+    @flow
+    def get_total_amount(self) -> str:
+        """合計金額を取得"""
+        return (yield PageCall("text_content", self.TOTAL_AMOUNT))
+
+    @flow
+    def increase_quantity(self):
+        """数量を増加"""
+        yield PageCall("click", self.QUANTITY_INCREASE)
+
+    @flow
+    def decrease_quantity(self):
+        """数量を減少"""
+        yield PageCall("click", self.QUANTITY_DECREASE)
+
+    @flow
+    def remove_item(self):
+        """商品を削除"""
+        yield PageCall("click", self.REMOVE_BUTTON)
+
+
+class EmployeePage(BasePage):
+    """従業員ページ"""
+
+    # ロケーター
+    EMPLOYEE_MODE_BUTTON = Selector('button:has-text("従業員モード")')
+    CUSTOMER_MODE_BUTTON = Selector('button:has-text("顧客モード")')
+    ORDER_LIST = Selector('list[aria-label="Orders"]')
+    ORDER_ITEMS = Selector('list[aria-label="Orders"] > li')
+    ORDERS_CONTAINER = Selector("#ordersList")
+    ORDERS_HEADING = Selector("text=注文管理")
+    MENU_HEADING = Selector("text=メニュー")
+    ORDER_ITEM = Selector('text="{0}"')
+    STATUS_BUTTON = Selector(
+        'button:has-text("{0}")', fast='#ordersList button[data-status="{0}"]'
+    )
+    ORDER_STATUS_BUTTON = Selector(
+        'li:has(strong:text-is("#{0}")) button:has-text("{1}")',
+        fast='#ordersList button[data-id="{0}"][data-status="{1}"]',
+    )
+
+    def order_item_selector(self, order_id: str) -> str:
+        """注文アイテムのセレクタを返す"""
+        return self.ORDER_ITEM.format(order_id)
+
+    def status_button_selector(self, status: str, order_id: str = None) -> str:
+        """ステータスボタンのセレクタを返す（order_id 指定時はその注文のボタン）"""
+        if order_id is not None:
+            return self.ORDER_STATUS_BUTTON.format(order_id, status)
+        return self.STATUS_BUTTON.format(status)
+
+    @flow
+    def switch_to_employee_mode(self):
+        """従業員モードに切り替え"""
+        yield PageCall("click", self.EMPLOYEE_MODE_BUTTON)
+        yield PageCall("wait_for_selector", self.ORDERS_HEADING)
+
+    @flow
+    def switch_to_customer_mode(self):
+        """顧客モードに切り替え"""
+        yield PageCall("click", self.CUSTOMER_MODE_BUTTON)
+        yield PageCall("wait_for_selector", self.MENU_HEADING)
+
+    @flow
+    def get_orders_count(self) -> int:
+        """注文数を取得"""
+        orders = yield PageCall("query_selector_all", self.ORDER_ITEMS)
+        return len(orders)
+
+    @flow
+    def change_order_status(self, status: str, order_id: str = None):
+        """注文ステータスを変更（order_id 省略時は先頭の注文）"""
+        yield from self.settled(
+            self.ORDERS_CONTAINER,
+            self.call("click", self.status_button_selector(status, order_id)),
+        )
+
+    def get_order_details(self, order_id: str) -> dict:
+        """注文詳細を取得"""
+        # 注文詳細の情報を抽出するロジックを実装
+        return {
+            "id": order_id,
+            "status": "placed",  # 実際の実装では要素から取得
+            "table": "T1",  # 実際の実装では要素から取得
+        }
@@ -0,0 +1,244 @@
+# パフォーマンス指標のベースライン保存と回帰判定
+import hashlib
+import math
+import os
+import platform
+import sqlite3
+import time
+import uuid
+
+import pytest
+
+# セッション中の比較結果を pytest の設定オブジェクトに保持するキー
+PERF_COMPARISONS_KEY = pytest.StashKey[list]()
+
+# ベースラインの既定の保存先（tests/ 配下）
+DEFAULT_STORE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tests", ".perf-baseline.sqlite"
+)
+
+# PerformanceRecorder の記録からベースラインに登録する既定の指標
+DEFAULT_CAPTURE_FIELDS = (
+    "navigation.domContentLoadedEventEnd",
+    "navigation.loadEventEnd",
+    "paint.first-contentful-paint",
+    "lcp.startTime",
+    "longTasks.totalDuration",
+    "cdp.JSHeapUsedSize",
+    "cdp.Nodes",
+    "cdp.TaskDuration",
+)
+
+# 判定に必要な最小サンプル数
+MIN_BASELINE_SAMPLES = 5
+MIN_CURRENT_SAMPLES = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    test TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    environment TEXT NOT NULL,
+    value REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_lookup
+    ON samples (test, metric, environment, recorded_at);
+"""
+
+
+def environment_fingerprint(browser_version: str = "", *extra: str) -> str:
+    """計測環境（OS・CPU・Python・ブラウザ、extra の条件）を表す短いハッシュ"""
+    parts = [
+        platform.system(),
+        platform.machine(),
+        str(os.cpu_count()),
+        platform.python_version(),
+        browser_version,
+        *extra,
+    ]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+
+def median(values: list) -> float:
+    """中央値"""
+    return percentile(values, 50)
+
+
+def percentile(values: list, q: float) -> float:
+    """線形補間によるパーセンタイル（q は 0〜100）"""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("空のサンプルのパーセンタイルは計算できません")
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def mann_whitney_greater(baseline: list, current: list) -> float:
+    """current が baseline より大きい方向の片側 Mann-Whitney U 検定の p 値
+
+    同順位補正と連続性補正を行った正規近似を使用する。
+    """
+    n1, n2 = len(baseline), len(current)
+    combined = sorted([(v, 0) for v in baseline] + [(v, 1) for v in current])
+    n = n1 + n2
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1])
+        i = j + 1
+    u = rank_sum - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class Comparison:
+    """1指標分のベースラインとの比較結果"""
+
+    def __init__(self, test: str, metric: str, baseline: list, current: list):
+        self.test = test
+        self.metric = metric
+        self.baseline = baseline
+        self.current = current
+        self.p_value = None
+        self.regressed = False
+
+    @property
+    def sufficient(self) -> bool:
+        """判定に十分なサンプルがあるか"""
+        return (
+            len(self.baseline) >= MIN_BASELINE_SAMPLES
+            and len(self.current) >= MIN_CURRENT_SAMPLES
+        )
+
+    def evaluate(self, alpha: float, min_change: float) -> "Comparison":
+        """有意水準 alpha かつ中央値の悪化率が min_change を超えたら回帰と判定"""
+        if not self.sufficient:
+            return self
+        self.p_value = mann_whitney_greater(self.baseline, self.current)
+        threshold = median(self.baseline) * (1 + min_change)
+        self.regressed = self.p_value < alpha and median(self.current) > threshold
+        return self
+
+    def describe(self) -> str:
+        """サマリー表示用の1行"""
+        current = (
+            f"median {median(self.current):.1f} p95 {percentile(self.current, 95):.1f}"
+        )
+        if not self.sufficient:
+            return (
+                f"{self.test} {self.metric}: {current} "
+                f"(baseline {len(self.baseline)} samples, insufficient)"
+            )
+        verdict = "REGRESSION" if self.regressed else "ok"
+        return (
+            f"{self.test} {self.metric}: {current} vs baseline median "
+            f"{median(self.baseline):.1f} p95 {percentile(self.baseline, 95):.1f} "
+            f"(p={self.p_value:.4f}) {verdict}"
+        )
+
+
+class BaselineStore:
+    """指標のサンプルを SQLite に保存するベースラインストア
+
+    サンプルはテスト・指標・計測環境ごとに保存し、比較には同じ環境の
+    過去の実行のサンプルのみを使用する。run_id は今回の実行を表す。
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.run_id = uuid.uuid4().hex
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 並列シャードが同じファイルに書き込むため、ロックを待ち WAL で読み書きを並行させる
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    def record(self, run_id: str, test: str, environment: str, samples: dict):
+        """指標名 → 値のリストを保存"""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO samples "
+                "(run_id, test, metric, environment, value, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, test, metric, environment, float(value), now)
+                    for metric, values in samples.items()
+                    for value in values
+                ],
+            )
+
+    def baseline(
+        self, test: str, metric: str, environment: str, run_id: str, limit: int = 50
+    ) -> list:
+        """同じ環境の過去の実行（run_id 以外）の直近のサンプル"""
+        rows = self.connection.execute(
+            "SELECT value FROM samples "
+            "WHERE test = ? AND metric = ? AND environment = ? AND run_id != ? "
+            "ORDER BY recorded_at DESC LIMIT ?",
+            (test, metric, environment, run_id, limit),
+        )
+        return [row[0] for row in rows]
+
+    def close(self):
+        """接続を閉じる"""
+        self.connection.close()
+
+
+class PerfBaseline:
+    """テスト1件分の指標サンプルを集め、ベースラインと比較して保存する"""
+
+    def __init__(self, test: str, store: BaselineStore, environment: str):
+        self.test = test
+        self.store = store
+        self.environment = environment
+        self.samples = {}
+
+    def add(self, metric: str, value: float):
+        """指標のサンプルを1件追加"""
+        self.samples.setdefault(metric, []).append(value)
+
+    def add_capture(self, capture: dict, fields=DEFAULT_CAPTURE_FIELDS):
+        """PerformanceRecorder の記録から数値の指標を追加（ラベルを接頭辞にする）"""
+        for field in fields:
+            value = capture
+            for key in field.split("."):
+                value = value.get(key) if isinstance(value, dict) else None
+            if isinstance(value, (int, float)):
+                self.add(f"{capture.get('label', 'capture')}.{field}", value)
+
+    def finish(self, alpha: float, min_change: float, record: bool = True) -> list:
+        """ベースラインと比較した後、今回のサンプルを保存（record が偽なら保存しない）"""
+        comparisons = [
+            Comparison(
+                self.test,
+                metric,
+                self.store.baseline(
+                    self.test, metric, self.environment, self.store.run_id
+                ),
+                values,
+            ).evaluate(alpha, min_change)
+            for metric, values in sorted(self.samples.items())
+        ]
+        if record and self.samples:
+            self.store.record(
+                self.store.run_id, self.test, self.environment, self.samples
+            )
+        return comparisons
@@ -0,0 +1,116 @@
+# ブラウザのパフォーマンス指標の収集
+import time
+from contextlib import contextmanager
+
+from playwright.sync_api import Error, Page
+
+# LCP とロングタスクをページ読み込み直後から記録するスクリプト
+OBSERVER_SCRIPT = """
+(() => {
+    if (window.__perfMetrics) return;
+    const metrics = (window.__perfMetrics = { lcp: null, longTasks: [] });
+    const observe = (type, callback) => {
+        try {
+            new PerformanceObserver(list => list.getEntries().forEach(callback))
+                .observe({ type, buffered: true });
+        } catch (e) { /* 未対応のエントリ種別 */ }
+    };
+    observe('largest-contentful-paint', entry => {
+        metrics.lcp = { startTime: entry.startTime, size: entry.size };
+    });
+    observe('longtask', entry => {
+        metrics.longTasks.push({ startTime: entry.startTime, duration: entry.duration });
+    });
+})();
+"""
+
+# Navigation Timing / Paint Timing と記録済みの指標を返すスクリプト
+COLLECT_SCRIPT = """
+() => {
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const paint = {};
+    performance.getEntriesByType('paint').forEach(e => { paint[e.name] = e.startTime; });
+    const observed = window.__perfMetrics || { lcp: null, longTasks: [] };
+    return {
+        url: location.href,
+        now: performance.now(),
+        navigation: navigation ? navigation.toJSON() : null,
+        paint,
+        lcp: observed.lcp,
+        longTasks: {
+            count: observed.longTasks.length,
+            totalDuration: observed.longTasks.reduce((s, t) => s + t.duration, 0),
+            entries: observed.longTasks,
+        },
+    };
+}
+"""
+
+
+class PerformanceRecorder:
+    """ページのパフォーマンス指標を収集し、テストごとに1つの JSON にまとめる
+
+    Chromium では CDP の Performance.getMetrics（JSHeapUsedSize、Nodes、
+    TaskDuration など）も併せて記録する。
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.captures = []
+        page.add_init_script(OBSERVER_SCRIPT)
+        try:
+            self.cdp = page.context.new_cdp_session(page)
+            self.cdp.send("Performance.enable")
+        except Error:
+            self.cdp = None
+
+    def cdp_metrics(self) -> dict:
+        """CDP の Performance.getMetrics（Chromium 以外では空）"""
+        if self.cdp is None:
+            return {}
+        result = self.cdp.send("Performance.getMetrics")
+        return {m["name"]: m["value"] for m in result["metrics"]}
+
+    def snapshot(self) -> dict:
+        """現在のページの指標を取得"""
+        metrics = self.page.evaluate(COLLECT_SCRIPT)
+        metrics["cdp"] = self.cdp_metrics()
+        return metrics
+
+    def capture(self, label: str) -> dict:
+        """現在の指標を label 付きで記録して返す"""
+        metrics = self.snapshot()
+        metrics["label"] = label
+        self.captures.append(metrics)
+        return metrics
+
+    @contextmanager
+    def flow(self, label: str):
+        """ブロック内の Page Object フローの所要時間と CDP 指標の差分を記録
+
+        yield される辞書には、ブロック終了後に ``duration_ms``（壁時計）と
+        ``cdp_delta``（TaskDuration、LayoutCount などの増分）が入る。
+        """
+        record = {"label": label}
+        before = self.cdp_metrics()
+        started = time.perf_counter()
+        yield record
+        record["duration_ms"] = (time.perf_counter() - started) * 1000
+        after = self.snapshot()
+        record["cdp_delta"] = {
+            name: value - before.get(name, 0.0) for name, value in after["cdp"].items()
+        }
+        record["end"] = after
+        self.captures.append(record)
+
+    def to_json(self, nodeid: str) -> dict:
+        """テスト1件分の結果"""
+        return {"test": nodeid, "captures": self.captures}
+
+    def close(self):
+        """CDP セッションを切断"""
+        if self.cdp is not None:
+            try:
+                self.cdp.detach()
+            except Error:
+                pass
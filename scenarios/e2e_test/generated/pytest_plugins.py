@@ -1,6 +1,35 @@
 # Playwright設定ファイル
+import inspect
+import os
+
+import pytest
 from playwright.sync_api import Page, BrowserContext
 
+import sharding
+from artifacts import (
+    ARTIFACT_WRITER_KEY,
+    ARTIFACTS_DIR,
+    CONSOLE_BUFFER_KEY,
+    ArtifactWriter,
+)
+from asset_cache import ASSET_CACHE_KEY
+from async_pages import ASYNC_LOOP_KEY, LoopThread
+from browser_server import BROWSER_SERVER_KEY
+from context_pool import CONTEXT_POOL_KEY
+from perf_baseline import PERF_COMPARISONS_KEY
+from marker_reports import MarkerReports, parse_markers
+from impact_map import (
+    AFFECTED_SELECTION_KEY,
+    CALL_PASSED_KEY,
+    ImpactMap,
+    describe as describe_affected,
+)
+from locators import LOCATOR_PROFILE_KEY, REGISTRY, LocatorProfile
+from devices import DEVICE_RESULTS_KEY, group_by_device
+from har import HAR_RESULTS_KEY
+from results import OPT_IN_REPORTS, TEST_RESULTS_DIR
+from step_timing import STEP_TIMINGS_KEY, StepTimings
+
 
 def pytest_configure(config):
     """pytest設定"""
@@ -8,10 +37,126 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "e2e: エンドツーエンドテスト")
     config.addinivalue_line("markers", "integration: 統合テスト")
 
+    # 非同期 API のテスト・フィクスチャを実行する専用スレッドのループ（最初の使用時に起動）
+    config.stash[ASYNC_LOOP_KEY] = LoopThread()
+
+    # テスト実行時間の記録（シャード実行時はシャードごとのファイルに書き出す）
+    rootdir = str(config.rootpath)
+    if config.getoption("shard_count") > 1:
+        path = sharding.shard_durations_path(rootdir, config.getoption("shard_index"))
+    else:
+        path = os.path.join(rootdir, sharding.DURATIONS_FILE)
+    config.pluginmanager.register(
+        sharding.DurationRecorder(path), "restaurant-duration-recorder"
+    )
+
+    # 失敗時の成果物・ステップの所要時間・ロケーターの計測（シャード実行時はシャードごとに書き出す）
+    manifest, steps = "manifest.json", "step-timings.jsonl"
+    locators = "locator-profile.json"
+    if config.getoption("shard_count") > 1:
+        shard_index = config.getoption("shard_index")
+        manifest = f"manifest-shard-{shard_index}.json"
+        steps = f"step-timings-shard-{shard_index}.jsonl"
+        locators = f"locator-profile-shard-{shard_index}.json"
+    config.stash[ARTIFACT_WRITER_KEY] = ArtifactWriter(
+        os.path.join(rootdir, TEST_RESULTS_DIR, ARTIFACTS_DIR), manifest
+    )
+    config.stash[STEP_TIMINGS_KEY] = StepTimings(
+        os.path.join(rootdir, TEST_RESULTS_DIR, steps)
+    )
+    if config.getoption("profile_locators"):
+        config.stash[LOCATOR_PROFILE_KEY] = LocatorProfile(
+            os.path.join(rootdir, TEST_RESULTS_DIR, locators)
+        )
+    REGISTRY.prefer_fast = config.getoption("fast_locators")
+
+    # マーカーごとの結果セット（1回の実行を複数の JUnit XML に振り分ける）
+    if config.getoption("marker_reports"):
+        suffix = ""
+        if config.getoption("shard_count") > 1:
+            suffix = f"-shard-{config.getoption('shard_index')}"
+        config.pluginmanager.register(
+            MarkerReports(
+                parse_markers(config.getoption("marker_reports")),
+                os.path.join(rootdir, TEST_RESULTS_DIR),
+                suffix,
+            ),
+            "restaurant-marker-reports",
+        )
+
+
+def pytest_unconfigure(config):
+    """非同期 API のループのスレッドを終了"""
+    loop_thread = config.stash.get(ASYNC_LOOP_KEY, None)
+    if loop_thread is not None:
+        loop_thread.stop()
+
+
+def pytest_report_header(config):
+    """実行条件のヘッダー"""
+    return f"latency profile: {config.getoption('latency_profile')}"
+
+
+def pytest_collection_modifyitems(config, items):
+    """--affected 指定時は影響を受けるテスト、シャード実行時はこのシャードのテストに絞る"""
+    if config.getoption("affected"):
+        select_affected(config, items)
+    shard_count = config.getoption("shard_count")
+    if shard_count <= 1:
+        return
+    shard_index = config.getoption("shard_index")
+    if not 0 <= shard_index < shard_count:
+        raise pytest.UsageError(
+            f"--shard-index は 0〜{shard_count - 1} で指定してください"
+        )
+    durations = sharding.load_durations(
+        os.path.join(str(config.rootpath), sharding.DURATIONS_FILE)
+    )
+    shards = sharding.partition([item.nodeid for item in items], durations, shard_count)
+    assigned = set(shards[shard_index])
+    selected = [item for item in items if item.nodeid in assigned]
+    deselected = [item for item in items if item.nodeid not in assigned]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def select_affected(config, items):
+    """前回の記録からアプリの変更の影響を受けるテストだけを残す"""
+    impact_map = ImpactMap(config.getoption("impact_map"))
+    try:
+        selection = impact_map.affected([item.nodeid for item in items])
+    finally:
+        impact_map.close()
+    config.stash[AFFECTED_SELECTION_KEY] = selection
+    selected = [item for item in items if item.nodeid in selection["reasons"]]
+    deselected = [item for item in items if item.nodeid not in selection["reasons"]]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
 
 def pytest_runtest_setup(item):
     """各テスト実行前の設定"""
-    pass
+    # 指定したオプションがあるときだけ実行するマーカー（results.opt_in_report で登録）
+    for report in OPT_IN_REPORTS:
+        if item.get_closest_marker(report.marker) and not report.enabled(item.config):
+            pytest.skip(report.skip_reason())
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """async def のテストを非同期 API のループのスレッドで実行する
+
+    同期 API のテストと同じセッション・同じ順序のまま実行でき、非同期 API の
+    フィクスチャ（async_browser など）も同じループで作成される。
+    """
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    funcargs = pyfuncitem.funcargs
+    kwargs = {name: funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    pyfuncitem.config.stash[ASYNC_LOOP_KEY].run(pyfuncitem.obj(**kwargs))
+    return True
 
 
 def pytest_runtest_teardown(item):
@@ -19,25 +164,118 @@ def pytest_runtest_teardown(item):
     pass
 
 
-# スクリーンショット保存設定
+def pytest_sessionfinish(session, exitstatus):
+    """成果物・ステップ・ロケーターの記録の書き込みを完了し、--perf-gate 指定時は性能劣化で実行を失敗させる"""
+    session.config.stash[ARTIFACT_WRITER_KEY].close()
+    session.config.stash[STEP_TIMINGS_KEY].close()
+    locator_profile = session.config.stash.get(LOCATOR_PROFILE_KEY, None)
+    if locator_profile is not None:
+        locator_profile.write()
+    comparisons = session.config.stash.get(PERF_COMPARISONS_KEY, [])
+    if session.config.getoption("perf_gate") and any(c.regressed for c in comparisons):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """セッション終了時のサマリー出力"""
+    artifact_writer = config.stash[ARTIFACT_WRITER_KEY]
+    if artifact_writer.entries or artifact_writer.errors:
+        terminalreporter.write_sep("-", "failure artifacts")
+        terminalreporter.write_line(artifact_writer.summary())
+        for error in artifact_writer.errors:
+            terminalreporter.write_line(error, red=True)
+    browser_server = config.stash.get(BROWSER_SERVER_KEY, None)
+    if browser_server is not None:
+        terminalreporter.write_sep("-", "browser server")
+        terminalreporter.write_line(browser_server)
+    asset_cache = config.stash.get(ASSET_CACHE_KEY, None)
+    if asset_cache is not None:
+        terminalreporter.write_sep("-", "asset cache")
+        terminalreporter.write_line(asset_cache.summary())
+    device_results = config.stash.get(DEVICE_RESULTS_KEY, [])
+    if device_results:
+        terminalreporter.write_sep("-", "device matrix")
+        for device, (passed, failed, duration) in group_by_device(
+            device_results
+        ).items():
+            terminalreporter.write_line(
+                f"{device:<8} {passed} passed, {failed} failed ({duration:.1f}s)",
+                red=failed > 0,
+            )
+        for result in device_results:
+            if not result["passed"]:
+                terminalreporter.write_line(
+                    f"{result['test']} [{result['variant']}]: "
+                    f"{result['error'].splitlines()[0]}",
+                    red=True,
+                )
+    har_results = config.stash.get(HAR_RESULTS_KEY, [])
+    if har_results:
+        mode = config.getoption("har")
+        terminalreporter.write_sep("-", f"HAR {mode}")
+        if mode == "record":
+            terminalreporter.write_line(
+                f"{len(har_results)} HAR files written to {config.getoption('har_dir')}"
+            )
+        else:
+            served = sum(result["served"] for result in har_results)
+            unmatched = [u for result in har_results for u in result["unmatched"]]
+            terminalreporter.write_line(
+                f"{len(har_results)} tests replayed, {served} responses served, "
+                f"{len(unmatched)} unmatched requests"
+            )
+            for result in har_results:
+                for request in result["unmatched"]:
+                    terminalreporter.write_line(
+                        f"{result['test']}: {request}", red=True
+                    )
+    context_pool = config.stash.get(CONTEXT_POOL_KEY, None)
+    if context_pool is not None:
+        terminalreporter.write_sep("-", "context pool")
+        terminalreporter.write_line(context_pool.summary())
+    comparisons = config.stash.get(PERF_COMPARISONS_KEY, [])
+    if comparisons:
+        terminalreporter.write_sep("-", "performance baseline")
+        for comparison in comparisons:
+            terminalreporter.write_line(comparison.describe(), red=comparison.regressed)
+    selection = config.stash.get(AFFECTED_SELECTION_KEY, None)
+    if selection is not None:
+        terminalreporter.write_sep("-", "test impact selection")
+        terminalreporter.write_line(describe_affected(selection))
+    step_timings = config.stash[STEP_TIMINGS_KEY]
+    slow_steps = config.getoption("slow_steps")
+    if slow_steps > 0 and step_timings.totals:
+        terminalreporter.write_sep("-", f"top {slow_steps} slow page-object steps")
+        for line in step_timings.table(slow_steps):
+            terminalreporter.write_line(line)
+    locator_profile = config.stash.get(LOCATOR_PROFILE_KEY, None)
+    if locator_profile is not None and locator_profile.stats:
+        terminalreporter.write_sep("-", "locator cost (by total time)")
+        for line in locator_profile.table(20):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"-> {locator_profile.path}")
+    for report in OPT_IN_REPORTS:
+        lines = report.summary(config)
+        if lines:
+            terminalreporter.write_sep("-", report.heading(config))
+            for line, red in lines:
+                terminalreporter.write_line(line, red=red)
+
+
+# 失敗時の成果物の保存
+@pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """テスト失敗時のスクリーンショット保存"""
-    if call.when == "call" and call.excinfo is not None:
-        page = item.funcargs.get("page")
-        if page:
-            screenshot_path = f"screenshots/failed_{item.name}.png"
-            page.screenshot(path=screenshot_path)
-            print(f"Screenshot saved: {screenshot_path}")
-
-
-# ブラウザ設定のカスタマイズ
-def browser_context_args(browser_context_args):
-    """ブラウザコンテキストのデフォルト設定"""
-    return {
-        **browser_context_args,
-        "viewport": {"width": 375, "height": 667},  # iPhone SE サイズ
-        "user_agent": "Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15",
-        "device_scale_factor": 2,
-        "is_mobile": True,
-        "has_touch": True,
-    }
+    """テスト失敗時にページの成果物を取得し、バックグラウンドで書き出す"""
+    outcome = yield
+    report = outcome.get_result()
+    if report.when != "call":
+        return
+    item.stash[CALL_PASSED_KEY] = report.passed
+    if not report.failed:
+        return
+    page = item.funcargs.get("page")
+    if page is None or page.is_closed():
+        return
+    item.config.stash[ARTIFACT_WRITER_KEY].capture(
+        item.nodeid, page, item.stash.get(CONSOLE_BUFFER_KEY, None)
+    )
@@ -0,0 +1,165 @@
+# 従業員画面の注文リスト描画（renderOrders）のスケーリングベンチマーク
+import pytest
+from playwright.sync_api import Error
+
+from load_mode import summarize
+from pages import EmployeePage
+from perf_metrics import PerformanceRecorder
+from results import opt_in_report
+
+# 実際の営業で従業員画面に並ぶ注文数の想定と、その規模で守るべき通知の反映時間
+# （仕様の「注文確定処理: 1秒以内」に合わせる）
+EXPECTED_ORDER_VOLUME = 100
+REALTIME_BUDGET_MS = 1000
+
+# state.orders を count 件まで増やして描画し直すスクリプト（イベントは発行しない）
+GROW_SCRIPT = """
+count => {
+    const state = window.__appState;
+    const menu = MOCK_MENU[0];
+    const items = [{
+        id: menu.id + '_bench', menuId: menu.id, name: menu.name, quantity: 1,
+        options: {}, unitPrice: menu.price, subtotal: menu.price,
+    }];
+    const statuses = ['placed', 'in_kitchen', 'ready', 'served', 'cancelled'];
+    const placedAt = new Date().toISOString();
+    while (state.orders.length < count) {
+        const i = state.orders.length;
+        state.orders.push({
+            orderId: 'o_bench_' + i, tableId: 'T' + (i % 20 + 1), items,
+            total: menu.price, status: statuses[i % statuses.length], placedAt,
+        });
+    }
+    renderOrders();
+    return state.orders.length;
+}
+"""
+
+# イベント1回分の描画時間（同期処理）と、次の描画フレームまでの時間を測るスクリプト
+MEASURE_SCRIPT = """
+async kind => {
+    const state = window.__appState;
+    const started = performance.now();
+    if (kind === 'order.created') {
+        const order = Object.assign({}, state.orders[0], {
+            orderId: 'o_bench_event_' + state.orders.length, status: 'placed',
+        });
+        state.orders.push(order);
+        emit('order.created', { order });
+    } else {
+        const order = state.orders[state.orders.length - 1];
+        order.status = order.status === 'placed' ? 'in_kitchen' : 'placed';
+        emit('order.updated', { orderId: order.orderId, status: order.status });
+    }
+    const rendered = performance.now();
+    await new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+    return { renderMs: rendered - started, paintMs: performance.now() - started };
+}
+"""
+
+# 描画された注文数と DOM ノード数
+DOM_COUNT_SCRIPT = """
+() => ({
+    orders: window.__appState.orders.length,
+    rendered: document.querySelectorAll('#ordersList > li').length,
+    ordersList: document.querySelectorAll('#ordersList *').length,
+    document: document.getElementsByTagName('*').length,
+})
+"""
+
+# 注文件数の既定の段階
+DEFAULT_VOLUMES = "10,100,1000,10000"
+
+
+def parse_volumes(value: str) -> list:
+    """--benchmark-orders の値（"10,100,1000"）を注文件数のリストに変換"""
+    try:
+        volumes = [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise pytest.UsageError(f"--benchmark-orders が不正です: {value}") from None
+    if not volumes or any(volume < 1 for volume in volumes):
+        raise pytest.UsageError(f"--benchmark-orders が不正です: {value}")
+    return sorted(volumes)
+
+
+class OrderBoardBenchmark:
+    """従業員画面に N 件の注文がある状態で、注文イベント1回あたりの描画コストを測る
+
+    注文はイベントを発行せずに state.orders へ直接追加し（件数の準備で描画を
+    繰り返さない）、order.created / order.updated をそれぞれ samples 回発行して
+    renderOrders の同期処理時間と、次の描画フレームまでの時間を記録する。
+    """
+
+    def __init__(
+        self, employee_page: EmployeePage, recorder: PerformanceRecorder, samples=5
+    ):
+        self.employee_page = employee_page
+        self.page = employee_page.page
+        self.recorder = recorder
+        self.samples = samples
+
+    def list_listeners(self) -> int:
+        """#ordersList に登録されたイベントリスナーの数（CDP が使えなければ None）"""
+        cdp = self.recorder.cdp
+        if cdp is None:
+            return None
+        try:
+            target = cdp.send(
+                "Runtime.evaluate",
+                {"expression": "document.querySelector('#ordersList')"},
+            )["result"]
+            listeners = cdp.send(
+                "DOMDebugger.getEventListeners", {"objectId": target["objectId"]}
+            )["listeners"]
+            cdp.send("Runtime.releaseObject", {"objectId": target["objectId"]})
+        except Error:
+            return None
+        return len(listeners)
+
+    def measure(self, volume: int) -> dict:
+        """注文を volume 件にして、イベントごとの描画コストを測る"""
+        self.page.evaluate(GROW_SCRIPT, volume)
+        events = {}
+        for kind in ("order.created", "order.updated"):
+            samples = [
+                self.page.evaluate(MEASURE_SCRIPT, kind) for _ in range(self.samples)
+            ]
+            events[kind] = {
+                "render_ms": summarize([s["renderMs"] for s in samples]),
+                "paint_ms": summarize([s["paintMs"] for s in samples]),
+            }
+        cdp = self.recorder.cdp_metrics()
+        return {
+            "orders": volume,
+            "events": events,
+            "dom_nodes": self.page.evaluate(DOM_COUNT_SCRIPT),
+            "cdp_nodes": cdp.get("Nodes"),
+            "js_event_listeners": cdp.get("JSEventListeners"),
+            "orders_list_listeners": self.list_listeners(),
+        }
+
+    def run(self, volumes: list) -> list:
+        """従業員画面を開き、注文件数の段階ごとに測る"""
+        self.employee_page.navigate()
+        return [self.measure(volume) for volume in volumes]
+
+
+def describe(point: dict) -> str:
+    """スケーリング曲線の1点の表示用の1行"""
+    created = point["events"]["order.created"]
+    updated = point["events"]["order.updated"]
+    listeners = point["orders_list_listeners"]
+    return (
+        f"{point['orders']:>6} orders: order.created render p50 "
+        f"{created['render_ms']['p50']:.1f}ms paint p95 "
+        f"{created['paint_ms']['p95']:.1f}ms, order.updated render p50 "
+        f"{updated['render_ms']['p50']:.1f}ms, #ordersList nodes "
+        f"{point['dom_nodes']['ordersList']}, listeners "
+        f"{'-' if listeners is None else listeners}"
+    )
+
+
+# --benchmark-orders 指定時だけ実行し、注文件数ごとの結果をサマリーに表示する
+BENCHMARK_REPORT = opt_in_report(
+    "benchmark", "benchmark_orders", "order board render scaling", describe
+)
@@ -0,0 +1,98 @@
+# テスト結果・成果物の出力先
+import json
+import os
+import re
+
+import pytest
+
+# 出力ディレクトリ（pytest の rootdir からの相対パス）
+TEST_RESULTS_DIR = "test-results"
+PERFORMANCE_RESULTS_DIR = "performance-results"
+
+
+def safe_name(nodeid: str) -> str:
+    """nodeid をファイル名に使える文字列へ変換"""
+    return re.sub(r"[^\w.-]+", "_", nodeid).strip("_")
+
+
+def result_path(config, directory: str, filename: str) -> str:
+    """rootdir 配下の出力先パス（ディレクトリは作成済み）"""
+    path = os.path.join(str(config.rootpath), directory, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def write_json(path: str, data):
+    """JSON ファイルを書き出す"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+class OptInReport:
+    """オプション指定時だけ実行する計測（負荷テスト・ベンチマークなど）の結果
+
+    marker の付いたテストは option（複数の場合はいずれか）の指定時だけ実行する
+    （pytest_plugins）。add で保持した結果は、セッションの最後に title の見出しで
+    ターミナルのサマリーに1件ずつ describe の行として表示し、failed が真を返す結果は
+    赤で示す。title には結果のリストから見出しを作る関数も渡せる。
+    """
+
+    def __init__(self, marker: str, option, title, describe, failed=None):
+        self.marker = marker
+        self.options = (option,) if isinstance(option, str) else tuple(option)
+        self.title = title
+        self.describe = describe
+        self.failed = failed
+        self.key = pytest.StashKey[list]()
+
+    def enabled(self, config) -> bool:
+        """オプションが指定されているか"""
+        return any(config.getoption(option) for option in self.options)
+
+    def skip_reason(self) -> str:
+        """オプション未指定でスキップするときの理由"""
+        names = " / ".join(f"--{option.replace('_', '-')}" for option in self.options)
+        return f"{names} 指定時のみ実行"
+
+    def add(self, config, *results):
+        """結果をセッションのサマリーに追加"""
+        config.stash.setdefault(self.key, []).extend(results)
+
+    def results(self, config) -> list:
+        """セッション中に追加された結果"""
+        return config.stash.get(self.key, [])
+
+    def path(self, config, filename: str) -> str:
+        """performance-results 配下の出力先パス"""
+        return result_path(config, PERFORMANCE_RESULTS_DIR, filename)
+
+    def write(self, config, filename: str, data) -> str:
+        """結果を performance-results 配下の JSON に書き出し、パスを返す"""
+        path = self.path(config, filename)
+        write_json(path, data)
+        return path
+
+    def heading(self, config) -> str:
+        """ターミナルのサマリーの見出し"""
+        if callable(self.title):
+            return self.title(self.results(config))
+        return self.title
+
+    def summary(self, config) -> list:
+        """ターミナルのサマリーの (行, 赤で表示するか) のリスト"""
+        lines = []
+        for result in self.results(config):
+            red = bool(self.failed(result)) if self.failed is not None else False
+            lines.extend((line, red) for line in self.describe(result).splitlines())
+        return lines
+
+
+# 登録済みの OptInReport（登録順にサマリーを表示する）
+OPT_IN_REPORTS = []
+
+
+def opt_in_report(marker: str, option, title, describe, failed=None) -> OptInReport:
+    """OptInReport を作成し、オプションによる実行の絞り込みとサマリーの表示に登録する"""
+    report = OptInReport(marker, option, title, describe, failed)
+    OPT_IN_REPORTS.append(report)
+    return report
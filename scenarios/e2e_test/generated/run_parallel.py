@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""E2Eテストの並列シャード実行
+
+テストを計測済みの実行時間に基づいて N 個のシャードに分割し、シャードごとに
+独立した pytest プロセス（専用ブラウザ・専用アプリサーバー）で実行する。
+終了後、シャードごとの JUnit XML・実行時間の記録・成果物のマニフェスト・
+ステップの所要時間・ロケーターの計測・マーカーごとの JUnit XML をマージする。
+
+使用例:
+    python run_parallel.py -n 16 tests/ -m e2e
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import sharding
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(ROOT_DIR, "test-results")
+
+# pytest の終了コード: 収集対象なし（シャード数がテスト数より多い場合など）
+EXIT_NO_TESTS_COLLECTED = 5
+
+
+def parse_args(argv: list):
+    """コマンドライン引数を解析（未知の引数は pytest に渡す）"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-n",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="ワーカー（シャード）数（既定: CPU コア数）",
+    )
+    parser.add_argument(
+        "--junitxml",
+        default="pytest-report.xml",
+        help="マージ後の JUnit XML の出力先",
+    )
+    return parser.parse_known_args(argv)
+
+
+def main(argv: list = None) -> int:
+    """シャードを並列実行し、結果をマージする"""
+    args, pytest_args = parse_args(sys.argv[1:] if argv is None else argv)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+
+    processes = []
+    started = time.perf_counter()
+    for index in range(args.workers):
+        junit = os.path.join(RESULTS_DIR, f"junit-shard-{index}.xml")
+        log_path = os.path.join(RESULTS_DIR, f"shard-{index}.log")
+        command = [
+            sys.executable,
+            "-m",
+            "pytest",
+            f"--shard-count={args.workers}",
+            f"--shard-index={index}",
+            f"--junitxml={junit}",
+            *pytest_args,
+        ]
+        log = open(log_path, "w", encoding="utf-8")
+        process = subprocess.Popen(
+            command, cwd=ROOT_DIR, stdout=log, stderr=subprocess.STDOUT
+        )
+        processes.append((index, process, log, junit, log_path))
+
+    exit_code = 0
+    for index, process, log, junit, log_path in processes:
+        code = process.wait()
+        log.close()
+        if code == EXIT_NO_TESTS_COLLECTED:
+            code = 0
+        status = "OK" if code == 0 else f"FAILED (exit {code})"
+        print(f"[shard {index}] {status} - {os.path.relpath(log_path, ROOT_DIR)}")
+        if code != 0:
+            with open(log_path, encoding="utf-8") as f:
+                print(f.read())
+        exit_code = max(exit_code, code)
+
+    sharding.merge_junit(
+        [junit for _, _, _, junit, _ in processes],
+        os.path.join(ROOT_DIR, args.junitxml),
+    )
+    durations = {}
+    for index in range(args.workers):
+        path = sharding.shard_durations_path(ROOT_DIR, index)
+        durations.update(sharding.load_durations(path))
+        if os.path.exists(path):
+            os.remove(path)
+    if durations:
+        sharding.save_durations(
+            os.path.join(ROOT_DIR, sharding.DURATIONS_FILE), durations
+        )
+    for path in sharding.merge_shard_outputs(RESULTS_DIR, args.workers):
+        print(f"マージ: {os.path.relpath(path, ROOT_DIR)}")
+
+    elapsed = time.perf_counter() - started
+    print(f"{args.workers} シャードで実行完了: {elapsed:.1f}秒 -> {args.junitxml}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
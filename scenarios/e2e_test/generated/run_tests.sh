@@ -26,17 +26,11 @@ python -m playwright install chromium
 # テスト実行
 echo "E2Eテストを実行中..."
 
-# スモークテストのみ実行
-echo "=== スモークテスト実行 ==="
-python -m pytest tests/ -m smoke -v --tb=short
-
-# 全E2Eテスト実行
-echo "=== 全E2Eテスト実行 ==="
-python -m pytest tests/ -m e2e -v --tb=short
-
-# 統合テスト実行
-echo "=== 統合テスト実行 ==="
-python -m pytest tests/ -m integration -v --tb=short
+# スモーク・E2E・統合テストを1回の実行でまとめて実行
+# （複数マーカーを持つテストも1回だけ実行し、結果はマーカーごとに
+#   test-results/junit-<marker>.xml へ出力）
+echo "=== スモーク・E2E・統合テスト実行 ==="
+python -m pytest tests/ --marker-reports smoke,e2e,integration -v --tb=short --junitxml=pytest-report.xml
 
 echo "テスト完了!"
 
@@ -0,0 +1,125 @@
+# UI を操作せずにアプリの状態（セッション・カート・注文）を用意するシード
+import json
+
+from playwright.sync_api import Page
+
+# 注文ステータス（app.js の statusButtons の遷移順 + cancelled）
+ORDER_STATUSES = ("placed", "in_kitchen", "ready", "served", "cancelled")
+
+# 注文の商品を省略したときに使う商品
+DEFAULT_ITEM = "Margherita Pizza"
+
+# シードを適用する初期化スクリプト
+# セッションはアプリの起動前に localStorage へ書き込み（アプリ自身の復元処理で
+# メニュー画面になる）、カートと注文は起動後（load）に state へ書き込んでから
+# アプリの描画処理（renderCart / order.created / updateMode）を呼ぶ。
+SEED_SCRIPT = """
+(seed => {
+    if (seed.table) {
+        localStorage.setItem('demo.session', JSON.stringify({
+            token: 'sess_seed',
+            tableId: seed.table,
+            expires: new Date(Date.now() + 60 * 60 * 1000).toISOString(),
+        }));
+    }
+    window.addEventListener('load', () => {
+        const state = window.__appState;
+        const item = (spec, key) => {
+            const menu = MOCK_MENU.find(m => m.id === spec.menu || m.name === spec.menu);
+            if (!menu) throw new Error('unknown menu item: ' + spec.menu);
+            const options = {};
+            let unitPrice = menu.price;
+            menu.options.forEach(opt => {
+                options[opt.type] = opt.values[0].value;
+                unitPrice += opt.values[0].priceDelta;
+            });
+            return {
+                id: menu.id + '_seed' + key, menuId: menu.id, name: menu.name,
+                quantity: spec.quantity, options, unitPrice,
+                subtotal: unitPrice * spec.quantity,
+            };
+        };
+        state.cart.items = seed.cart.map((spec, i) => item(spec, i));
+        renderCart();
+        seed.orders.forEach((spec, i) => {
+            const items = spec.items.map((s, j) => item(s, i + '_' + j));
+            const order = {
+                orderId: 'o_seed_' + (i + 1), tableId: seed.table || 'T1', items,
+                total: items.reduce((sum, it) => sum + it.subtotal, 0),
+                status: spec.status, placedAt: new Date().toISOString(),
+            };
+            state.orders.push(order);
+            emit('order.created', { order });
+        });
+        if (seed.view === 'staff') {
+            state.viewMode = 'staff';
+            updateMode();
+        }
+        window.__seeded = true;
+    });
+})(%s);
+"""
+
+
+def normalize_item(spec) -> dict:
+    """商品の指定（名前・ID、(名前, 数量)、辞書）を辞書に変換"""
+    if isinstance(spec, str):
+        return {"menu": spec, "quantity": 1}
+    if isinstance(spec, (tuple, list)):
+        menu, quantity = spec
+        return {"menu": menu, "quantity": quantity}
+    return {"menu": spec["menu"], "quantity": spec.get("quantity", 1)}
+
+
+def normalize_order(spec) -> dict:
+    """注文の指定（ステータス、辞書）を辞書に変換"""
+    if isinstance(spec, str):
+        spec = {"status": spec}
+    status = spec.get("status", "placed")
+    if status not in ORDER_STATUSES:
+        raise ValueError(f"不明な注文ステータスです: {status}")
+    items = spec.get("items") or [DEFAULT_ITEM]
+    return {"status": status, "items": [normalize_item(item) for item in items]}
+
+
+class AppSeed:
+    """テーブルセッション・カート・注文を UI 操作なしで用意するシード
+
+    例: ``AppSeed("T1", orders=["placed", "placed", "in_kitchen"], view="staff")``
+    は、テーブル T1 のセッションで3件の注文（うち1件は調理中）がある従業員画面になる。
+    """
+
+    def __init__(self, table: str = None, cart=(), orders=(), view: str = "customer"):
+        if view not in ("customer", "staff"):
+            raise ValueError(f"view は customer または staff です: {view}")
+        self.table = table
+        self.cart = [normalize_item(item) for item in cart]
+        self.orders = [normalize_order(order) for order in orders]
+        self.view = view
+
+    @classmethod
+    def from_marker(cls, marker) -> "AppSeed":
+        """``@pytest.mark.seed(...)`` の引数から作成"""
+        return cls(*marker.args, **marker.kwargs)
+
+    @property
+    def order_ids(self) -> list:
+        """用意される注文の ID（注文順）"""
+        return [f"o_seed_{i + 1}" for i in range(len(self.orders))]
+
+    def to_json(self) -> dict:
+        """初期化スクリプトに渡すシード"""
+        return {
+            "table": self.table,
+            "cart": self.cart,
+            "orders": self.orders,
+            "view": self.view,
+        }
+
+    def script(self) -> str:
+        """シードを適用する初期化スクリプト"""
+        return SEED_SCRIPT % json.dumps(self.to_json(), ensure_ascii=False)
+
+    def apply(self, page: Page):
+        """以降のページ読み込みでシードを適用する"""
+        page.add_init_script(self.script())
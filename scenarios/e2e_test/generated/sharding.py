@@ -0,0 +1,214 @@
+# 並列シャード実行のサポート
+import functools
+import heapq
+import json
+import os
+import re
+import statistics
+import xml.etree.ElementTree as ET
+
+from artifacts import ARTIFACTS_DIR
+from results import write_json
+
+# 計測済みテスト実行時間の保存先
+DURATIONS_FILE = ".test-durations.json"
+
+# 実行時間が未計測のテストに仮定する時間（秒）
+DEFAULT_DURATION = 1.0
+
+
+def load_durations(path: str) -> dict:
+    """計測済みのテスト実行時間（nodeid → 秒）を読み込む"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_durations(path: str, durations: dict):
+    """テスト実行時間を既存の記録にマージして保存"""
+    merged = load_durations(path)
+    merged.update(durations)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+
+def partition(nodeids: list, durations: dict, shard_count: int) -> list:
+    """テストを実行時間に基づいてシャードへ割り当てる
+
+    長いテストから順に、その時点で合計時間が最も短いシャードへ割り当てる
+    （LPT スケジューリング）。未計測のテストは計測済みテストの中央値で見積もる。
+    同じ入力に対して常に同じ割り当てを返す。
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    fallback = statistics.median(known) if known else DEFAULT_DURATION
+    ordered = sorted(nodeids, key=lambda n: (-durations.get(n, fallback), n))
+    shards = [[] for _ in range(shard_count)]
+    heap = [(0.0, index) for index in range(shard_count)]
+    for nodeid in ordered:
+        total, index = heapq.heappop(heap)
+        shards[index].append(nodeid)
+        heapq.heappush(heap, (total + durations.get(nodeid, fallback), index))
+    return shards
+
+
+def merge_junit(paths: list, output: str, name: str = "pytest"):
+    """シャードごとの JUnit XML を1つの testsuite にマージ
+
+    件数は合算し、time は最も長いシャード（実時間）を採用する。
+    """
+    merged = ET.Element("testsuite", name=name)
+    counts = {"tests": 0, "failures": 0, "errors": 0, "skipped": 0}
+    elapsed = 0.0
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+        for suite in suites:
+            for key in counts:
+                counts[key] += int(suite.get(key, 0))
+            elapsed = max(elapsed, float(suite.get("time", 0)))
+            merged.extend(suite)
+    for key, value in counts.items():
+        merged.set(key, str(value))
+    merged.set("time", f"{elapsed:.3f}")
+    root = ET.Element("testsuites")
+    root.append(merged)
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    ET.ElementTree(root).write(output, encoding="utf-8", xml_declaration=True)
+
+
+def merge_manifests(paths: list, output: str):
+    """シャードごとの失敗時の成果物のマニフェストをマージ"""
+    merged = {"artifacts": [], "errors": []}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        merged["artifacts"].extend(manifest["artifacts"])
+        merged["errors"].extend(manifest["errors"])
+    merged["artifacts"].sort(key=lambda entry: entry["captured_at"])
+    write_json(output, merged)
+
+
+def merge_jsonl(paths: list, output: str):
+    """シャードごとの JSON Lines（ステップの所要時間）を連結"""
+    with open(output, "w", encoding="utf-8") as merged:
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                merged.writelines(f)
+
+
+def merge_locator_profiles(paths: list, output: str):
+    """シャードごとのロケーターの計測を、ロケーターごとに合算"""
+    merged = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+        for entry in entries:
+            total = merged.get(entry["name"])
+            if total is None:
+                merged[entry["name"]] = entry
+                continue
+            calls = total["calls"] + entry["calls"]
+            if "fast" in total and "fast" in entry:
+                total["fast"]["mean_ms"] = round(
+                    (
+                        total["fast"]["mean_ms"] * total["calls"]
+                        + entry["fast"]["mean_ms"] * entry["calls"]
+                    )
+                    / calls,
+                    3,
+                )
+                total["fast"]["mismatches"] += entry["fast"]["mismatches"]
+            total["calls"] = calls
+            total["total_ms"] = round(total["total_ms"] + entry["total_ms"], 3)
+            total["mean_ms"] = round(total["total_ms"] / calls, 3)
+            total["max_ms"] = max(total["max_ms"], entry["max_ms"])
+            total["matches"] = [
+                min(total["matches"][0], entry["matches"][0]),
+                max(total["matches"][1], entry["matches"][1]),
+            ]
+    ranking = sorted(merged.values(), key=lambda e: e["total_ms"], reverse=True)
+    write_json(output, ranking)
+
+
+def merge_shard_outputs(results_dir: str, shard_count: int) -> list:
+    """シャードごとに書き出した結果ファイルをマージし、マージ後のパスを返す
+
+    失敗時の成果物のマニフェスト・ステップの所要時間・ロケーターの計測・
+    マーカーごとの JUnit XML が対象。マージしたシャードのファイルは削除する。
+    """
+    artifacts_dir = os.path.join(results_dir, ARTIFACTS_DIR)
+    groups = {
+        os.path.join(artifacts_dir, "manifest.json"): (
+            merge_manifests,
+            [
+                os.path.join(artifacts_dir, f"manifest-shard-{i}.json")
+                for i in range(shard_count)
+            ],
+        ),
+        os.path.join(results_dir, "step-timings.jsonl"): (
+            merge_jsonl,
+            [
+                os.path.join(results_dir, f"step-timings-shard-{i}.jsonl")
+                for i in range(shard_count)
+            ],
+        ),
+        os.path.join(results_dir, "locator-profile.json"): (
+            merge_locator_profiles,
+            [
+                os.path.join(results_dir, f"locator-profile-shard-{i}.json")
+                for i in range(shard_count)
+            ],
+        ),
+    }
+    markers = {}
+    names = os.listdir(results_dir) if os.path.isdir(results_dir) else []
+    for name in sorted(names):
+        match = re.fullmatch(r"junit-(.+)-shard-(\d+)\.xml", name)
+        if match and int(match.group(2)) < shard_count:
+            markers.setdefault(match.group(1), []).append(
+                os.path.join(results_dir, name)
+            )
+    for marker, paths in markers.items():
+        output = os.path.join(results_dir, f"junit-{marker}.xml")
+        groups[output] = (functools.partial(merge_junit, name=marker), paths)
+
+    merged = []
+    for output, (merge, paths) in groups.items():
+        paths = [path for path in paths if os.path.exists(path)]
+        if not paths:
+            continue
+        merge(paths, output)
+        for path in paths:
+            os.remove(path)
+        merged.append(output)
+    return merged
+
+
+def shard_durations_path(rootdir: str, index: int) -> str:
+    """シャードごとの実行時間記録のパス"""
+    return os.path.join(rootdir, "test-results", f"durations-shard-{index}.json")
+
+
+class DurationRecorder:
+    """各テストの実行時間（setup + call + teardown）を記録するプラグイン"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = (
+            self.durations.get(report.nodeid, 0.0) + report.duration
+        )
+
+    def pytest_sessionfinish(self, session):
+        if self.durations:
+            save_durations(self.path, self.durations)
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""営業1シフト分の操作を数分に圧縮して流す長時間稼働テストモード（ソーク）
+
+来店・注文・ステータスの進行（placed → in_kitchen → ready → served）・会計
+リクエスト・退店をシード付きで計画し、シフト上の時刻を実時間に圧縮して
+Page Object で実行する。シフト中ずっと開いたままの従業員画面について、
+一定間隔で GC 後の JS ヒープ・DOM ノード・イベントリスナーと操作の応答時間を
+時系列（JSONL）に1行ずつ書き出すため、中断しても途中までの結果が残る。
+
+使用例:
+    python -m pytest tests/test_soak_shift.py --soak-minutes 10
+    python soak_mode.py report performance-results/soak/shift.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+
+import pytest
+from playwright.sync_api import BrowserContext
+from playwright.sync_api import Error as PlaywrightError
+
+from leak_detector import LeakDetector
+from load_mode import STAFF_BRIDGE_SCRIPT, TABLE_BRIDGE_SCRIPT, summarize
+from pages import CartDialog, EmployeePage, MenuDetailDialog, MenuPage, TableSessionPage
+from results import opt_in_report, write_json
+
+# 時系列のサンプルを取る間隔（シフト上の分）
+SAMPLE_EVERY_MINUTES = 10
+
+# 来店1回の流れ（シフト上の分、範囲は一様乱数）
+FIRST_ORDER_AFTER = 5  # 着席から最初の注文まで
+ORDER_INTERVAL = 20  # 追加注文の間隔
+ORDERS_PER_VISIT = (1, 3)
+STATUS_STEPS = (("in_kitchen", 2), ("ready", 12), ("served", 15))  # 注文からの経過
+CHECKOUT_AFTER_SERVED = (10, 25)
+LEAVE_AFTER_CHECKOUT = 5
+NEXT_PARTY_AFTER = (5, 20)
+
+MENU_ITEMS = ("Margherita Pizza", "Iced Coffee", "Caesar Salad")
+
+# シフトの最初と最後の1時間で、操作の応答時間の中央値が何倍までなら許容するか
+DEGRADATION_LIMIT = 2.0
+
+# 従業員画面の注文一覧の状態と、前回のサンプル以降に届いた注文を取り出すスクリプト
+BOARD_SCRIPT = """
+() => ({
+    statuses: window.__appState.orders.reduce(
+        (counts, order) => (counts[order.status] = (counts[order.status] || 0) + 1, counts),
+        {}),
+    delivered: window.__loadResults.splice(0),
+})
+"""
+
+LAST_ORDER_SCRIPT = (
+    "() => window.__appState.orders[window.__appState.orders.length - 1].orderId"
+)
+
+
+def plan_shift(hours: float, tables: int, seed: int = 1) -> list:
+    """シフト全体の操作の予定（シフト上の分 "at" の順）
+
+    テーブルごとに、前の客の退店から少し空けて次の客が着席する。来店1回の
+    予定がシフトの終わりまでに収まらなければ、そのテーブルの受け付けを終える。
+    サンプルは SAMPLE_EVERY_MINUTES ごと（同じ時刻の操作の後）と、シフトの終わりに入る。
+    """
+    rng = random.Random(seed)
+    end = hours * 60
+    events = []
+    for seat in range(tables):
+        table = f"T{seat + 1}"
+        arrive = rng.uniform(0, NEXT_PARTY_AFTER[1])
+        visit = 0
+        while True:
+            visit += 1
+            planned = [{"at": arrive, "kind": "arrive"}]
+            for n in range(rng.randint(*ORDERS_PER_VISIT)):
+                ordered = arrive + FIRST_ORDER_AFTER + n * ORDER_INTERVAL
+                key = f"{table}-{visit}-{n + 1}"
+                item = MENU_ITEMS[rng.randrange(len(MENU_ITEMS))]
+                planned.append(
+                    {"at": ordered, "kind": "order", "order": key, "item": item}
+                )
+                planned.extend(
+                    {"at": ordered + delay, "kind": "status", "order": key, "status": s}
+                    for s, delay in STATUS_STEPS
+                )
+            checkout = planned[-1]["at"] + rng.uniform(*CHECKOUT_AFTER_SERVED)
+            leave = checkout + LEAVE_AFTER_CHECKOUT
+            if leave > end:
+                break
+            planned.append({"at": checkout, "kind": "checkout"})
+            planned.append({"at": leave, "kind": "leave"})
+            events.extend({**event, "table": table} for event in planned)
+            arrive = leave + rng.uniform(*NEXT_PARTY_AFTER)
+    samples = [
+        i * SAMPLE_EVERY_MINUTES for i in range(int(end // SAMPLE_EVERY_MINUTES) + 1)
+    ]
+    if samples[-1] < end:
+        samples.append(end)  # 間隔で割り切れないシフトでも終わりの状態を取る
+    events.extend({"at": at, "kind": "sample"} for at in samples)
+    return sorted(events, key=lambda event: event["at"])
+
+
+class SoakShift:
+    """シフトの予定を実時間に圧縮して実行し、従業員画面の推移を記録する
+
+    予定の時刻より実行が遅れた場合は待たずに続け、遅れ（lag_s）を記録する。
+    操作の失敗はサンプルに記録して続行し、失敗した注文のステータス変更は行わない。
+    """
+
+    def __init__(
+        self,
+        context: BrowserContext,
+        base_url: str,
+        hours: float = 8,
+        minutes: float = 10,
+        tables: int = 6,
+        seed: int = 1,
+    ):
+        if hours <= 0 or minutes <= 0:
+            raise pytest.UsageError(
+                "--soak-hours と --soak-minutes は正の値で指定してください"
+            )
+        self.context = context
+        self.base_url = base_url
+        self.hours = hours
+        self.minutes = minutes
+        self.tables_count = tables
+        self.seed = seed
+        self.staff = None
+        self.tables = {}
+        self.order_ids = {}
+        self.latencies = {}
+        self.errors = []
+        self.samples = []
+        self.summary = None
+
+    @property
+    def compression(self) -> float:
+        """シフト上の時間が実時間の何倍で進むか"""
+        return self.hours * 60 / self.minutes
+
+    def open_staff_view(self) -> EmployeePage:
+        """シフト中ずっと開いておく従業員画面"""
+        page = self.context.new_page()
+        page.add_init_script(STAFF_BRIDGE_SCRIPT)
+        staff = EmployeePage(page, self.base_url)
+        staff.navigate()
+        staff.switch_to_employee_mode()
+        return staff
+
+    def timed(self, action: str, at: float, operation) -> bool:
+        """operation を実行して応答時間を記録（失敗は記録して False）"""
+        started = time.perf_counter()
+        try:
+            operation()
+        except PlaywrightError as error:
+            self.errors.append(
+                {
+                    "at": round(at, 1),
+                    "action": action,
+                    "error": str(error).splitlines()[0],
+                }
+            )
+            return False
+        self.latencies.setdefault(action, []).append(
+            round((time.perf_counter() - started) * 1000, 1)
+        )
+        return True
+
+    def arrive(self, event: dict):
+        """テーブルのページを開いてセッションを開始"""
+        page = self.context.new_page()
+        page.add_init_script(TABLE_BRIDGE_SCRIPT)
+        session = TableSessionPage(page, self.base_url)
+
+        def seat():
+            session.navigate()
+            session.start_session(event["table"])
+
+        if self.timed("seat", event["at"], seat):
+            self.tables[event["table"]] = (
+                MenuPage(page, self.base_url),
+                MenuDetailDialog(page),
+                CartDialog(page),
+            )
+        else:
+            page.close()
+
+    def order(self, event: dict):
+        """商品をカートに追加して注文を確定"""
+        menu, dialog, cart = self.tables[event["table"]]
+
+        def add_to_cart():
+            menu.click_menu_item(event["item"])
+            dialog.add_to_cart()
+
+        def place_order():
+            menu.open_cart()
+            cart.place_order()
+            cart.close()
+
+        if self.timed("add_to_cart", event["at"], add_to_cart) and self.timed(
+            "place_order", event["at"], place_order
+        ):
+            self.order_ids[event["order"]] = menu.page.evaluate(LAST_ORDER_SCRIPT)
+
+    def change_status(self, event: dict):
+        """従業員画面で注文のステータスを進める"""
+        order_id = self.order_ids[event["order"]]
+        self.timed(
+            "status",
+            event["at"],
+            lambda: self.staff.change_order_status(event["status"], order_id),
+        )
+
+    def checkout(self, event: dict):
+        """会計をリクエスト"""
+        menu, _, cart = self.tables[event["table"]]
+
+        def request_checkout():
+            menu.open_cart()
+            cart.request_checkout()
+            cart.close()
+
+        self.timed("checkout", event["at"], request_checkout)
+
+    def leave(self, event: dict):
+        """テーブルのページを閉じる"""
+        menu, _, _ = self.tables.pop(event["table"])
+        menu.page.close()
+
+    def perform(self, event: dict):
+        """予定の操作を1つ実行（前の操作の失敗で実行できないものは飛ばす）"""
+        if event["kind"] == "arrive":
+            self.arrive(event)
+        elif event["table"] not in self.tables:
+            return
+        elif event["kind"] == "status":
+            if event["order"] in self.order_ids:
+                self.change_status(event)
+        else:
+            getattr(self, event["kind"])(event)
+
+    def sample(self, detector: LeakDetector, at: float, lag: float, elapsed: float):
+        """時系列の1行（前回のサンプル以降の操作の応答時間を含む）"""
+        metrics = detector.sample()
+        board = self.staff.page.evaluate(BOARD_SCRIPT)
+        latencies, self.latencies = self.latencies, {}
+        errors, self.errors = self.errors, []
+        delivered = [
+            round(result["paintedAt"] - result["placedAt"], 1)
+            for result in board["delivered"]
+        ]
+        if delivered:
+            latencies["order_to_board"] = delivered
+        return {
+            "shift_minute": at,
+            "elapsed_s": round(elapsed, 2),
+            "lag_s": round(lag, 2),
+            "heap_bytes": metrics["JSHeapUsedSize"],
+            "dom_nodes": metrics["Nodes"],
+            "listeners": metrics["JSEventListeners"],
+            "board": board["statuses"],
+            "open_tables": len(self.tables),
+            "latency_ms": latencies,
+            "errors": errors,
+        }
+
+    def run(self, series_path: str, summary_path: str) -> dict:
+        """シフトを実行して時系列を series_path に、サマリーを summary_path に書き出す
+
+        中断・失敗した場合も、それまでのサンプルからサマリーを書き出す。
+        """
+        events = plan_shift(self.hours, self.tables_count, self.seed)
+        status = "interrupted"
+        detector = None
+        try:
+            self.staff = self.open_staff_view()
+            detector = LeakDetector(self.staff.page)
+            started = time.perf_counter()
+            with open(series_path, "w", encoding="utf-8") as series:
+                for event in events:
+                    due = event["at"] * 60 / self.compression
+                    elapsed = time.perf_counter() - started
+                    if due > elapsed:
+                        time.sleep(due - elapsed)
+                    if event["kind"] != "sample":
+                        self.perform(event)
+                        continue
+                    elapsed = time.perf_counter() - started
+                    sample = self.sample(
+                        detector, event["at"], max(elapsed - due, 0.0), elapsed
+                    )
+                    self.samples.append(sample)
+                    series.write(json.dumps(sample, ensure_ascii=False) + "\n")
+                    series.flush()
+            status = "completed"
+        except Exception as error:
+            status = f"failed: {type(error).__name__}: {str(error).splitlines()[0]}"
+            raise
+        finally:
+            self.summary = {
+                "hours": self.hours,
+                "minutes": self.minutes,
+                "tables": self.tables_count,
+                "compression": self.compression,
+                "series": series_path,
+                **summarize_series(self.samples, status),
+            }
+            write_json(summary_path, self.summary)
+            self.close(detector)
+        return self.summary
+
+    def close(self, detector: LeakDetector):
+        """開いているページを閉じる（閉じられなくてもサマリーは残す）"""
+        pages = [menu.page for menu, _, _ in self.tables.values()]
+        if self.staff is not None:
+            pages.append(self.staff.page)
+        try:
+            if detector is not None:
+                detector.close()
+            for page in pages:
+                page.close()
+        except PlaywrightError:
+            pass
+        self.tables = {}
+
+
+def load_series(path: str) -> list:
+    """時系列の JSONL を読む（書きかけの最後の行は無視する）"""
+    samples = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                samples.append(json.loads(line))
+            except json.JSONDecodeError:
+                break
+    return samples
+
+
+def growth_per_hour(samples: list, key: str) -> float:
+    """指標のシフト1時間あたりの増加（シフト上の分に対する最小二乗法の傾き）
+
+    シフトの終わりのサンプルは間隔が短いことがあるため、サンプルの順番ではなく
+    シフト上の時刻に対して当てはめる。
+    """
+    if len(samples) < 2:
+        return 0.0
+    minutes = [sample["shift_minute"] for sample in samples]
+    values = [sample[key] for sample in samples]
+    mean_x = sum(minutes) / len(minutes)
+    mean_y = sum(values) / len(values)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(minutes, values))
+    denominator = sum((x - mean_x) ** 2 for x in minutes)
+    return numerator / denominator * 60 if denominator else 0.0
+
+
+def degradation(samples: list) -> dict:
+    """操作ごとの、シフトの最後の1時間と最初の1時間の応答時間の中央値の比"""
+    if not samples or samples[-1]["shift_minute"] < 120:
+        return {}
+    last = samples[-1]["shift_minute"]
+    first_hour = [s for s in samples if 0 < s["shift_minute"] <= 60]
+    last_hour = [s for s in samples if s["shift_minute"] > last - 60]
+    ratios = {}
+    for action in sorted({a for s in samples for a in s["latency_ms"]}):
+        before = [v for s in first_hour for v in s["latency_ms"].get(action, [])]
+        after = [v for s in last_hour for v in s["latency_ms"].get(action, [])]
+        if before and after and summarize(before)["p50"] > 0:
+            ratios[action] = summarize(after)["p50"] / summarize(before)["p50"]
+    return ratios
+
+
+def summarize_series(samples: list, status: str) -> dict:
+    """時系列全体のサマリー（途中までの時系列でもよい）"""
+    actions, values = Counter(), {}
+    for sample in samples:
+        for action, latencies in sample["latency_ms"].items():
+            actions[action] += len(latencies)
+            values.setdefault(action, []).extend(latencies)
+    summary = {
+        "status": status,
+        "samples": len(samples),
+        "shift_minutes": samples[-1]["shift_minute"] if samples else 0,
+        "elapsed_s": samples[-1]["elapsed_s"] if samples else 0.0,
+        "max_lag_s": max((s["lag_s"] for s in samples), default=0.0),
+        "actions": dict(actions),
+        "errors": sum(len(s["errors"]) for s in samples),
+        "latency_ms": {action: summarize(v) for action, v in values.items()},
+        "degradation": degradation(samples),
+    }
+    if samples:
+        summary["growth_per_hour"] = {
+            key: growth_per_hour(samples, key)
+            for key in ("heap_bytes", "dom_nodes", "listeners")
+        }
+        summary["start"] = {
+            key: samples[0][key] for key in ("heap_bytes", "dom_nodes", "listeners")
+        }
+        summary["end"] = {
+            key: samples[-1][key]
+            for key in ("heap_bytes", "dom_nodes", "listeners", "board")
+        }
+    return summary
+
+
+def describe(summary: dict) -> str:
+    """サマリー表示用の1行"""
+    line = (
+        f"{summary['shift_minutes'] / 60:.1f}h of shift in "
+        f"{summary['elapsed_s'] / 60:.1f}min [{summary['status']}]: "
+        f"{summary['samples']} samples, {sum(summary['actions'].values())} timed actions, "
+        f"{summary['errors']} errors, max lag {summary['max_lag_s']:.1f}s"
+    )
+    growth = summary.get("growth_per_hour")
+    if growth:
+        line += (
+            f", per shift hour heap {growth['heap_bytes'] / 1024:+.1f}KB "
+            f"nodes {growth['dom_nodes']:+.0f} listeners {growth['listeners']:+.1f}"
+        )
+    if summary["degradation"]:
+        action, ratio = max(summary["degradation"].items(), key=lambda item: item[1])
+        line += f", slowest drift {action} x{ratio:.2f}"
+    return line
+
+
+def describe_with_series(summary: dict) -> str:
+    """サマリー表示用の行（時系列のファイルのパスを含む）"""
+    return f"{describe(summary)}\n-> {summary['series']}"
+
+
+# --soak-minutes 指定時だけ実行し、シフトのサマリーを表示する（中断・エラーは赤）
+SOAK_REPORT = opt_in_report(
+    "soak",
+    "soak_minutes",
+    "soak shift",
+    describe_with_series,
+    failed=lambda summary: summary["status"] != "completed" or summary["errors"] > 0,
+)
+
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("series", help="ソークテストの時系列（JSONL）")
+    args = parser.parse_args(argv)
+
+    summary = summarize_series(load_series(args.series), "from series")
+    print(describe(summary))
+    for action, latency in sorted(summary["latency_ms"].items()):
+        print(
+            f"  {action:<15} n={summary['actions'][action]:<5} "
+            f"p50 {latency['p50']:.1f}ms p95 {latency['p95']:.1f}ms "
+            f"max {latency['max']:.1f}ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,146 @@
+# Page Object の操作（ステップ）ごとの所要時間の記録
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import pytest
+
+# セッション全体の集計を pytest の設定オブジェクトに保持するキー
+STEP_TIMINGS_KEY = pytest.StashKey["StepTimings"]()
+
+# 記録中のテストと、実行中のステップ（非同期タスクごとに独立）
+_recorder = contextvars.ContextVar("step_recorder", default=None)
+_current = contextvars.ContextVar("current_step", default=None)
+
+
+class Step:
+    """1回の操作の所要時間と、その中で呼ばれた操作"""
+
+    __slots__ = ("name", "start_ms", "duration_ms", "failed", "children")
+
+    def __init__(self, name: str, start_ms: float):
+        self.name = name
+        self.start_ms = start_ms
+        self.duration_ms = None
+        self.failed = False
+        self.children = []
+
+    def to_json(self) -> dict:
+        """ステップツリーの JSON 表現"""
+        data = {
+            "name": self.name,
+            "start_ms": round(self.start_ms, 3),
+            "duration_ms": (
+                None if self.duration_ms is None else round(self.duration_ms, 3)
+            ),
+        }
+        if self.failed:
+            data["failed"] = True
+        if self.children:
+            data["children"] = [child.to_json() for child in self.children]
+        return data
+
+    def walk(self):
+        """自身と子孫のステップを順に返す"""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class StepRecorder:
+    """テスト1件分のステップツリー"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.roots = []
+
+    @contextmanager
+    def activate(self):
+        """ブロック内で実行された操作を記録する"""
+        token = _recorder.set(self)
+        try:
+            yield self
+        finally:
+            _recorder.reset(token)
+
+    def to_json(self) -> list:
+        """ステップツリーの JSON 表現"""
+        return [root.to_json() for root in self.roots]
+
+
+@contextmanager
+def step(name: str):
+    """ブロックを1つのステップとして記録（記録中でなければ何もしない）"""
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    parent = _current.get()
+    started = time.perf_counter()
+    node = Step(name, (started - recorder.origin) * 1000)
+    (parent.children if parent is not None else recorder.roots).append(node)
+    token = _current.set(node)
+    try:
+        yield
+    except BaseException:
+        node.failed = True
+        raise
+    finally:
+        node.duration_ms = (time.perf_counter() - started) * 1000
+        _current.reset(token)
+
+
+class StepTimings:
+    """テストごとのステップツリーを JSON Lines に書き出し、ステップ名ごとに集計する"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.totals = {}
+        self.file = None
+
+    def add(self, nodeid: str, recorder: StepRecorder):
+        """テスト1件分のステップを記録"""
+        if not recorder.roots:
+            return
+        for root in recorder.roots:
+            for node in root.walk():
+                if node.duration_ms is None:
+                    continue
+                total = self.totals.setdefault(node.name, [0, 0.0, 0.0])
+                total[0] += 1
+                total[1] += node.duration_ms
+                total[2] = max(total[2], node.duration_ms)
+        if self.file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.file = open(self.path, "w", encoding="utf-8")
+        self.file.write(
+            json.dumps(
+                {"test": nodeid, "steps": recorder.to_json()}, ensure_ascii=False
+            )
+            + "\n"
+        )
+
+    def slowest(self, limit: int) -> list:
+        """合計時間の長い順のステップ（名前、回数、合計、平均、最大）"""
+        rows = [
+            (name, count, total, total / count, longest)
+            for name, (count, total, longest) in self.totals.items()
+        ]
+        return sorted(rows, key=lambda row: row[2], reverse=True)[:limit]
+
+    def close(self):
+        """ファイルを閉じる"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def table(self, limit: int) -> list:
+        """サマリー表示用の行"""
+        lines = [f"{'step':<44} {'calls':>6} {'total ms':>10} {'mean':>8} {'max':>8}"]
+        for name, count, total, mean, longest in self.slowest(limit):
+            lines.append(
+                f"{name:<44} {count:>6} {total:>10.1f} {mean:>8.1f} {longest:>8.1f}"
+            )
+        return lines
@@ -0,0 +1,78 @@
+"""失敗時の成果物ライターのテスト"""
+
+import gzip
+import json
+import os
+
+from playwright.sync_api import Error
+
+from artifacts import ArtifactWriter
+
+
+class FakePage:
+    """成果物の取得元になるページ"""
+
+    url = "http://app/"
+
+    def screenshot(self, full_page=False):
+        return b"\x89PNG"
+
+    def content(self):
+        return "<html></html>"
+
+    def evaluate(self, script):
+        raise Error("Execution context was destroyed")
+
+    def is_closed(self):
+        return False
+
+
+def test_writer_stays_idle_without_failures(tmp_path):
+    writer = ArtifactWriter(str(tmp_path))
+    writer.close()
+
+    assert writer.thread is None
+    assert not os.path.exists(writer.manifest_path)
+
+
+def test_writer_compresses_artifacts_and_indexes_manifest(tmp_path):
+    writer = ArtifactWriter(str(tmp_path), maxsize=1)
+    for i in range(3):
+        writer.capture(f"tests/test_x.py::test_{i}", FakePage())
+    writer.close()
+
+    with open(writer.manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert [a["test"] for a in manifest["artifacts"]] == [
+        f"tests/test_x.py::test_{i}" for i in range(3)
+    ]
+    entry = manifest["artifacts"][0]
+    assert set(entry["files"]) == {"screenshot.png", "dom.html"}
+    assert "app-state.json" in entry["errors"]
+    dom_path = os.path.join(str(tmp_path), entry["files"]["dom.html"]["path"])
+    with gzip.open(dom_path, "rt", encoding="utf-8") as f:
+        assert f.read() == "<html></html>"
+
+
+class UnserializablePage(FakePage):
+    """JSON に変換できないアプリの状態を返すページ"""
+
+    def evaluate(self, script):
+        return {"orders": object()}
+
+
+def test_writer_records_unexpected_errors_and_keeps_writing(tmp_path):
+    writer = ArtifactWriter(str(tmp_path), maxsize=1)
+    writer.capture("tests/test_x.py::test_bad", UnserializablePage())
+    for i in range(2):
+        writer.capture(f"tests/test_x.py::test_{i}", FakePage())
+    writer.close()
+
+    with open(writer.manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert [a["test"] for a in manifest["artifacts"]] == [
+        "tests/test_x.py::test_0",
+        "tests/test_x.py::test_1",
+    ]
+    assert len(manifest["errors"]) == 1
+    assert manifest["errors"][0].startswith("tests/test_x.py::test_bad: TypeError")
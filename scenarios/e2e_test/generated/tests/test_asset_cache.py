@@ -0,0 +1,48 @@
+"""
+アセットキャッシュ（asset_cache.py）のユニットテスト
+"""
+
+import os
+
+from asset_cache import AssetCache
+
+BASE_URL = "http://127.0.0.1:5500/app/"
+
+
+def test_hit_after_first_lookup(tmp_path):
+    """2回目以降のアクセスはファイルを読まずにキャッシュから応答すること"""
+    (tmp_path / "index.html").write_text("<html></html>")
+    cache = AssetCache(BASE_URL, root=str(tmp_path))
+
+    first, _ = cache.lookup(BASE_URL)
+    second, _ = cache.lookup(BASE_URL)
+
+    assert first == second == b"<html></html>"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalidated_when_mtime_changes(tmp_path):
+    """ファイルの mtime が変わったエントリは読み直されること"""
+    script = tmp_path / "app.js"
+    script.write_text("v1")
+    cache = AssetCache(BASE_URL, root=str(tmp_path))
+    cache.lookup(BASE_URL + "app.js")
+
+    script.write_text("v2")
+    stat = os.stat(script)
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    body, entry = cache.lookup(BASE_URL + "app.js")
+
+    assert body == b"v2"
+    assert cache.invalidations == 1
+    assert entry.content_type in ("application/javascript", "text/javascript")
+
+
+def test_ignores_urls_outside_app(tmp_path):
+    """アプリ外のパスや存在しないファイルは対象外となること"""
+    (tmp_path / "index.html").write_text("")
+    cache = AssetCache(BASE_URL, root=str(tmp_path))
+
+    assert cache.lookup(BASE_URL + "../secret.txt") is None
+    assert cache.lookup(BASE_URL + "missing.js") is None
+    assert not cache.matches("http://example.com/app.js")
@@ -0,0 +1,72 @@
+"""
+非同期 API のループのスレッド（async_pages.LoopThread）のテスト
+
+同期 API の Playwright は、メインスレッドに自身のループを「実行中」として残す。
+同じセッションで同期 API のテストの後に非同期 API のテストを実行できることを確認する。
+"""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+from playwright.async_api import async_playwright
+
+from async_pages import LoopThread, run_in_thread
+
+REQUEST_ID = contextvars.ContextVar("REQUEST_ID", default=None)
+
+
+def test_sync_playwright_runs_first(playwright):
+    # pytest-playwright の playwright フィクスチャ（同期 API）を起動する
+    assert "iPhone SE" in playwright.devices
+
+
+async def test_async_playwright_runs_after_sync_playwright():
+    async with async_playwright() as playwright:
+        assert "iPhone SE" in playwright.devices
+    assert threading.current_thread().name == "async-playwright"
+
+
+def test_async_fixture_runs_after_sync_playwright(async_loop):
+    async def devices():
+        async with async_playwright() as playwright:
+            return playwright.devices
+
+    assert "iPhone SE" in async_loop.run(devices())
+
+
+def test_run_in_thread_ignores_a_running_loop_on_the_caller():
+    """呼び出し元のスレッドでループが実行中でも、新しいループで実行できること"""
+    # 同期 API の Playwright が残したループは、後続のテストのために元に戻す
+    previous = asyncio._get_running_loop()
+    loop = asyncio.new_event_loop()
+    asyncio._set_running_loop(loop)
+    try:
+        assert run_in_thread(asyncio.sleep(0, result="done")) == "done"
+    finally:
+        asyncio._set_running_loop(previous)
+        loop.close()
+
+
+def test_loop_thread_propagates_contextvars_and_exceptions():
+    loop_thread = LoopThread()
+
+    async def current():
+        return REQUEST_ID.get()
+
+    async def fail():
+        raise ValueError("boom")
+
+    try:
+        token = REQUEST_ID.set("T1")
+        try:
+            assert loop_thread.run(current()) == "T1"
+        finally:
+            REQUEST_ID.reset(token)
+        assert loop_thread.run(current()) is None
+        with pytest.raises(ValueError, match="boom"):
+            loop_thread.run(fail())
+    finally:
+        loop_thread.stop()
+    assert loop_thread.thread is None
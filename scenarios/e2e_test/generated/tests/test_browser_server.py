@@ -0,0 +1,86 @@
+"""常駐ブラウザの起動・ヘルスチェック・終了のテスト
+
+Chromium の代わりに、DevTools の HTTP エンドポイントだけを模したスクリプトを使う。
+"""
+
+import sys
+import time
+
+import pytest
+
+from browser_server import BrowserServer
+
+FAKE_CHROMIUM = """
+import json, os, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+user_data = [a.split("=", 1)[1] for a in sys.argv if a.startswith("--user-data-dir=")][0]
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = {"webSocketDebuggerUrl": "ws://fake"} if self.path == "/json/version" else []
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(json.dumps(body).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+server = HTTPServer(("127.0.0.1", 0), Handler)
+with open(os.path.join(user_data, "DevToolsActivePort"), "w") as f:
+    f.write(f"{server.server_address[1]}\\n/devtools/browser/fake\\n")
+server.serve_forever()
+"""
+
+
+@pytest.fixture
+def fake_chromium(tmp_path):
+    path = tmp_path / "chromium"
+    path.write_text(f"#!{sys.executable}\n{FAKE_CHROMIUM}")
+    path.chmod(0o755)
+    return str(path)
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = BrowserServer(str(tmp_path / "browser.json"))
+    yield server
+    server.stop()
+
+
+def test_start_reuse_and_stop(server, fake_chromium):
+    assert server.endpoint() is None
+    endpoint = server.start(fake_chromium, idle_timeout=60)
+    assert endpoint is not None and server.endpoint() == endpoint
+    # 2回目以降はロックファイルから同じ接続先を使う
+    assert BrowserServer(server.lockfile).endpoint() == endpoint
+
+    assert server.stop()
+    deadline = time.monotonic() + 5
+    while server.read() is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert server.read() is None and server.endpoint() is None
+
+
+def test_shuts_down_after_idle_timeout(server, fake_chromium):
+    assert server.start(fake_chromium, idle_timeout=0.2) is not None
+    deadline = time.monotonic() + 5
+    while server.read() is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert server.read() is None
+
+
+def test_stale_lockfile_is_not_healthy(server):
+    with open(server.lockfile, "w") as f:
+        f.write('{"pid": 999999999, "endpoint": "http://127.0.0.1:9"}')
+    assert server.endpoint() is None
+    assert not server.stop()
+
+
+def test_stop_is_posix_only(tmp_path, monkeypatch):
+    server = BrowserServer(str(tmp_path / "browser.json"))
+    monkeypatch.setattr("browser_server.os.name", "nt")
+    with pytest.raises(NotImplementedError):
+        server.stop()
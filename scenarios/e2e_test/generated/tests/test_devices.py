@@ -0,0 +1,67 @@
+"""
+デバイスマトリクス（devices.py）のユニットテスト
+"""
+
+import asyncio
+
+import pytest
+
+from async_pages import run_in_thread
+from devices import DEVICES, DeviceMatrix, group_by_device, matrix, parse_names
+
+
+def test_matrix_combines_devices_and_locales():
+    variants = matrix(["mobile", "desktop"], ["ja", "en"])
+    assert [v.id for v in variants] == [
+        "mobile-ja",
+        "mobile-en",
+        "desktop-ja",
+        "desktop-en",
+    ]
+    assert variants[1].context_args() == {**DEVICES["mobile"], "locale": "en"}
+    assert "locale" not in matrix(["tablet"])[0].context_args()
+
+
+def test_parse_names_rejects_unknown_device():
+    assert parse_names("mobile, tablet", DEVICES, "--devices") == ["mobile", "tablet"]
+    with pytest.raises(pytest.UsageError):
+        parse_names("mobile,watch", DEVICES, "--devices")
+
+
+class FakeContext:
+    def __init__(self, args):
+        self.args = args
+
+    async def new_page(self):
+        return self
+
+
+def test_variants_run_concurrently_and_failures_are_collected():
+    """各組み合わせが並行に実行され、失敗は組み合わせごとにまとめて報告されること"""
+    running, peak = [], []
+
+    async def new_context(**args):
+        return FakeContext(args)
+
+    async def scenario(page, variant):
+        running.append(variant.id)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(variant.id)
+        assert page.args["viewport"]["width"] >= 768, "too narrow"
+
+    device_matrix = DeviceMatrix(new_context, matrix(DEVICES))
+    with pytest.raises(AssertionError, match=r"\[mobile\] AssertionError: too narrow"):
+        run_in_thread(device_matrix.run(scenario))
+
+    assert max(peak) == len(DEVICES)
+    assert [r["passed"] for r in device_matrix.results] == [False, True, True]
+
+
+def test_group_by_device():
+    results = [
+        {"device": "mobile", "passed": True, "duration": 1.0},
+        {"device": "mobile", "passed": False, "duration": 0.5},
+        {"device": "desktop", "passed": True, "duration": 2.0},
+    ]
+    assert group_by_device(results) == {"mobile": (1, 1, 1.5), "desktop": (1, 0, 2.0)}
@@ -0,0 +1,135 @@
+"""
+HAR の記録と再生（har.py）のユニットテスト
+"""
+
+import base64
+import json
+
+import pytest
+
+from har import HarReplay, annotate_recording, main, relative_url, stale_assets
+
+RECORDED_URL = "http://127.0.0.1:40123/"
+REPLAY_URL = "http://127.0.0.1:51000/"
+
+
+def entry(url, body, method="GET", status=200, encoding=None):
+    content = {"mimeType": "text/plain", "text": body}
+    if encoding == "base64":
+        content = {"mimeType": "image/png", "text": base64.b64encode(body).decode()}
+        content["encoding"] = "base64"
+    return {
+        "request": {"method": method, "url": url},
+        "response": {
+            "status": status,
+            "headers": [
+                {"name": "Content-Type", "value": content["mimeType"]},
+                {"name": "Content-Encoding", "value": "gzip"},
+                {"name": "Content-Length", "value": "999"},
+            ],
+            "content": content,
+        },
+    }
+
+
+@pytest.fixture
+def har_file(tmp_path):
+    path = tmp_path / "flow.har"
+    entries = [
+        entry(RECORDED_URL, "<html>v1</html>"),
+        entry(RECORDED_URL + "app.js", "console.log(1)"),
+        entry(RECORDED_URL + "app.js", "console.log(2)"),
+        entry(RECORDED_URL + "logo.png", b"\x89PNG", encoding="base64"),
+    ]
+    path.write_text(json.dumps({"log": {"version": "1.2", "entries": entries}}))
+    annotate_recording(str(path), RECORDED_URL)
+    return str(path)
+
+
+class FakeRoute:
+    def __init__(self, url, method="GET"):
+        self.request = type("Request", (), {"url": url, "method": method})()
+        self.fulfilled = None
+        self.aborted = None
+
+    def fulfill(self, **response):
+        self.fulfilled = response
+
+    def abort(self, error_code):
+        self.aborted = error_code
+
+
+def replay_request(replay, url, method="GET"):
+    route = FakeRoute(url, method)
+    replay.handle(route)
+    return route
+
+
+@pytest.mark.parametrize(
+    "url, base, expected",
+    [
+        ("http://h:1/app.js", "http://h:1/", "app.js"),
+        ("http://h:1/", "http://h:1/", ""),
+        ("http://h:1/app/a.js?v=2", "http://h:1/app/", "a.js?v=2"),
+        ("http://h:1/app", "http://h:1/app/", ""),
+        ("http://h:2/app.js", "http://h:1/", None),
+        ("http://h:1/other/a.js", "http://h:1/app/", None),
+    ],
+)
+def test_relative_url(url, base, expected):
+    assert relative_url(url, base) == expected
+
+
+def test_replay_matches_across_ports(har_file):
+    """記録時と異なるポートでも、相対 URL で記録済みの応答を返すこと"""
+    replay = HarReplay(har_file, REPLAY_URL)
+
+    route = replay_request(replay, REPLAY_URL)
+    image = replay_request(replay, REPLAY_URL + "logo.png")
+
+    assert route.fulfilled["body"] == b"<html>v1</html>"
+    assert route.fulfilled["headers"] == {"Content-Type": "text/plain"}
+    assert image.fulfilled["body"] == b"\x89PNG"
+    assert replay.served == 2 and replay.unmatched == []
+
+
+def test_repeated_requests_follow_recording_order(har_file):
+    """同じリクエストは記録順に応答し、使い切った後は最後の応答を返すこと"""
+    replay = HarReplay(har_file, REPLAY_URL)
+    bodies = [
+        replay_request(replay, REPLAY_URL + "app.js").fulfilled["body"]
+        for _ in range(3)
+    ]
+    assert bodies == [b"console.log(1)", b"console.log(2)", b"console.log(2)"]
+
+
+def test_unmatched_requests_are_blocked_and_recorded(har_file):
+    """記録にないリクエスト（メソッド違い・外部オリジン）は遮断されること"""
+    replay = HarReplay(har_file, REPLAY_URL)
+
+    post = replay_request(replay, REPLAY_URL + "app.js", method="POST")
+    external = replay_request(replay, "https://cdn.example.com/font.woff2")
+
+    assert post.aborted == external.aborted == "blockedbyclient"
+    assert replay.unmatched == [
+        f"POST {REPLAY_URL}app.js",
+        "GET https://cdn.example.com/font.woff2",
+    ]
+
+
+def test_stale_assets(har_file, tmp_path):
+    """記録時と内容が異なるファイル・なくなったファイルを検出すること"""
+    app = tmp_path / "app"
+    app.mkdir()
+    (app / "index.html").write_text("<html>v1</html>")
+    (app / "app.js").write_text("console.log(3)")
+
+    assert stale_assets(har_file, root=str(app)) == [
+        ("app.js", "changed"),
+        ("logo.png", "missing"),
+    ]
+
+
+def test_check_command_reports_stale_files(har_file, tmp_path, capsys):
+    assert main(["check", "--har-dir", str(tmp_path)]) == 1
+    assert "1 of 1 HAR files are stale" in capsys.readouterr().out
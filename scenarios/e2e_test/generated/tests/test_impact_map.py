@@ -0,0 +1,171 @@
+"""JS カバレッジによるテスト影響範囲の選択のテスト"""
+
+from impact_map import ImpactMap
+
+APP_JS = """function renderCart() { return 'cart'; }
+function statusButtons(o) { return o.status; }
+const x = () => 1;
+"""
+
+
+def offsets(source, text):
+    start = source.index(text)
+    return {"startOffset": start, "endOffset": start + len(text), "count": 1}
+
+
+def coverage(source, *functions):
+    """CDP の Profiler.takePreciseCoverage と同じ形の結果"""
+    script_functions = [
+        {"functionName": "", "ranges": [offsets(source, source)]},
+    ]
+    for name, text in functions:
+        script_functions.append(
+            {"functionName": name, "ranges": [offsets(source, text)]}
+        )
+    script_functions.append(
+        {
+            "functionName": "x",
+            "ranges": [{"startOffset": 0, "endOffset": 1, "count": 0}],
+        }
+    )
+    return [
+        {"url": "http://127.0.0.1:8000/app.js", "functions": script_functions},
+        {"url": "https://cdn.example.com/lib.js", "functions": []},
+    ]
+
+
+def make_map(tmp_path):
+    root = tmp_path / "app"
+    root.mkdir()
+    (root / "app.js").write_text(APP_JS, encoding="utf-8")
+    return ImpactMap(str(tmp_path / "map.sqlite"), root=str(root)), root
+
+
+def test_covered_functions_skip_top_level_and_uncalled(tmp_path):
+    impact_map, _ = make_map(tmp_path)
+    functions = impact_map.covered_functions(
+        coverage(APP_JS, ("renderCart", "function renderCart() { return 'cart'; }")),
+        "http://127.0.0.1:8000/",
+    )
+
+    assert [(f[0], f[1]) for f in functions.values()] == [("app.js", "renderCart")]
+
+
+def test_affected_selects_tests_whose_functions_changed(tmp_path):
+    impact_map, root = make_map(tmp_path)
+    base_url = "http://127.0.0.1:8000/"
+    cart = ("renderCart", "function renderCart() { return 'cart'; }")
+    status = ("statusButtons", "function statusButtons(o) { return o.status; }")
+    impact_map.record(
+        "test_cart",
+        impact_map.covered_functions(coverage(APP_JS, cart), base_url),
+        True,
+    )
+    impact_map.record(
+        "test_staff",
+        impact_map.covered_functions(coverage(APP_JS, status), base_url),
+        True,
+    )
+    impact_map.record("test_broken", {}, False)
+
+    tests = ["test_cart", "test_staff", "test_broken", "test_new"]
+    assert impact_map.affected(tests)["reasons"] == {
+        "test_broken": "did not pass last time",
+        "test_new": "not recorded",
+    }
+
+    # renderCart だけを変更（前に行を追加してオフセットもずらす）
+    edited = "// edited\n" + APP_JS.replace("'cart'", "'drawer'")
+    (root / "app.js").write_text(edited, encoding="utf-8")
+    selection = impact_map.affected(tests)
+
+    assert selection["reasons"]["test_cart"] == "covered function changed"
+    assert "test_staff" not in selection["reasons"]
+    assert len(selection["changed"]) == 1
+    impact_map.close()
+
+
+def test_loaded_files_include_every_local_asset(tmp_path):
+    impact_map, root = make_map(tmp_path)
+    (root / "index.html").write_text("<script src=app.js></script>", encoding="utf-8")
+    (root / "styles.css").write_text("body {}", encoding="utf-8")
+    files = impact_map.loaded_files(
+        [
+            "http://127.0.0.1:8000/",
+            "http://127.0.0.1:8000/styles.css?v=1",
+            "http://127.0.0.1:8000/app.js",
+            "http://127.0.0.1:8000/missing.js",
+            "https://cdn.example.com/lib.js",
+        ],
+        "http://127.0.0.1:8000/",
+    )
+
+    assert sorted(file for file, _ in files.values()) == [
+        "app.js",
+        "index.html",
+        "styles.css",
+    ]
+    impact_map.close()
+
+
+def test_affected_selects_tests_whose_loaded_files_changed(tmp_path):
+    impact_map, root = make_map(tmp_path)
+    (root / "styles.css").write_text("body { color: black; }", encoding="utf-8")
+    base_url = "http://127.0.0.1:8000/"
+    cart = ("renderCart", "function renderCart() { return 'cart'; }")
+    status = ("statusButtons", "function statusButtons(o) { return o.status; }")
+    urls = [base_url + "app.js", base_url + "styles.css"]
+    for test, function in [("test_cart", cart), ("test_staff", status)]:
+        impact_map.record(
+            test,
+            impact_map.covered_functions(coverage(APP_JS, function), base_url),
+            True,
+            impact_map.loaded_files(urls, base_url),
+        )
+    impact_map.record(
+        "test_js_only", {}, True, impact_map.loaded_files(urls[:1], base_url)
+    )
+    tests = ["test_cart", "test_staff", "test_js_only"]
+
+    # 関数の中だけの変更（空白の変更を含む）は、その関数を実行したテストだけ
+    (root / "app.js").write_text(
+        APP_JS.replace("'cart'", "'drawer'") + "\n\n", encoding="utf-8"
+    )
+    assert impact_map.affected(tests)["reasons"] == {
+        "test_cart": "covered function changed"
+    }
+
+    # トップレベルの文の変更は、app.js を読み込んだすべてのテスト
+    (root / "app.js").write_text(APP_JS + "init();\n", encoding="utf-8")
+    selection = impact_map.affected(tests)
+    assert selection["reasons"] == {
+        "test_cart": "loaded file changed",
+        "test_staff": "loaded file changed",
+        "test_js_only": "loaded file changed",
+    }
+    assert len(selection["changed_files"]) == 1
+
+    # CSS の変更は、styles.css を読み込んだテストだけ
+    (root / "app.js").write_text(APP_JS, encoding="utf-8")
+    (root / "styles.css").write_text("body { color: red; }", encoding="utf-8")
+    assert set(impact_map.affected(tests)["reasons"]) == {"test_cart", "test_staff"}
+    impact_map.close()
+
+
+def test_concurrent_shards_share_the_map(tmp_path):
+    """並列シャードが同じマップを共有できること（WAL・ロック待ち）"""
+    impact_map, root = make_map(tmp_path)
+    other = ImpactMap(str(tmp_path / "map.sqlite"), root=str(root))
+    mode = impact_map.connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+    # 片方の書き込み中に、もう片方が読める
+    impact_map.connection.execute("DELETE FROM tests WHERE test = 'test_old'")
+    assert impact_map.connection.in_transaction
+    assert other.affected(["test_new"])["reasons"] == {"test_new": "not recorded"}
+    impact_map.connection.commit()
+
+    other.record("test_new", {}, True)
+    assert impact_map.affected(["test_new"])["reasons"] == {}
+    other.close()
+    impact_map.close()
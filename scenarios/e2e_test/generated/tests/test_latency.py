@@ -0,0 +1,70 @@
+"""レイテンシプロファイルの設定のテスト"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from latency import APP_DELAYS, APP_PROFILE, PROFILES, LatencyProfile, resolve
+
+
+def test_app_profile_keeps_app_delays():
+    assert resolve(APP_PROFILE) is None
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        resolve("slow")
+
+
+def test_zero_profile_applies_to_every_method():
+    rule = resolve("zero").to_json()["methods"]["default"]
+    assert rule["base_ms"] == 0 and rule["failure_rate"] == 0
+
+
+def test_realistic_profile_jitters_around_app_delays():
+    methods = PROFILES["realistic"].to_json()["methods"]
+    assert methods["scanTable"]["base_ms"] == APP_DELAYS["scanTable"]
+    assert methods["scanTable"]["jitter_ms"] == pytest.approx(80)
+
+
+def test_script_embeds_profile():
+    profile = PROFILES["degraded"]
+    assert json.dumps(profile.to_json()) in profile.script()
+
+
+# app.js の MockAPI を模したメソッドで初期化スクリプトを実行し、登録されたタイマーを出力する
+HARNESS = """
+globalThis.window = globalThis;
+const listeners = [];
+globalThis.document = { addEventListener: (_type, listener) => listeners.push(listener) };
+const timers = new Map();
+let nextId = 1;
+globalThis.setTimeout = (callback, ms) => { timers.set(nextId, ms); return nextId++; };
+globalThis.clearTimeout = id => timers.delete(id);
+globalThis.MockAPI = {
+    placeOrder: () => {
+        setTimeout(() => {}, 3200);  // emit から表示されるトースト
+        return setTimeout(() => {}, 180);  // simulate() の応答
+    },
+};
+%s
+listeners.forEach(listener => listener());
+MockAPI.placeOrder();
+console.log(JSON.stringify([...timers.values()]));
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node が必要")
+def test_script_delays_only_the_response_timer():
+    profile = LatencyProfile("fixed", {"default": 42})
+    output = subprocess.run(
+        ["node", "-e", HARNESS % profile.script()],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    # トーストのタイマーはそのまま、応答のタイマーだけがプロファイルの遅延になる
+    assert json.loads(output) == [3200, 42]
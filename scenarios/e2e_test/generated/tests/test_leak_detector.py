@@ -0,0 +1,81 @@
+"""リーク判定（傾きとヒープスナップショットの集計）のテスト"""
+
+import pytest
+
+from leak_detector import describe, diff_summaries, slope, snapshot_summary
+
+
+def test_slope_of_linear_growth():
+    assert slope([100, 110, 120, 130]) == pytest.approx(10)
+    assert slope([5, 5, 5]) == 0
+    assert slope([7]) == 0.0
+
+
+def test_slope_ignores_single_spike():
+    assert slope([0, 0, 50, 0, 0]) == pytest.approx(0)
+
+
+def make_snapshot(nodes):
+    """(type, name, self_size) の列からヒープスナップショットの最小構成を作る"""
+    types = ["hidden", "object", "closure", "native"]
+    strings = []
+    flat = []
+    for node_type, name, size in nodes:
+        if name not in strings:
+            strings.append(name)
+        flat += [types.index(node_type), strings.index(name), size, 0]
+    return {
+        "snapshot": {
+            "meta": {
+                "node_fields": ["type", "name", "self_size", "edge_count"],
+                "node_types": [types, "string", "number", "number"],
+            }
+        },
+        "nodes": flat,
+        "strings": strings,
+    }
+
+
+def test_snapshot_summary_groups_by_constructor():
+    summary = snapshot_summary(
+        make_snapshot(
+            [
+                ("object", "Array", 16),
+                ("object", "Array", 32),
+                ("native", "HTMLLIElement", 100),
+                ("closure", "onClick", 40),
+                ("closure", "render", 40),
+            ]
+        )
+    )
+    assert summary == {
+        "Array": (2, 48),
+        "HTMLLIElement": (1, 100),
+        "(closure)": (2, 80),
+    }
+
+
+def test_diff_summaries_orders_by_growth():
+    before = {"Array": (2, 48), "(closure)": (2, 80), "Object": (1, 10)}
+    after = {"Array": (2, 48), "(closure)": (5, 200), "HTMLLIElement": (3, 300)}
+    rows = diff_summaries(before, after)
+    assert [row["type"] for row in rows] == ["HTMLLIElement", "(closure)", "Object"]
+    assert rows[1] == {
+        "type": "(closure)",
+        "count_delta": 3,
+        "size_delta": 120,
+        "count": 5,
+    }
+
+
+def test_describe_marks_exceeded_metrics():
+    result = {
+        "flow": "toggle",
+        "iterations": 20,
+        "slopes": {"JSHeapUsedSize": 2048, "Nodes": 0.0, "JSEventListeners": 4.0},
+        "exceeded": ["JSEventListeners"],
+    }
+    assert describe(result) == (
+        "toggle: 20 iterations, per iteration heap +2.0KB, Nodes +0.00, "
+        "JSEventListeners +4.00 [LEAK JSEventListeners]"
+    )
@@ -0,0 +1,65 @@
+"""
+長時間稼働を想定したリーク検出
+
+同じ Page Object の操作を --leak-iterations 回繰り返し、GC 後の JS ヒープ・
+DOM ノード・イベントリスナーの増加の傾きが許容値を超えたら失敗させる。
+超えた操作は、繰り返しの前後のヒープスナップショットの差分を保存する。
+"""
+
+import pytest
+
+from leak_detector import LEAK_REPORT, LeakDetector, describe
+from results import safe_name
+
+
+@pytest.fixture
+def leak_check(page, request):
+    """操作を繰り返してリークを調べ、結果を保存して許容値超過で失敗させる関数"""
+    config = request.config
+    detector = LeakDetector(page)
+
+    def check(name: str, iteration):
+        result = detector.run(name, iteration, config.getoption("leak_iterations"))
+        LEAK_REPORT.add(config, result)
+        prefix = f"leaks/{safe_name(request.node.nodeid)}-{name}"
+        LEAK_REPORT.write(config, f"{prefix}.json", result)
+        if result["exceeded"]:
+            path = LEAK_REPORT.write(
+                config, f"{prefix}.heapdiff.json", detector.snapshot_diff(iteration)
+            )
+            pytest.fail(f"{describe(result)}（ヒープの差分: {path}）")
+        return result
+
+    yield check
+    detector.close()
+
+
+@pytest.mark.leak
+@pytest.mark.seed("T1", orders=["placed", "in_kitchen", "ready"] * 5)
+def test_staff_board_mode_toggle(app_seed, employee_page, leak_check):
+    """従業員画面の表示切り替え（renderOrders の再描画とリスナー登録）"""
+    employee_page.navigate()
+
+    def iteration():
+        employee_page.switch_to_employee_mode()
+        employee_page.switch_to_customer_mode()
+
+    leak_check("staff-mode-toggle", iteration)
+
+
+@pytest.mark.leak
+@pytest.mark.table_session("T1")
+def test_add_to_cart_with_toast(menu_page, menu_detail_dialog, cart_dialog, leak_check):
+    """カートへの追加と削除（トースト通知と renderCart のリスナー登録）"""
+    menu_page.navigate()
+
+    def iteration():
+        menu_page.click_menu_item("Margherita Pizza")
+        menu_detail_dialog.add_to_cart()
+        menu_page.open_cart()
+        cart_dialog.remove_item()
+        cart_dialog.close()
+        # トーストは一定時間後に消えるため、消えた後の状態で比べる
+        menu_page.wait_for_toasts_cleared()
+
+    leak_check("add-to-cart-toast", iteration)
@@ -0,0 +1,39 @@
+"""
+ディナーラッシュ負荷テスト
+
+複数テーブルが同時に注文し、1つの従業員画面で受ける状況を再現する。
+--load-tables で指定した段階ごとに同時テーブル数を増やし、スループット
+（注文/秒）と placeOrder から #ordersList への描画までのレイテンシを記録する。
+"""
+
+import pytest
+
+from load_mode import LOAD_REPORT, DinnerRush, parse_levels
+
+
+@pytest.mark.load
+async def test_dinner_rush(async_context, base_url: str, request):
+    """同時テーブル数を段階的に増やしたときの注文処理性能
+
+    各テーブルは非同期 API のループのスレッドで並行して注文する。
+    """
+    config = request.config
+    levels = parse_levels(config.getoption("load_tables"))
+    rush = DinnerRush(
+        async_context, base_url, orders_per_table=config.getoption("load_orders")
+    )
+
+    summaries = []
+    for table_count in levels:
+        summary = await rush.run(table_count)
+        summaries.append(summary)
+
+        # すべての注文が従業員画面に届いていることを確認
+        assert summary["orders"] == table_count * rush.orders_per_table
+
+    LOAD_REPORT.add(config, *summaries)
+    LOAD_REPORT.write(
+        config,
+        "load-dinner-rush.json",
+        {"test": request.node.nodeid, "levels": summaries},
+    )
@@ -0,0 +1,93 @@
+"""負荷テストモードの集計処理のテスト"""
+
+import asyncio
+
+import pytest
+
+from async_pages import run_in_thread
+from load_mode import DinnerRush, parse_levels
+
+
+def test_parse_levels():
+    assert parse_levels("1, 5,10,25") == [1, 5, 10, 25]
+
+
+@pytest.mark.parametrize("value", ["", "0,5", "a,b"])
+def test_parse_levels_rejects_invalid(value):
+    with pytest.raises(pytest.UsageError):
+        parse_levels(value)
+
+
+def test_summarize_throughput_and_latency():
+    results = [
+        {
+            "orderId": f"o_{i}",
+            "placedAt": 1000.0 + i * 100,
+            "receivedAt": 1001.0 + i * 100,
+            "renderedAt": 1003.0 + i * 100,
+            "paintedAt": 1010.0 + i * 100,
+        }
+        for i in range(10)
+    ]
+    results[-1]["orderId"] = "o_0"
+
+    summary = DinnerRush(None, "").summarize(2, results)
+
+    assert summary["orders"] == 10
+    assert summary["duration_s"] == pytest.approx(0.91)
+    assert summary["throughput_ops"] == pytest.approx(10 / 0.91)
+    assert summary["latency_ms"]["p50"] == pytest.approx(10.0)
+    assert summary["render_ms"]["p95"] == pytest.approx(2.0)
+    assert summary["duplicate_order_ids"] == 1
+
+
+class FakeTable:
+    """注文操作を記録する非同期のテーブル（メニュー・ダイアログ・カートを兼ねる）"""
+
+    def __init__(self, table_id, log):
+        self.table_id = table_id
+        self.log = log
+        self.page = self
+
+    async def click_menu_item(self, name):
+        self.log.append((self.table_id, name))
+        await asyncio.sleep(0)
+
+    async def add_to_cart(self):
+        await asyncio.sleep(0)
+
+    async def open_cart(self):
+        await asyncio.sleep(0)
+
+    async def place_order(self):
+        await asyncio.sleep(0)
+
+    async def close(self):
+        self.log.append((self.table_id, "closed"))
+
+
+class FakeRush(DinnerRush):
+    def __init__(self, **kwargs):
+        super().__init__(None, "", **kwargs)
+        self.log = []
+
+    async def open_table(self, table_id):
+        table = FakeTable(table_id, self.log)
+        return table, table, table
+
+
+def test_tables_place_orders_concurrently():
+    rush = FakeRush(orders_per_table=2, menu_items=("A", "B"))
+
+    async def main():
+        tables = await asyncio.gather(*(rush.open_table(f"T{i}") for i in range(1, 4)))
+        await asyncio.gather(*(rush.place_orders(*table) for table in tables))
+
+    run_in_thread(main())
+
+    orders = [entry for entry in rush.log if entry[1] != "closed"]
+    # 1テーブルの注文が終わるのを待たずに、各テーブルの注文が交互に進む
+    assert orders[:3] == [("T1", "A"), ("T2", "A"), ("T3", "A")]
+    assert sorted(orders) == sorted(
+        (f"T{i}", item) for i in range(1, 4) for item in ("A", "B")
+    )
@@ -0,0 +1,100 @@
+"""ロケーターのレジストリとプロファイラのテスト"""
+
+import os
+import re
+from html.parser import HTMLParser
+
+import pytest
+
+from app_server import APP_DIR
+from locators import REGISTRY, LocatorProfile
+from pages import CartDialog, EmployeePage, MenuPage, run_sync
+from tests.test_pages import FakePage
+
+
+@pytest.fixture
+def prefer_fast():
+    REGISTRY.prefer_fast = True
+    yield
+    REGISTRY.prefer_fast = False
+
+
+def test_page_object_locators_are_registered_by_class_attribute():
+    assert REGISTRY.selectors["CartDialog.TOTAL_AMOUNT"] is CartDialog.TOTAL_AMOUNT
+    assert CartDialog.TOTAL_AMOUNT.fast == "#cartTotal"
+
+
+def test_template_keeps_registered_name():
+    selector = EmployeePage(FakePage(), "").status_button_selector("ready")
+    assert selector == 'button:has-text("ready")'
+    assert selector.name == "EmployeePage.STATUS_BUTTON"
+    assert selector.fast == '#ordersList button[data-status="ready"]'
+
+
+def test_fast_locators_replace_declared_selectors(prefer_fast):
+    page = FakePage()
+    cart = CartDialog(page)
+    run_sync(page, CartDialog.get_total_amount.flow(cart))
+    run_sync(page, CartDialog.place_order.flow(cart))
+    assert page.calls == [
+        ("text_content", ("#cartTotal",)),
+        ("click", ("#placeOrderBtn",)),
+        ("wait_for_selector", ("text=注文送信",)),
+    ]
+
+
+def test_profile_records_cost_matches_and_equivalence(tmp_path):
+    page = FakePage(results={"eval_on_selector_all": 2, "query_selector_all": []})
+    profile = LocatorProfile(str(tmp_path / "locator-profile.json"))
+    with profile.activate():
+        CartDialog(page).close()
+        EmployeePage(page, "").get_orders_count()
+
+    close = profile.stats["CartDialog.CLOSE_BUTTON"]
+    assert (close.calls, close.max_matches) == (1, 2)
+    # FakePage は比較結果も 2（真）を返すため一致と判定される
+    assert close.verdict == "equivalent"
+    assert profile.stats["EmployeePage.ORDER_ITEMS"].verdict == "none"
+    assert [call for call, _ in page.calls].count("eval_on_selector_all") == 3
+    assert page.calls[-1] == ("query_selector_all", ('list[aria-label="Orders"] > li',))
+
+
+def test_profile_reports_mismatch():
+    profile = LocatorProfile("unused.json")
+    profile.record(CartDialog.TOTAL_AMOUNT, 5.0, 2, fast_ms=0.5, same=False)
+    profile.record(CartDialog.CLOSE_BUTTON, 1.0, 1, fast_ms=0.5, same=True)
+    assert [s.name for s in profile.ranking()] == [
+        "CartDialog.TOTAL_AMOUNT",
+        "CartDialog.CLOSE_BUTTON",
+    ]
+    assert profile.stats["CartDialog.TOTAL_AMOUNT"].verdict == "mismatch"
+    assert "mismatch" in profile.table(10)[1]
+
+
+class StaticElements(HTMLParser):
+    """index.html の静的な要素（タグ名と属性）の一覧"""
+
+    def __init__(self):
+        super().__init__()
+        self.elements = []
+
+    def handle_starttag(self, tag, attrs):
+        self.elements.append((tag, dict(attrs)))
+
+
+def static_matches(selector: str) -> list:
+    """``#id`` または ``tag[attr="value"]`` 形式のセレクタに一致する index.html の要素"""
+    parser = StaticElements()
+    with open(os.path.join(APP_DIR, "index.html"), encoding="utf-8") as f:
+        parser.feed(f.read())
+    if selector.startswith("#"):
+        return [e for e in parser.elements if e[1].get("id") == selector[1:]]
+    tag, attr, value = re.fullmatch(r'(\w+)\[([\w-]+)="([^"]*)"\]', selector).groups()
+    return [e for e in parser.elements if e[0] == tag and e[1].get(attr) == value]
+
+
+def test_category_filter_matches_the_select_in_index_html():
+    selector = MenuPage.CATEGORY_FILTER
+    matches = static_matches(selector)
+    assert len(matches) == 1, f"{selector} に一致する要素がありません"
+    assert static_matches(selector.fast) == matches
@@ -0,0 +1,108 @@
+"""マーカーごとの結果セットのテスト"""
+
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+from marker_reports import MarkerReports, parse_markers
+
+
+class FakeItem:
+    def __init__(self, nodeid, *markers):
+        self.nodeid = nodeid
+        self.markers = markers
+
+    def get_closest_marker(self, name):
+        return name if name in self.markers else None
+
+
+def report(nodeid, when, outcome, duration=0.5, text=""):
+    return SimpleNamespace(
+        nodeid=nodeid,
+        when=when,
+        duration=duration,
+        failed=outcome == "failed",
+        skipped=outcome == "skipped",
+        longreprtext=text,
+        longrepr=("test.py", 1, "Skipped: reason") if outcome == "skipped" else None,
+        user_properties=[("latency_profile", "zero")],
+    )
+
+
+def test_parse_markers():
+    assert parse_markers("smoke, e2e,,integration") == ["smoke", "e2e", "integration"]
+
+
+def test_tests_run_once_and_appear_in_each_marker_set(tmp_path):
+    plugin = MarkerReports(
+        ["smoke", "e2e", "integration"], str(tmp_path), modules=("t.py",)
+    )
+    items = [
+        FakeItem("t.py::test_smoke", "smoke"),
+        FakeItem("t.py::TestFlow::test_flow", "integration", "e2e"),
+        FakeItem("t.py::test_unmarked"),
+    ]
+    deselected = []
+    config = SimpleNamespace(
+        hook=SimpleNamespace(pytest_deselected=lambda items: deselected.extend(items))
+    )
+    plugin.pytest_collection_modifyitems(config, items)
+
+    assert [i.nodeid for i in items] == [
+        "t.py::test_smoke",
+        "t.py::TestFlow::test_flow",
+    ]
+    assert [i.nodeid for i in deselected] == ["t.py::test_unmarked"]
+
+    for when in ("setup", "call", "teardown"):
+        plugin.pytest_runtest_logreport(report("t.py::test_smoke", when, "passed"))
+    plugin.pytest_runtest_logreport(
+        report("t.py::TestFlow::test_flow", "setup", "passed")
+    )
+    plugin.pytest_runtest_logreport(
+        report("t.py::TestFlow::test_flow", "call", "failed", text="E  assert 1 == 2")
+    )
+    plugin.pytest_sessionfinish(None)
+
+    assert plugin.counts("smoke") == {
+        "tests": 1,
+        "failures": 0,
+        "errors": 0,
+        "skipped": 0,
+    }
+    assert plugin.counts("e2e") == plugin.counts("integration")
+    suite = ET.parse(plugin.junit_path("e2e")).getroot().find("testsuite")
+    assert suite.get("tests") == "1" and suite.get("failures") == "1"
+    case = suite.find("testcase")
+    assert case.get("classname") == "t.TestFlow" and case.get("name") == "test_flow"
+    assert case.find("failure").get("message") == "E  assert 1 == 2"
+    assert case.find("properties/property").attrib == {
+        "name": "latency_profile",
+        "value": "zero",
+    }
+
+
+def test_unmarked_tests_outside_the_e2e_module_still_run(tmp_path):
+    plugin = MarkerReports(["e2e"], str(tmp_path))
+    items = [
+        FakeItem("tests/test_restaurant_ordering_e2e.py::TestFlow::test_flow", "e2e"),
+        FakeItem("tests/test_restaurant_ordering_e2e.py::test_unmarked"),
+        FakeItem("tests/test_sharding.py::test_unit"),
+    ]
+    deselected = []
+    config = SimpleNamespace(
+        hook=SimpleNamespace(pytest_deselected=lambda items: deselected.extend(items))
+    )
+    plugin.pytest_collection_modifyitems(config, items)
+
+    assert [i.nodeid for i in items] == [
+        "tests/test_restaurant_ordering_e2e.py::TestFlow::test_flow",
+        "tests/test_sharding.py::test_unit",
+    ]
+    assert [i.nodeid for i in deselected] == [
+        "tests/test_restaurant_ordering_e2e.py::test_unmarked"
+    ]
+    # ユニットテストはマーカーごとの結果セットに含めない
+    plugin.pytest_runtest_logreport(
+        report("tests/test_sharding.py::test_unit", "call", "passed")
+    )
+    assert plugin.counts("e2e")["tests"] == 0
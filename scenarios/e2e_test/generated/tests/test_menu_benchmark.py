@@ -0,0 +1,78 @@
+"""大規模メニューの生成と mock-data.js の差し替えのテスト"""
+
+import pytest
+
+from menu_benchmark import (
+    CATEGORIES,
+    describe,
+    expected_count,
+    generate_menu,
+    mock_data_script,
+    parse_sizes,
+)
+
+SOURCE = """// mock
+const MOCK_MENU = [
+  { id: 'm-001', name: 'Margherita Pizza' }
+];
+
+const CATEGORIES = [{ value: 'all', label: 'All' }, { value: 'food', label: 'Food' }];
+
+const TRANSLATIONS = { ja: {} };
+"""
+
+
+def test_generate_menu_is_reproducible_and_complete():
+    menu = generate_menu(120)
+    assert menu == generate_menu(120)
+    assert len({item["id"] for item in menu}) == 120
+    assert {item["category"] for item in menu} == set(CATEGORIES)
+    assert any(item["options"] for item in menu)
+    assert any(item["allergies"] for item in menu)
+
+
+def test_expected_count_mirrors_list_menu_filter():
+    menu = generate_menu(240)
+    assert expected_count(menu) == 240
+    assert expected_count(menu, "food") == 240 // len(CATEGORIES)
+    assert expected_count(menu, q="RAMEN") == sum(
+        "ramen" in (item["name"] + item["description"]).lower() for item in menu
+    )
+    assert expected_count(menu, q="no such dish") == 0
+
+
+def test_mock_data_script_replaces_menu_and_categories_only():
+    script = mock_data_script(generate_menu(2), SOURCE)
+    assert "Margherita" not in script
+    assert "'food', label: 'Food'" not in script
+    assert '"value": "seasonal"' in script
+    assert script.startswith("// mock\nconst MOCK_MENU = [{")
+    assert script.endswith("const TRANSLATIONS = { ja: {} };\n")
+
+
+def test_mock_data_script_matches_app_file():
+    """アプリの mock-data.js の形式が変わっていないこと"""
+    assert '"id": "g-00001"' in mock_data_script(generate_menu(1))
+
+
+def test_mock_data_script_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        mock_data_script([], "const MENU = [];")
+
+
+@pytest.mark.parametrize("value", ["", "0", "100,x"])
+def test_parse_sizes_rejects_invalid(value):
+    with pytest.raises(pytest.UsageError):
+        parse_sizes(value)
+
+
+def test_describe():
+    summary = {"p50": 1.0, "p95": 2.0, "p99": 2.0, "max": 2.0}
+    timings = {"response_ms": summary, "filter_ms": summary, "render_ms": summary}
+    point = {
+        "items": 1000,
+        "category_switch": timings,
+        "show_all": timings,
+        "search": {"ramen": {"keystroke_to_render_ms": summary, **timings}},
+    }
+    assert describe(point).startswith("  1000 items: category switch p95 2.0ms")
@@ -0,0 +1,44 @@
+"""
+大規模メニューでのカテゴリ切り替え・検索のベンチマーク
+
+--benchmark-menu で指定した件数のメニューを生成して mock-data.js と差し替え、
+カテゴリの切り替えと検索ボックスへの入力から描画までの時間を件数ごとに記録する。
+MockAPI の遅延は zero プロファイルで除き、絞り込みと描画のコストだけを測る。
+"""
+
+import pytest
+
+from menu_benchmark import (
+    MENU_REPORT,
+    REALISTIC_MENU_SIZE,
+    RESPONSE_BUDGET_MS,
+    MenuBenchmark,
+    parse_sizes,
+)
+
+
+@pytest.mark.menu_benchmark
+@pytest.mark.latency_profile("zero")
+@pytest.mark.table_session("T1")
+def test_menu_filter_and_search_scaling(menu_page, request):
+    """メニュー件数に対する、カテゴリ切り替え・検索の応答時間の伸び方"""
+    config = request.config
+    benchmark = MenuBenchmark(menu_page)
+    curve = benchmark.run(parse_sizes(config.getoption("benchmark_menu")))
+
+    MENU_REPORT.add(config, *curve)
+    MENU_REPORT.write(
+        config, "menu-scaling.json", {"test": request.node.nodeid, "points": curve}
+    )
+
+    # 描画されたカード数が絞り込みの結果と一致すること
+    assert benchmark.mismatches == []
+
+    for point in curve:
+        # 想定する店舗のメニュー件数までは、カテゴリの切り替えに即座に応答すること
+        if point["items"] <= REALISTIC_MENU_SIZE:
+            response_p95 = point["category_switch"]["response_ms"]["p95"]
+            assert response_p95 <= RESPONSE_BUDGET_MS, (
+                f"{point['items']} 件のメニューでカテゴリの切り替えに "
+                f"{response_p95:.0f}ms かかりました"
+            )
@@ -0,0 +1,45 @@
+"""
+従業員画面の注文リスト描画のスケーリングベンチマーク
+
+--benchmark-orders で指定した件数の注文がある従業員画面で order.created /
+order.updated を発行し、renderOrders の描画時間・DOM ノード数・リスナー数を
+件数ごとに記録する。
+"""
+
+import pytest
+
+from render_benchmark import (
+    BENCHMARK_REPORT,
+    EXPECTED_ORDER_VOLUME,
+    REALTIME_BUDGET_MS,
+    OrderBoardBenchmark,
+    parse_volumes,
+)
+
+
+@pytest.mark.benchmark
+@pytest.mark.seed("T1", view="staff")
+def test_render_orders_scaling(app_seed, employee_page, perf_metrics, request):
+    """注文件数に対する、注文イベント1回あたりの描画コストの伸び方"""
+    config = request.config
+    benchmark = OrderBoardBenchmark(employee_page, perf_metrics)
+    curve = benchmark.run(parse_volumes(config.getoption("benchmark_orders")))
+
+    BENCHMARK_REPORT.add(config, *curve)
+    BENCHMARK_REPORT.write(
+        config,
+        "render-orders-scaling.json",
+        {"test": request.node.nodeid, "points": curve},
+    )
+
+    for point in curve:
+        # すべての注文が描画されていることを確認
+        assert point["dom_nodes"]["rendered"] == point["dom_nodes"]["orders"]
+
+        # 想定する注文数までは、新規注文が通知の目安時間内に画面へ反映されること
+        if point["orders"] <= EXPECTED_ORDER_VOLUME:
+            paint_p95 = point["events"]["order.created"]["paint_ms"]["p95"]
+            assert paint_p95 <= REALTIME_BUDGET_MS, (
+                f"{point['orders']} 件の注文で新規注文の反映に "
+                f"{paint_p95:.0f}ms かかりました"
+            )
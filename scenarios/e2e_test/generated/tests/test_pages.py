@@ -0,0 +1,89 @@
+"""Page Object のフローと同期・非同期ドライバのテスト"""
+
+import asyncio
+
+import pytest
+
+from async_pages import AsyncMenuPage, run_async, run_in_thread
+from pages import MenuPage, PageCall, run_sync
+
+
+class FakePage:
+    """呼び出しを記録する同期 API のページ"""
+
+    def __init__(self, results=None, errors=None):
+        self.calls = []
+        self.results = results or {}
+        self.errors = errors or {}
+
+    def __getattr__(self, method):
+        def call(*args, **kwargs):
+            self.calls.append((method, args))
+            if method in self.errors:
+                raise self.errors[method]
+            return self.results.get(method)
+
+        return call
+
+
+class FakeAsyncPage(FakePage):
+    """呼び出しを記録する非同期 API のページ"""
+
+    def __getattr__(self, method):
+        call = super().__getattr__(method)
+
+        async def async_call(*args, **kwargs):
+            await asyncio.sleep(0)
+            return call(*args, **kwargs)
+
+        return async_call
+
+
+def recovering_flow():
+    """失敗した呼び出しをフロー内で捕捉するフロー"""
+    try:
+        yield PageCall("click", "#missing")
+    except RuntimeError:
+        yield PageCall("click", "#fallback")
+    return (yield PageCall("text_content", "#result"))
+
+
+def test_run_sync_returns_flow_result_and_throws_into_flow():
+    page = FakePage(
+        results={"text_content": "ok"}, errors={"click": RuntimeError("boom")}
+    )
+    with pytest.raises(RuntimeError):
+        run_sync(page, recovering_flow())
+
+    page = FakePage(results={"text_content": "ok"})
+    assert run_sync(page, recovering_flow()) == "ok"
+    assert page.calls == [("click", ("#missing",)), ("text_content", ("#result",))]
+
+
+def test_sync_and_async_page_objects_issue_the_same_calls():
+    sync_page = FakePage(results={"text_content": "3"})
+    async_page = FakeAsyncPage(results={"text_content": "3"})
+
+    assert MenuPage(sync_page, "http://app").get_cart_count() == 3
+    count = run_in_thread(AsyncMenuPage(async_page, "http://app").get_cart_count())
+
+    assert count == 3
+    assert sync_page.calls == async_page.calls == [("text_content", (".cart-count",))]
+
+
+def test_run_async_overlaps_independent_flows():
+    page = FakeAsyncPage(results={"evaluate": True})
+
+    async def main():
+        menu_page = AsyncMenuPage(page, "http://app")
+        return await asyncio.gather(
+            menu_page.open_cart(), run_async(page, menu_page.call("evaluate", "1"))
+        )
+
+    assert run_in_thread(main()) == [None, True]
+    # 2つのフローの呼び出しが交互に進む
+    assert [method for method, _ in page.calls] == [
+        "click",
+        "evaluate",
+        "wait_for_selector",
+    ]
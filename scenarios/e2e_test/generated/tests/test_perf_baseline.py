@@ -0,0 +1,75 @@
+"""
+パフォーマンスのベースライン（perf_baseline.py）のユニットテスト
+"""
+
+import pytest
+
+from perf_baseline import (
+    BaselineStore,
+    PerfBaseline,
+    mann_whitney_greater,
+    median,
+    percentile,
+)
+
+
+class TestStatistics:
+    """統計関数のテスト"""
+
+    def test_percentile_interpolates(self):
+        """線形補間でパーセンタイルを計算すること"""
+        values = [10, 20, 30, 40, 50]
+        assert median(values) == 30
+        assert percentile(values, 95) == pytest.approx(48)
+
+    def test_mann_whitney_detects_shift(self):
+        """明確に遅くなったサンプルで小さい p 値になること"""
+        baseline = [100, 102, 98, 101, 99, 103, 97, 100]
+        slower = [130, 128, 133, 131, 129]
+        assert mann_whitney_greater(baseline, slower) < 0.01
+
+    def test_mann_whitney_ignores_noise(self):
+        """同じ分布のサンプルでは有意とならないこと"""
+        baseline = [100, 102, 98, 101, 99, 103, 97, 100]
+        same = [101, 99, 100, 102, 98]
+        assert mann_whitney_greater(baseline, same) > 0.1
+
+    def test_mann_whitney_all_ties(self):
+        """全サンプルが同値の場合は有意としないこと"""
+        assert mann_whitney_greater([5, 5, 5], [5, 5]) == 1.0
+
+
+def test_regression_gate(tmp_path):
+    """同じ環境の過去の実行に対する有意な劣化のみ回帰と判定すること"""
+    store = BaselineStore(str(tmp_path / "baseline.sqlite"))
+    previous = PerfBaseline("t", store, "env")
+    for value in [100, 102, 98, 101, 99, 103]:
+        previous.add("load", value)
+    assert not previous.finish(alpha=0.01, min_change=0.05)[0].sufficient
+
+    # 別の実行として比較する
+    store.run_id = "next-run"
+    current = PerfBaseline("t", store, "env")
+    other_env = PerfBaseline("t", store, "other-env")
+    for value in [140, 150, 145, 148]:
+        current.add("load", value)
+        other_env.add("load", value)
+
+    [comparison] = current.finish(alpha=0.01, min_change=0.05)
+    assert comparison.regressed
+    assert "REGRESSION" in comparison.describe()
+    assert not other_env.finish(alpha=0.01, min_change=0.05)[0].sufficient
+    store.close()
+
+
+def test_failed_test_samples_are_not_recorded(tmp_path):
+    """record=False のサンプルは比較だけ行い、ベースラインに保存しないこと"""
+    store = BaselineStore(str(tmp_path / "baseline.sqlite"))
+    failed = PerfBaseline("t", store, "env")
+    for value in [500, 510, 505]:
+        failed.add("load", value)
+    failed.finish(alpha=0.01, min_change=0.05, record=False)
+
+    store.run_id = "next-run"
+    assert store.baseline("t", "load", "env", store.run_id) == []
+    store.close()
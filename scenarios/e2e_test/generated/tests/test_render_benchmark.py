@@ -0,0 +1,30 @@
+"""注文リスト描画ベンチマークの設定と表示のテスト"""
+
+import pytest
+
+from render_benchmark import describe, parse_volumes
+
+
+def test_parse_volumes_sorts_levels():
+    assert parse_volumes("1000, 10,100") == [10, 100, 1000]
+
+
+@pytest.mark.parametrize("value", ["", "0", "10,x"])
+def test_parse_volumes_rejects_invalid(value):
+    with pytest.raises(pytest.UsageError):
+        parse_volumes(value)
+
+
+def test_describe_without_cdp():
+    summary = {"p50": 1.0, "p95": 2.0, "p99": 2.0, "max": 2.0}
+    point = {
+        "orders": 100,
+        "events": {
+            "order.created": {"render_ms": summary, "paint_ms": summary},
+            "order.updated": {"render_ms": summary, "paint_ms": summary},
+        },
+        "dom_nodes": {"ordersList": 1200},
+        "orders_list_listeners": None,
+    }
+    line = describe(point)
+    assert line.startswith("   100 orders") and line.endswith("listeners -")
@@ -11,9 +11,21 @@
 - REQ-008: 従業員は新規注文の通知を受け取り、注文詳細を閲覧・ステータス変更ができること
 """
 
+import asyncio
+
 import pytest
+from playwright.async_api import expect as async_expect
 from playwright.sync_api import Page, expect
 
+from async_pages import (
+    AsyncCartDialog,
+    AsyncMenuDetailDialog,
+    AsyncMenuPage,
+    AsyncTableSessionPage,
+)
+from perf_baseline import median
+from perf_metrics import PerformanceRecorder
+
 
 class TestTableSessionSetup:
     """AC-001: テーブルセッション開始のテスト"""
@@ -42,19 +54,19 @@ class TestTableSessionSetup:
         expect(menu_page.page.locator("text=セッション開始: T1")).to_be_visible()
 
 
+@pytest.mark.table_session("T1")
 class TestMenuBrowsing:
     """AC-002: メニュー閲覧のテスト"""
 
     @pytest.mark.e2e
-    def test_category_filtering(self, table_session_page, menu_page):
+    def test_category_filtering(self, menu_page):
         """
         Given: カテゴリ選択
         When: カテゴリを選ぶと
         Then: 該当するメニュー一覧が表示される
         """
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # 初期状態でAllカテゴリが選択されていることを確認
         expect(menu_page.page.locator('select[name="Category"]')).to_have_value("All")
@@ -82,11 +94,10 @@ class TestMenuBrowsing:
         expect(menu_page.page.locator("text=Caesar Salad")).to_be_visible()
 
     @pytest.mark.e2e
-    def test_search_functionality(self, table_session_page, menu_page):
+    def test_search_functionality(self, menu_page):
         """検索機能のテスト"""
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # 検索機能をテスト（実装があれば）
         search_input = menu_page.page.locator('input[placeholder="Search"]')
@@ -95,21 +106,19 @@ class TestMenuBrowsing:
             # 検索結果の確認（実装に依存）
 
 
+@pytest.mark.table_session("T1")
 class TestMenuDetails:
     """AC-003: メニュー詳細のテスト"""
 
     @pytest.mark.e2e
-    def test_menu_item_details_display(
-        self, table_session_page, menu_page, menu_detail_dialog
-    ):
+    def test_menu_item_details_display(self, menu_page, menu_detail_dialog):
         """
         Given: メニュー詳細画面
         When: アレルギー情報が存在すると
         Then: 明確に表示され警告アイコンが表示される
         """
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # Margherita Pizzaの詳細を表示
         menu_page.click_menu_item("Margherita Pizza")
@@ -143,21 +152,19 @@ class TestMenuDetails:
         menu_detail_dialog.close()
 
 
+@pytest.mark.table_session("T1")
 class TestCartOperations:
     """AC-004: カート操作のテスト"""
 
     @pytest.mark.e2e
-    def test_add_item_to_cart(
-        self, table_session_page, menu_page, menu_detail_dialog, cart_dialog
-    ):
+    def test_add_item_to_cart(self, menu_page, menu_detail_dialog, cart_dialog):
         """
         Given: カート操作
         When: 商品を追加すると
         Then: カートの合計と明細が正しく更新される
         """
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # 初期状態でカートが空であることを確認
         cart_button = menu_page.page.locator('button:has(text("🛒"))')
@@ -177,12 +184,11 @@ class TestCartOperations:
 
     @pytest.mark.e2e
     def test_cart_content_and_operations(
-        self, table_session_page, menu_page, menu_detail_dialog, cart_dialog
+        self, menu_page, menu_detail_dialog, cart_dialog
     ):
         """カート内容と操作のテスト"""
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # メニューアイテムをカートに追加
         menu_page.click_menu_item("Margherita Pizza")
@@ -224,13 +230,10 @@ class TestCartOperations:
         cart_dialog.close()
 
     @pytest.mark.e2e
-    def test_quantity_modification(
-        self, table_session_page, menu_page, menu_detail_dialog, cart_dialog
-    ):
+    def test_quantity_modification(self, menu_page, menu_detail_dialog, cart_dialog):
         """数量変更のテスト"""
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # メニューアイテムをカートに追加
         menu_page.click_menu_item("Margherita Pizza")
@@ -255,21 +258,19 @@ class TestCartOperations:
         cart_dialog.close()
 
 
+@pytest.mark.table_session("T1")
 class TestOrderPlacement:
     """AC-005: 注文確定のテスト"""
 
     @pytest.mark.e2e
-    def test_place_order(
-        self, table_session_page, menu_page, menu_detail_dialog, cart_dialog
-    ):
+    def test_place_order(self, menu_page, menu_detail_dialog, cart_dialog):
         """
         Given: 注文確定
         When: 顧客が確定操作を行うと
         Then: 注文はAPIに登録され、従業員側にリアルタイム通知が送信される
         """
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # メニューアイテムをカートに追加
         menu_page.click_menu_item("Margherita Pizza")
@@ -289,21 +290,19 @@ class TestOrderPlacement:
         expect(cart_button).to_contain_text("0")
 
 
+@pytest.mark.table_session("T1")
 class TestCheckoutRequest:
     """AC-007: 会計リクエストのテスト"""
 
     @pytest.mark.e2e
-    def test_checkout_request(
-        self, table_session_page, menu_page, menu_detail_dialog, cart_dialog
-    ):
+    def test_checkout_request(self, menu_page, menu_detail_dialog, cart_dialog):
         """
         Given: 会計リクエスト
         When: 顧客が会計をリクエストすると
         Then: 従業員は注文管理側でその旨を確認できる
         """
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # メニューアイテムをカートに追加
         menu_page.click_menu_item("Margherita Pizza")
@@ -323,33 +322,23 @@ class TestCheckoutRequest:
         cart_dialog.close()
 
 
+@pytest.mark.seed("T1", orders=["placed"])
+@pytest.mark.usefixtures("app_seed")
 class TestEmployeeOrderManagement:
-    """AC-006: 従業員注文管理のテスト"""
+    """AC-006: 従業員注文管理のテスト
+
+    注文の作成は UI 操作ではなくシード（app_seed）で用意する。
+    """
 
     @pytest.mark.e2e
-    def test_employee_order_management(
-        self,
-        table_session_page,
-        menu_page,
-        menu_detail_dialog,
-        cart_dialog,
-        employee_page,
-    ):
+    def test_employee_order_management(self, employee_page):
         """
         Given: 従業員が注文管理画面を開く
         When: 新規注文が入ると
         Then: リアルタイムで画面に通知が表示され、注文詳細へドリルダウンできる
         """
-        # セッション開始と注文作成
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
-
-        # メニューアイテムをカートに追加して注文確定
-        menu_page.click_menu_item("Margherita Pizza")
-        menu_detail_dialog.add_to_cart()
-        menu_page.open_cart()
-        cart_dialog.place_order()
-        cart_dialog.close()
+        # テーブル T1 の注文がある状態でアプリを開く
+        employee_page.navigate()
 
         # 従業員モードに切り替え
         employee_page.switch_to_employee_mode()
@@ -372,25 +361,9 @@ class TestEmployeeOrderManagement:
         expect(order_list.locator('button:has-text("cancelled")')).to_be_visible()
 
     @pytest.mark.e2e
-    def test_order_status_change(
-        self,
-        table_session_page,
-        menu_page,
-        menu_detail_dialog,
-        cart_dialog,
-        employee_page,
-    ):
+    def test_order_status_change(self, employee_page):
         """注文ステータス変更のテスト"""
-        # セッション開始と注文作成
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
-
-        # 注文を作成
-        menu_page.click_menu_item("Margherita Pizza")
-        menu_detail_dialog.add_to_cart()
-        menu_page.open_cart()
-        cart_dialog.place_order()
-        cart_dialog.close()
+        employee_page.navigate()
 
         # 従業員モードに切り替え
         employee_page.switch_to_employee_mode()
@@ -401,6 +374,22 @@ class TestEmployeeOrderManagement:
         # ステータスが更新されることを確認（実装に依存）
         # expect(...).to_contain_text("in_kitchen")
 
+    @pytest.mark.e2e
+    @pytest.mark.seed("T1", orders=["placed", "placed", "in_kitchen"], view="staff")
+    def test_orders_by_status(self, app_seed, employee_page):
+        """複数の注文がステータスごとに表示されること"""
+        employee_page.navigate()
+
+        orders = employee_page.page.locator(f"{employee_page.ORDERS_CONTAINER} > li")
+        expect(orders).to_have_count(len(app_seed.order_ids))
+        expect(orders.locator('.status[data-status="in_kitchen"]')).to_have_count(1)
+        # 調理中の注文には次のステータス（ready）へのボタンが表示される
+        expect(
+            orders.filter(has_text=app_seed.order_ids[-1]).locator(
+                'button[data-status="ready"]'
+            )
+        ).to_be_visible()
+
 
 class TestMultiLanguageSupport:
     """UX-002: 多言語対応のテスト"""
@@ -456,11 +445,11 @@ class TestMobileResponsiveness:
         expect(footer).to_be_visible()
 
     @pytest.mark.e2e
-    def test_tap_targets_size(self, table_session_page, menu_page):
+    @pytest.mark.table_session("T1")
+    def test_tap_targets_size(self, menu_page):
         """タップターゲットサイズのテスト（UX-001）"""
-        # セッション開始
-        table_session_page.navigate()
-        table_session_page.start_session("T1")
+        # セッション開始済みのメニュー画面を開く
+        menu_page.navigate()
 
         # ボタンのサイズをチェック（実装に依存）
         buttons = menu_page.page.locator("button")
@@ -477,28 +466,114 @@ class TestMobileResponsiveness:
                 ), f"ボタン {i} の幅が小さすぎます: {bounding_box['width']}px"
 
 
+class TestDeviceMatrix:
+    """COMP-001 & UX-001: デバイスマトリクスでのモバイル対応テスト
+
+    モバイル・タブレット・デスクトップの各デバイスを、1つのブラウザの別々の
+    コンテキストで並行して確認する（--devices で絞り込み・変更できる）。
+    非同期 API のループのスレッドで実行する。
+    """
+
+    @pytest.mark.e2e
+    @pytest.mark.devices("mobile", "tablet", "desktop")
+    async def test_viewport_rendering_on_each_device(
+        self, device_matrix, base_url: str
+    ):
+        """各デバイスのビューポートでの表示テスト"""
+
+        async def scenario(page, variant):
+            # デバイスのビューポートでページを表示
+            await AsyncTableSessionPage(page, base_url).navigate()
+
+            # ページが正常に表示されることを確認
+            await async_expect(page).to_have_title("Family Restaurant Ordering Demo")
+
+            # ヘッダー・メインコンテンツ・フッターが表示されることを確認
+            await async_expect(page.locator('header, [role="banner"]')).to_be_visible()
+            await async_expect(page.locator("main")).to_be_visible()
+            await async_expect(
+                page.locator('footer, [role="contentinfo"]')
+            ).to_be_visible()
+
+        await device_matrix.run(scenario)
+
+    @pytest.mark.e2e
+    @pytest.mark.devices("mobile", "tablet", "desktop")
+    @pytest.mark.table_session("T1")
+    async def test_tap_targets_size_on_each_device(self, device_matrix, base_url: str):
+        """各デバイスでのタップターゲットサイズのテスト（UX-001）"""
+
+        async def scenario(page, variant):
+            # セッション開始済みのメニュー画面を開く
+            await AsyncMenuPage(page, base_url).navigate()
+
+            # ボタンのサイズをチェック（実装に依存）
+            buttons = page.locator("button")
+            for i in range(
+                min(3, await buttons.count())
+            ):  # 最初の3つのボタンをチェック
+                bounding_box = await buttons.nth(i).bounding_box()
+                if bounding_box:
+                    # 44px以上のタップターゲットサイズを推奨（Webアクセシビリティガイドライン）
+                    assert (
+                        bounding_box["height"] >= 30
+                    ), f"ボタン {i} の高さが小さすぎます: {bounding_box['height']}px"
+                    assert (
+                        bounding_box["width"] >= 30
+                    ), f"ボタン {i} の幅が小さすぎます: {bounding_box['width']}px"
+
+        await device_matrix.run(scenario)
+
+
 class TestPerformance:
     """PERF-001: パフォーマンステスト"""
 
     @pytest.mark.e2e
-    def test_initial_page_load_performance(self, page: Page, base_url: str):
+    def test_initial_page_load_performance(
+        self, page: Page, base_url: str, perf_metrics
+    ):
         """初期ページロード性能のテスト"""
-        import time
-
-        # ページロード時間を測定
-        start_time = time.time()
         page.goto(base_url)
         page.wait_for_load_state("networkidle")
-        end_time = time.time()
 
-        load_time = end_time - start_time
+        # Navigation Timing / Paint Timing をブラウザから取得
+        metrics = perf_metrics.capture("initial-load")
+        load_time = metrics["navigation"]["loadEventEnd"] / 1000
 
         # 2秒以内でロードされることを確認（PERF-001）
         assert load_time < 2.0, f"ページロードが遅すぎます: {load_time:.2f}秒"
+        assert "first-contentful-paint" in metrics["paint"]
 
         # ページが正常に表示されることを確認
         expect(page).to_have_title("Family Restaurant Ordering Demo")
 
+    @pytest.mark.e2e
+    def test_initial_page_load_baseline(
+        self, context, base_url: str, perf_baseline, request
+    ):
+        """初期ページロード性能のベースライン比較（PERF-001）
+
+        --perf-samples 回ロードしてサンプルを記録し、--perf-gate 指定時は
+        過去の実行に対する有意な劣化で実行全体を失敗させる。1回ごとのサンプル
+        ではなく、中央値が PERF-001 の予算内であることを確認する。
+        """
+        load_times = []
+        for _ in range(request.config.getoption("perf_samples")):
+            page = context.new_page()
+            recorder = PerformanceRecorder(page)
+            page.goto(base_url)
+            page.wait_for_load_state("load")
+            metrics = recorder.capture("initial-load")
+            perf_baseline.add_capture(metrics)
+            recorder.close()
+            page.close()
+            load_times.append(metrics["navigation"]["loadEventEnd"])
+
+        # サンプルの中央値が PERF-001 の予算内であることを確認（劣化の判定は --perf-gate）
+        assert (
+            median(load_times) < 2000
+        ), f"ロード時間の中央値: {median(load_times):.0f}ms"
+
 
 @pytest.mark.integration
 class TestEndToEndUserFlow:
@@ -572,3 +647,47 @@ class TestEndToEndUserFlow:
         employee_page.switch_to_employee_mode()
         updated_orders_count = employee_page.get_orders_count()
         assert updated_orders_count >= orders_count, "追加注文が反映されていません"
+
+
+class TestConcurrentTables:
+    """非同期 Page Object による複数テーブルの並行操作"""
+
+    async def test_concurrent_table_orders(self, async_context_factory, base_url: str):
+        """複数テーブルが同時に注文を確定できる（REQ-005）"""
+
+        async def order_from_table(table_id: str) -> int:
+            context = await async_context_factory()
+            page = await context.new_page()
+            session_page = AsyncTableSessionPage(page, base_url)
+            menu_page = AsyncMenuPage(page, base_url)
+            await session_page.navigate()
+            await session_page.start_session(table_id)
+            await menu_page.click_menu_item("Margherita Pizza")
+            await AsyncMenuDetailDialog(page).add_to_cart()
+            await menu_page.open_cart()
+            await AsyncCartDialog(page).place_order()
+            return await page.evaluate("() => window.__appState.orders.length")
+
+        # 1つのイベントループで全テーブルを並行して操作
+        table_ids = [f"T{i}" for i in range(1, 11)]
+        orders = await asyncio.gather(*(order_from_table(t) for t in table_ids))
+
+        assert orders == [1] * len(table_ids)
+
+    @pytest.mark.table_session("T1")
+    async def test_open_cart_while_toast_fades(
+        self, async_menu_page, async_menu_detail_dialog, async_cart_dialog
+    ):
+        """トーストの消去待ちとカートを開く操作を重ねて実行できる"""
+        await async_menu_page.navigate()
+        await async_menu_page.click_menu_item("Margherita Pizza")
+        await async_menu_detail_dialog.add_to_cart()
+
+        # 独立した待機を並行して行う
+        await asyncio.gather(
+            async_menu_page.open_cart(), async_menu_page.wait_for_toasts_cleared()
+        )
+
+        await async_expect(
+            async_cart_dialog.page.locator(async_cart_dialog.DIALOG)
+        ).to_be_visible()
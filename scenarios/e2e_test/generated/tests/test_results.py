@@ -0,0 +1,70 @@
+"""オプション指定時だけ実行する計測の結果（results.OptInReport）のテスト"""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from results import OptInReport
+
+
+class FakeConfig:
+    def __init__(self, rootpath, **options):
+        self.rootpath = Path(rootpath)
+        self.options = options
+        self.stash = {}
+
+    def getoption(self, name):
+        return self.options.get(name)
+
+
+def test_report_is_enabled_by_its_option(tmp_path):
+    report = OptInReport("load", "load_tables", "dinner rush load", str)
+
+    assert not report.enabled(FakeConfig(tmp_path))
+    assert report.enabled(FakeConfig(tmp_path, load_tables="1,5"))
+    assert report.skip_reason() == "--load-tables 指定時のみ実行"
+
+
+def test_results_are_summarized_and_written(tmp_path):
+    report = OptInReport(
+        "leak",
+        "leak_iterations",
+        "leak detection",
+        lambda result: f"{result.name}\n-> {result.path}",
+        failed=lambda result: result.exceeded,
+    )
+    config = FakeConfig(tmp_path)
+    assert report.summary(config) == []
+
+    report.add(config, SimpleNamespace(name="toggle", path="a.json", exceeded=False))
+    report.add(config, SimpleNamespace(name="toast", path="b.json", exceeded=True))
+
+    assert report.summary(config) == [
+        ("toggle", False),
+        ("-> a.json", False),
+        ("toast", True),
+        ("-> b.json", True),
+    ]
+    path = report.write(config, "leaks/toast.json", {"exceeded": True})
+    assert path == str(tmp_path / "performance-results" / "leaks" / "toast.json")
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"exceeded": True}
+
+
+def test_report_with_several_options_and_a_computed_heading(tmp_path):
+    report = OptInReport(
+        "visual",
+        ("visual", "update_snapshots"),
+        lambda results: f"visual regression: {len(results)}",
+        lambda result: "" if result == "identical" else result,
+    )
+
+    assert not report.enabled(FakeConfig(tmp_path))
+    assert report.enabled(FakeConfig(tmp_path, update_snapshots=True))
+    assert report.skip_reason() == "--visual / --update-snapshots 指定時のみ実行"
+
+    config = FakeConfig(tmp_path, visual=True)
+    report.add(config, "identical", "changed")
+    assert report.heading(config) == "visual regression: 2"
+    # 空の行は表示しない
+    assert report.summary(config) == [("changed", False)]
@@ -0,0 +1,42 @@
+"""シード指定の変換のテスト"""
+
+import json
+
+import pytest
+
+from seeding import DEFAULT_ITEM, AppSeed, normalize_item, normalize_order
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("Caesar Salad", {"menu": "Caesar Salad", "quantity": 1}),
+        (("m1", 3), {"menu": "m1", "quantity": 3}),
+        ({"menu": "m2"}, {"menu": "m2", "quantity": 1}),
+    ],
+)
+def test_normalize_item(spec, expected):
+    assert normalize_item(spec) == expected
+
+
+def test_normalize_order_defaults_to_one_item():
+    assert normalize_order("in_kitchen") == {
+        "status": "in_kitchen",
+        "items": [{"menu": DEFAULT_ITEM, "quantity": 1}],
+    }
+
+
+def test_normalize_order_rejects_unknown_status():
+    with pytest.raises(ValueError):
+        normalize_order("cooking")
+
+
+def test_seed_order_ids_and_script():
+    seed = AppSeed("T1", cart=[("Caesar Salad", 2)], orders=["placed", "ready"])
+    assert seed.order_ids == ["o_seed_1", "o_seed_2"]
+    assert json.dumps(seed.to_json(), ensure_ascii=False) in seed.script()
+
+
+def test_seed_rejects_unknown_view():
+    with pytest.raises(ValueError):
+        AppSeed(view="kitchen")
@@ -0,0 +1,124 @@
+"""
+並列シャード実行（sharding.py）のユニットテスト
+"""
+
+import json
+import os
+import xml.etree.ElementTree as ET
+
+from sharding import merge_junit, merge_shard_outputs, partition
+
+
+class TestPartition:
+    """実行時間に基づくシャード割り当てのテスト"""
+
+    def test_balances_by_recorded_duration(self):
+        """長いテストが同じシャードに偏らないこと"""
+        durations = {"a": 10.0, "b": 9.0, "c": 2.0, "d": 1.0}
+        shards = partition(list(durations), durations, 2)
+        totals = sorted(sum(durations[n] for n in shard) for shard in shards)
+        assert totals == [11.0, 11.0]
+
+    def test_every_test_assigned_exactly_once(self):
+        """全テストがいずれか1つのシャードに割り当てられること"""
+        nodeids = [f"t{i}" for i in range(7)]
+        shards = partition(nodeids, {}, 3)
+        assigned = [n for shard in shards for n in shard]
+        assert sorted(assigned) == sorted(nodeids)
+
+    def test_deterministic_across_processes(self):
+        """収集順が異なっても同じ割り当てになること"""
+        durations = {"a": 1.0, "b": 1.0, "c": 3.0}
+        nodeids = ["a", "b", "c", "new"]
+        assert partition(nodeids, durations, 2) == partition(
+            list(reversed(nodeids)), durations, 2
+        )
+
+
+def test_merge_junit(tmp_path):
+    """シャードごとの JUnit XML の件数が合算されること"""
+    for index, (tests, failures) in enumerate([(3, 1), (2, 0)]):
+        (tmp_path / f"shard-{index}.xml").write_text(
+            f'<testsuites><testsuite name="pytest" tests="{tests}" '
+            f'failures="{failures}" errors="0" skipped="0" time="{index + 1}.5">'
+            f'<testcase classname="c" name="t{index}"/></testsuite></testsuites>'
+        )
+    output = tmp_path / "merged.xml"
+    merge_junit(
+        [str(tmp_path / "shard-0.xml"), str(tmp_path / "shard-1.xml")], str(output)
+    )
+
+    suite = ET.parse(output).getroot().find("testsuite")
+    assert suite.get("tests") == "5"
+    assert suite.get("failures") == "1"
+    assert suite.get("time") == "2.500"
+    assert len(suite.findall("testcase")) == 2
+
+
+def test_merge_shard_outputs(tmp_path):
+    """シャードごとの成果物・ステップ・ロケーター・マーカー別 JUnit がマージされること"""
+    artifacts = tmp_path / "artifacts"
+    artifacts.mkdir()
+    for index in range(2):
+        entry = {"test": f"t{index}", "captured_at": 2.0 - index, "files": {}}
+        (artifacts / f"manifest-shard-{index}.json").write_text(
+            json.dumps({"artifacts": [entry], "errors": [f"e{index}"]})
+        )
+        (tmp_path / f"step-timings-shard-{index}.jsonl").write_text(
+            json.dumps({"test": f"t{index}", "steps": []}) + "\n"
+        )
+        (tmp_path / f"locator-profile-shard-{index}.json").write_text(
+            json.dumps(
+                [
+                    {
+                        "name": "CART_ITEM",
+                        "selector": ".cart-item",
+                        "calls": 1 + index,
+                        "total_ms": 10.0 * (1 + index),
+                        "mean_ms": 10.0,
+                        "max_ms": 10.0 + index,
+                        "matches": [index, 2],
+                        "fast": {
+                            "selector": "#c",
+                            "mean_ms": 2.0 + index,
+                            "mismatches": index,
+                        },
+                    }
+                ]
+            )
+        )
+        (tmp_path / f"junit-e2e-shard-{index}.xml").write_text(
+            f'<testsuites><testsuite name="e2e" tests="{index + 1}" failures="0" '
+            f'errors="0" skipped="0" time="1"><testcase classname="c" name="t{index}"/>'
+            f"</testsuite></testsuites>"
+        )
+    # シャード自体の JUnit XML は run_parallel がマージするので対象外
+    (tmp_path / "junit-shard-0.xml").write_text("<testsuites/>")
+
+    merged = merge_shard_outputs(str(tmp_path), 2)
+
+    assert sorted(os.path.relpath(path, tmp_path) for path in merged) == [
+        os.path.join("artifacts", "manifest.json"),
+        "junit-e2e.xml",
+        "locator-profile.json",
+        "step-timings.jsonl",
+    ]
+    assert sorted(os.listdir(tmp_path)) == [
+        "artifacts",
+        "junit-e2e.xml",
+        "junit-shard-0.xml",
+        "locator-profile.json",
+        "step-timings.jsonl",
+    ]
+    manifest = json.loads((artifacts / "manifest.json").read_text())
+    assert [entry["test"] for entry in manifest["artifacts"]] == ["t1", "t0"]
+    assert manifest["errors"] == ["e0", "e1"]
+    steps = (tmp_path / "step-timings.jsonl").read_text().splitlines()
+    assert [json.loads(line)["test"] for line in steps] == ["t0", "t1"]
+    [locator] = json.loads((tmp_path / "locator-profile.json").read_text())
+    assert locator["calls"] == 3 and locator["total_ms"] == 30.0
+    assert locator["mean_ms"] == 10.0 and locator["max_ms"] == 11.0
+    assert locator["matches"] == [0, 2]
+    assert locator["fast"] == {"selector": "#c", "mean_ms": 2.667, "mismatches": 1}
+    suite = ET.parse(tmp_path / "junit-e2e.xml").getroot().find("testsuite")
+    assert suite.get("name") == "e2e" and suite.get("tests") == "3"
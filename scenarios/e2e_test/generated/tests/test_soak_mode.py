@@ -0,0 +1,113 @@
+"""ソークテストモードの計画と時系列の集計のテスト"""
+
+import json
+
+import pytest
+
+from soak_mode import (
+    SAMPLE_EVERY_MINUTES,
+    SoakShift,
+    degradation,
+    describe,
+    load_series,
+    plan_shift,
+    summarize_series,
+)
+
+
+def sample(minute: float, heap: float = 0, latency=None, errors=()) -> dict:
+    return {
+        "shift_minute": minute,
+        "elapsed_s": minute / 48 * 60,
+        "lag_s": 0.0,
+        "heap_bytes": heap,
+        "dom_nodes": 100,
+        "listeners": 10,
+        "board": {},
+        "open_tables": 0,
+        "latency_ms": latency or {},
+        "errors": list(errors),
+    }
+
+
+def test_plan_shift_orders_each_visit_within_the_shift():
+    events = plan_shift(hours=4, tables=3, seed=7)
+
+    assert events == plan_shift(hours=4, tables=3, seed=7)
+    assert [e["at"] for e in events] == sorted(e["at"] for e in events)
+    assert all(e["at"] <= 4 * 60 for e in events)
+    samples = [e for e in events if e["kind"] == "sample"]
+    assert len(samples) == 4 * 60 // SAMPLE_EVERY_MINUTES + 1
+
+    # 注文ごとに placed 以降のステータスが順に進み、会計・退店はその後
+    for table in ("T1", "T2", "T3"):
+        seated = False
+        for event in (e for e in events if e.get("table") == table):
+            assert seated == (event["kind"] != "arrive")
+            seated = event["kind"] != "leave"
+        assert not seated
+    orders = {e["order"]: e["at"] for e in events if e["kind"] == "order"}
+    statuses = {}
+    for event in events:
+        if event["kind"] == "status":
+            assert event["at"] > orders[event["order"]]
+            statuses.setdefault(event["order"], []).append(event["status"])
+    assert set(statuses) == set(orders)
+    assert all(s == ["in_kitchen", "ready", "served"] for s in statuses.values())
+
+
+def test_plan_shift_samples_at_the_end_of_the_shift():
+    # シフトの長さが SAMPLE_EVERY_MINUTES で割り切れなくても、終わりにサンプルを取る
+    hours = (2 * SAMPLE_EVERY_MINUTES + SAMPLE_EVERY_MINUTES / 2) / 60
+    events = plan_shift(hours=hours, tables=1)
+    samples = [e["at"] for e in events if e["kind"] == "sample"]
+
+    assert samples == [0, SAMPLE_EVERY_MINUTES, 2 * SAMPLE_EVERY_MINUTES, hours * 60]
+    assert events[-1] == {"at": hours * 60, "kind": "sample"}
+
+
+def test_shift_rejects_non_positive_duration():
+    with pytest.raises(pytest.UsageError):
+        SoakShift(None, "", hours=8, minutes=0)
+
+
+def test_summarize_series_growth_and_degradation():
+    samples = [
+        sample(
+            minute,
+            heap=1000 * minute / SAMPLE_EVERY_MINUTES,
+            latency={"status": [100.0, 120.0] if minute <= 60 else [250.0, 250.0]},
+        )
+        for minute in range(0, 181, SAMPLE_EVERY_MINUTES)
+    ]
+    samples[3]["errors"].append({"at": 30, "action": "seat", "error": "Timeout"})
+
+    summary = summarize_series(samples, "completed")
+
+    assert summary["samples"] == 19
+    assert summary["actions"] == {"status": 38}
+    assert summary["errors"] == 1
+    # 1サンプル（10分）あたり 1000 バイト → シフト1時間あたり 6000 バイト
+    assert summary["growth_per_hour"]["heap_bytes"] == pytest.approx(6000)
+
+    # シフトの終わりの間隔の短いサンプルがあっても、傾きは時刻に対して求める
+    samples.append(sample(185, heap=1000 * 185 / SAMPLE_EVERY_MINUTES))
+    growth = summarize_series(samples, "completed")["growth_per_hour"]
+    assert growth["heap_bytes"] == pytest.approx(6000)
+    assert summary["degradation"]["status"] == pytest.approx(250 / 110)
+    assert "slowest drift status" in describe(summary)
+
+
+def test_degradation_needs_two_hours_of_samples():
+    assert degradation([sample(m, latency={"seat": [1.0]}) for m in (0, 60, 110)]) == {}
+
+
+def test_load_series_ignores_truncated_last_line(tmp_path):
+    path = tmp_path / "shift.jsonl"
+    lines = [json.dumps(sample(m)) for m in (0, 10)]
+    path.write_text("\n".join(lines) + '\n{"shift_minute": 2', encoding="utf-8")
+
+    samples = load_series(str(path))
+
+    assert [s["shift_minute"] for s in samples] == [0, 10]
+    assert summarize_series(samples, "from series")["shift_minutes"] == 10
@@ -0,0 +1,47 @@
+"""
+営業1シフトを圧縮したソークテスト
+
+来店・注文・ステータスの進行・会計リクエスト・退店を --soak-hours 分のシフト
+として計画し、--soak-minutes の実時間に圧縮して流す。開いたままの従業員画面の
+GC 後のヒープ・DOM ノード・イベントリスナーと操作の応答時間を時系列で記録し、
+シフトの終わりに向けて応答時間が悪化していないことを確認する。
+"""
+
+import pytest
+
+from soak_mode import DEGRADATION_LIMIT, SOAK_REPORT, SoakShift, describe
+
+
+@pytest.mark.soak
+@pytest.mark.isolated
+def test_compressed_shift(context, base_url: str, request):
+    """シフトを通して注文が滞りなく処理され、操作が遅くならないこと"""
+    config = request.config
+    shift = SoakShift(
+        context,
+        base_url,
+        hours=config.getoption("soak_hours"),
+        minutes=config.getoption("soak_minutes"),
+        tables=config.getoption("soak_tables"),
+    )
+    try:
+        summary = shift.run(
+            SOAK_REPORT.path(config, "soak/shift.jsonl"),
+            SOAK_REPORT.path(config, "soak/shift-summary.json"),
+        )
+    finally:
+        # 中断・失敗した場合も途中までのサマリーを表示する
+        if shift.summary is not None:
+            SOAK_REPORT.add(config, shift.summary)
+
+    assert summary["errors"] == 0, describe(summary)
+
+    # 確定したすべての注文が従業員画面に届き、提供済みになっていることを確認
+    assert summary["end"]["board"] == {"served": summary["actions"]["place_order"]}
+
+    slower = {
+        action: ratio
+        for action, ratio in summary["degradation"].items()
+        if ratio > DEGRADATION_LIMIT
+    }
+    assert not slower, f"シフトの最後の1時間で応答時間が悪化しました: {slower}"
@@ -0,0 +1,73 @@
+"""Page Object のステップ計測のテスト"""
+
+import asyncio
+import contextvars
+import json
+
+from async_pages import run_in_thread
+from step_timing import StepRecorder, StepTimings, step
+
+
+def names(nodes):
+    return [(n["name"], names(n.get("children", []))) for n in nodes]
+
+
+def test_steps_are_ignored_outside_a_recorder():
+    def run():
+        with step("MenuPage.navigate"):
+            return "done"
+
+    # 自動で有効になるフィクスチャの記録の外側（空のコンテキスト）で実行
+    assert contextvars.Context().run(run) == "done"
+
+
+def test_nested_steps_form_a_tree():
+    recorder = StepRecorder()
+    with recorder.activate():
+        with step("MenuPage.filter_by_category"):
+            with step("MenuPage.settle"):
+                pass
+        with step("CartDialog.place_order"):
+            pass
+
+    assert names(recorder.to_json()) == [
+        ("MenuPage.filter_by_category", [("MenuPage.settle", [])]),
+        ("CartDialog.place_order", []),
+    ]
+
+
+def test_concurrent_async_steps_keep_their_own_parents():
+    recorder = StepRecorder()
+
+    async def table(name):
+        with step(name):
+            await asyncio.sleep(0)
+            with step(f"{name}.child"):
+                await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(table("T1"), table("T2"))
+
+    with recorder.activate():
+        run_in_thread(main())
+
+    assert sorted(names(recorder.to_json())) == [
+        ("T1", [("T1.child", [])]),
+        ("T2", [("T2.child", [])]),
+    ]
+
+
+def test_step_timings_writes_trees_and_aggregates(tmp_path):
+    timings = StepTimings(str(tmp_path / "steps.jsonl"))
+    for nodeid in ("test_a", "test_b"):
+        recorder = StepRecorder()
+        with recorder.activate():
+            with step("MenuPage.navigate"):
+                pass
+        timings.add(nodeid, recorder)
+    timings.add("test_empty", StepRecorder())
+    timings.close()
+
+    lines = (tmp_path / "steps.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["test"] for line in lines] == ["test_a", "test_b"]
+    assert [row[:2] for row in timings.slowest(5)] == [("MenuPage.navigate", 2)]
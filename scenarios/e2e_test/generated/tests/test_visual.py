@@ -0,0 +1,174 @@
+"""ビジュアルリグレッションの差分計算とベースラインキャッシュのテスト"""
+
+import os
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from visual import (  # noqa: E402
+    BaselineCache,
+    Region,
+    VisualSnapshot,
+    compare,
+    describe,
+    dhash,
+    diff_image,
+    hamming,
+)
+
+
+def frame(width=40, height=30, color=(240, 240, 240)):
+    return np.full((height, width, 3), color, dtype=np.uint8)
+
+
+def test_identical_frames_match():
+    result, changed = compare(frame(), frame())
+    assert result["match"] and result["changed_pixels"] == 0
+    assert result["bbox"] is None and not changed.any()
+
+
+def test_small_color_shift_is_within_pixel_threshold():
+    result, _ = compare(frame(color=(250, 240, 240)), frame())
+    assert result["match"]
+
+
+def test_region_with_stricter_tolerance_fails():
+    actual = frame()
+    actual[5:7, 10:12] = (0, 0, 0)
+    region = Region("total", (8, 4, 8, 4), max_diff_ratio=0)
+    result, changed = compare(actual, frame(), [region], max_diff_ratio=0.01)
+    assert [r["passed"] for r in result["regions"]] == [True, False]
+    assert not result["match"]
+    assert result["bbox"] == [10, 5, 2, 2] and int(changed.sum()) == 4
+
+
+def test_size_mismatch_is_reported():
+    result, changed = compare(frame(width=41), frame())
+    assert not result["match"] and changed is None
+    assert result["reason"] == "size 40x30 -> 41x30"
+
+
+def test_dhash_is_stable_under_small_noise():
+    base = frame()
+    base[:, :20] = (20, 20, 20)
+    noisy = base.copy()
+    noisy[0, 39] = (235, 240, 240)
+    assert hamming(dhash(base), dhash(noisy)) == 0
+    assert hamming(dhash(base), dhash(frame())) > 0
+
+
+def test_diff_image_marks_changed_pixels_red(tmp_path):
+    changed = np.zeros((30, 40), dtype=bool)
+    changed[3, 4] = True
+    path = tmp_path / "diff.png"
+    path.write_bytes(diff_image(frame(), changed))
+    pixels = np.asarray(Image.open(path).convert("RGB"))
+    assert tuple(pixels[3, 4]) == (255, 0, 0)
+    assert tuple(pixels[0, 0]) != (255, 0, 0)
+
+
+def test_baseline_cache_decodes_once_and_memory_maps(tmp_path):
+    baseline = tmp_path / "menu.png"
+    Image.fromarray(frame()).save(baseline)
+    cache = BaselineCache(str(tmp_path / "decoded"))
+    digest, pixels, _ = cache.load(str(baseline))
+    assert isinstance(pixels, np.memmap)
+    assert os.listdir(tmp_path / "decoded") == [f"{digest}.npy"]
+    assert cache.load(str(baseline))[1] is pixels
+
+    # 別のプロセス（新しいキャッシュ）でもデコード済みのファイルを使う
+    assert np.array_equal(
+        BaselineCache(cache.directory).load(str(baseline))[1], frame()
+    )
+
+    # ベースラインが更新されたら読み直す
+    Image.fromarray(frame(color=(0, 0, 0))).save(baseline)
+    assert cache.load(str(baseline))[0] != digest
+
+
+class FakePage:
+    """スクリーンショットとして固定の PNG を返すページ"""
+
+    viewport_size = {"width": 40, "height": 30}
+
+    def __init__(self, png):
+        self.png = png
+
+    def locator(self, selector):
+        return selector
+
+    def screenshot(self, **options):
+        return self.png
+
+
+def png_bytes(pixels) -> bytes:
+    buffer = BytesIO()
+    Image.fromarray(pixels).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_missing_baseline_fails_unless_updating(tmp_path):
+    page = FakePage(png_bytes(frame()))
+    baselines = tmp_path / "baselines"
+    cache = BaselineCache(str(tmp_path / "cache"))
+
+    def snapshot(update):
+        return VisualSnapshot(page, cache, str(baselines), str(tmp_path), update)
+
+    result = snapshot(update=False)("menu")
+    assert result["status"] == "missing"
+    assert not os.path.exists(result["baseline"])
+
+    assert snapshot(update=True)("menu")["status"] == "created"
+    assert snapshot(update=False)("menu")["status"] == "identical"
+    assert snapshot(update=True)("menu")["status"] == "updated"
+
+
+def test_hash_prefilter_skips_the_pixel_diff(tmp_path):
+    cache = BaselineCache(str(tmp_path / "cache"))
+    baselines = str(tmp_path / "baselines")
+    pixels = frame()
+    pixels[:] = (np.arange(40, dtype=np.uint8) * 6)[
+        None, :, None
+    ]  # 横方向のグラデーション
+    VisualSnapshot(FakePage(png_bytes(pixels)), cache, baselines, str(tmp_path), True)(
+        "menu"
+    )
+
+    # 1画素だけ変えた画像（PNG のバイト列は異なるが見た目はほぼ同じ）
+    touched = pixels.copy()
+    touched[5, 5] += 40
+    snapshot = VisualSnapshot(
+        FakePage(png_bytes(touched)), cache, baselines, str(tmp_path)
+    )
+    result = snapshot("menu")
+    assert result["status"] == "hash match" and result["hash_distance"] == 0
+    assert "changed_pixels" not in result
+
+    # 領域の許容値を指定した比較は、ハッシュが同じでも画素を比較する
+    snapshot.page.locator = lambda selector: SimpleNamespace(
+        bounding_box=lambda: {"x": 0, "y": 0, "width": 10, "height": 10}
+    )
+    result = snapshot("menu", regions={"corner": ("#corner", 0)})
+    assert result["status"] == "changed" and result["changed_pixels"] == 1
+
+
+def test_describe_lists_failed_regions():
+    result = {
+        "name": "cart-375x667",
+        "status": "changed",
+        "changed_pixels": 12,
+        "hash_distance": 3,
+        "regions": [
+            {"name": "page", "changed_ratio": 0.0005, "limit": 0.001, "passed": True},
+            {"name": "total", "changed_ratio": 0.25, "limit": 0.0, "passed": False},
+        ],
+    }
+    assert describe(result) == (
+        "cart-375x667: changed, 12 px changed, dHash distance 3 "
+        "[total 25.00% > 0.00%]"
+    )
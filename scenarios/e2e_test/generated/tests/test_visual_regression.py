@@ -0,0 +1,46 @@
+"""
+画面とダイアログのビジュアルリグレッション
+
+モバイルのビューポートでスクリーンショットを撮り、tests/visual-baselines/ の
+ベースラインと比較する（numpy・Pillow が必要）。--visual 指定時だけ実行し、
+ベースラインがなければ失敗する。ベースラインの作成と、画面の変更を意図した場合の
+更新は --update-snapshots で行う。
+"""
+
+import pytest
+
+from pages import BasePage, CartDialog, MenuDetailDialog, MenuPage
+
+# 表示のたびに変わる要素（撮影時に塗りつぶす）
+DYNAMIC = [BasePage.TOAST]
+
+
+@pytest.mark.visual
+@pytest.mark.table_session("T1")
+def test_menu_page(menu_page, visual_snapshot):
+    """メニュー画面"""
+    menu_page.navigate()
+    visual_snapshot("menu", mask=DYNAMIC, regions={"grid": (MenuPage.MENU_GRID, 0)})
+
+
+@pytest.mark.visual
+@pytest.mark.table_session("T1")
+def test_menu_detail_dialog(menu_page, visual_snapshot):
+    """メニュー詳細ダイアログ"""
+    menu_page.navigate()
+    menu_page.click_menu_item("Margherita Pizza")
+    visual_snapshot("menu-detail-dialog", MenuDetailDialog.DIALOG, mask=DYNAMIC)
+
+
+@pytest.mark.visual
+@pytest.mark.seed("T1", cart=[("Margherita Pizza", 2)])
+def test_cart_dialog(app_seed, menu_page, visual_snapshot):
+    """カート（合計金額は許容値なしで比較）"""
+    menu_page.navigate()
+    menu_page.open_cart()
+    visual_snapshot(
+        "cart",
+        CartDialog.DIALOG,
+        mask=DYNAMIC,
+        regions={"total": (CartDialog.TOTAL_AMOUNT, 0)},
+    )
@@ -0,0 +1,332 @@
+# スクリーンショットのベースライン比較（ビジュアルリグレッション）
+import getpass
+import hashlib
+import os
+import tempfile
+from collections import Counter
+from io import BytesIO
+
+from results import opt_in_report
+
+try:  # 任意の依存（未インストールの場合、visual_snapshot を使うテストはスキップ）
+    import numpy as np
+    from PIL import Image
+except ImportError:
+    np = Image = None
+
+# ベースライン画像の既定の保存先（tests/ 配下）
+DEFAULT_BASELINE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "tests", "visual-baselines"
+)
+
+
+def decode_cache_dir() -> str:
+    """デコード済みのベースライン（.npy）の既定の保存先（ユーザーごと）"""
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):  # 環境変数にもパスワードデータベースにもない場合
+        user = "user"
+    return os.path.join(tempfile.gettempdir(), f"restaurant-e2e-visual-{user}")
+
+
+# 画素ごとの許容値: チャンネルの差がこれ以下なら同じ画素とみなす（アンチエイリアス等）
+PIXEL_THRESHOLD = 16
+
+# 領域ごとの許容値: 変化した画素の割合がこれ以下なら一致とみなす
+MAX_DIFF_RATIO = 0.001
+
+# 知覚ハッシュ（dHash）の一辺の大きさ（ビット数は HASH_SIZE ** 2）
+HASH_SIZE = 8
+
+# 知覚ハッシュの距離がこれ以下なら、画素の比較をせずに一致とみなす
+# （領域ごとの許容値を指定した比較は、小さな変化も調べるため常に画素を比較する）
+MAX_HASH_DISTANCE = 0
+
+
+def decode(png: bytes):
+    """PNG を (高さ, 幅, 3) の uint8 配列にデコード"""
+    return np.asarray(Image.open(BytesIO(png)).convert("RGB"))
+
+
+def dhash(pixels, size: int = HASH_SIZE) -> int:
+    """隣り合う画素の明暗の差による知覚ハッシュ（dHash）"""
+    gray = Image.fromarray(np.ascontiguousarray(pixels)).convert("L")
+    small = np.asarray(gray.resize((size + 1, size), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    """2つのハッシュの異なるビット数"""
+    return bin(a ^ b).count("1")
+
+
+class Region:
+    """個別の許容値で比較する領域（スクリーンショット上の画素座標）"""
+
+    def __init__(self, name: str, box: tuple, max_diff_ratio: float = None):
+        self.name = name
+        self.box = box  # (x, y, 幅, 高さ)
+        self.max_diff_ratio = max_diff_ratio
+
+
+def compare(
+    actual,
+    baseline,
+    regions=(),
+    pixel_threshold: int = PIXEL_THRESHOLD,
+    max_diff_ratio: float = MAX_DIFF_RATIO,
+):
+    """画像全体と領域ごとに変化した画素の割合を求め、(結果, 変化した画素のマスク) を返す"""
+    if actual.shape != baseline.shape:
+        return {
+            "match": False,
+            "reason": f"size {baseline.shape[1]}x{baseline.shape[0]} -> "
+            f"{actual.shape[1]}x{actual.shape[0]}",
+        }, None
+    delta = np.abs(actual.astype(np.int16) - baseline.astype(np.int16)).max(axis=2)
+    changed = delta > pixel_threshold
+    height, width = changed.shape
+    checked = [Region("page", (0, 0, width, height), max_diff_ratio), *regions]
+    results = []
+    for region in checked:
+        x, y, w, h = region.box
+        area = changed[max(y, 0) : y + h, max(x, 0) : x + w]
+        ratio = float(area.mean()) if area.size else 0.0
+        limit = (
+            max_diff_ratio if region.max_diff_ratio is None else region.max_diff_ratio
+        )
+        results.append(
+            {
+                "name": region.name,
+                "changed_ratio": ratio,
+                "limit": limit,
+                "passed": ratio <= limit,
+            }
+        )
+    rows = np.flatnonzero(changed.any(axis=1))
+    cols = np.flatnonzero(changed.any(axis=0))
+    bbox = None
+    if rows.size:
+        bbox = [
+            int(cols[0]),
+            int(rows[0]),
+            int(cols[-1] - cols[0] + 1),
+            int(rows[-1] - rows[0] + 1),
+        ]
+    return {
+        "match": all(r["passed"] for r in results),
+        "changed_pixels": int(changed.sum()),
+        "bbox": bbox,
+        "regions": results,
+    }, changed
+
+
+def diff_image(baseline, changed) -> bytes:
+    """ベースラインを薄く表示し、変化した画素を赤で示した PNG"""
+    gray = (baseline.mean(axis=2) * 0.3 + 178).astype(np.uint8)
+    output = np.repeat(gray[:, :, None], 3, axis=2)
+    output[changed] = (255, 0, 0)
+    buffer = BytesIO()
+    Image.fromarray(output).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class BaselineCache:
+    """ベースライン画像のデコード結果のキャッシュ
+
+    デコードした画素は PNG の内容のハッシュをキーに .npy で保存し、以降は
+    実行をまたいでメモリマップで読む。実行中は (ハッシュ, 画素, dHash) を
+    メモリ上にも保持し、同じベースラインを何度比較してもデコードは1回になる。
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory or decode_cache_dir()
+        self.entries = {}
+
+    def load(self, path: str) -> tuple:
+        """ベースラインの (PNG のハッシュ, 画素, dHash)"""
+        with open(path, "rb") as f:
+            png = f.read()
+        digest = hashlib.sha256(png).hexdigest()
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == digest:
+            return entry
+        cached = os.path.join(self.directory, f"{digest}.npy")
+        try:
+            pixels = np.load(cached, mmap_mode="r")
+        except (OSError, ValueError):
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{cached}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, decode(png))
+            os.replace(tmp, cached)
+            pixels = np.load(cached, mmap_mode="r")
+        entry = self.entries[path] = (digest, pixels, dhash(pixels))
+        return entry
+
+
+class VisualSnapshot:
+    """ページ・要素のスクリーンショットをベースラインと比較する
+
+    ベースラインはビューポートの大きさごとに ``<名前>-<幅>x<高さ>.png`` で保存する。
+    撮影した PNG がベースラインとバイト単位で同じならデコードも画素の比較も
+    せずに一致とする。異なる場合は知覚ハッシュ（dHash）を先に比べ、距離が
+    max_hash_distance 以下なら画素の比較をせずに一致（"hash match"）とし、
+    それ以外（または領域を指定した場合）だけ画素の差分を求める。ベースラインがない場合は "missing" とし、
+    update（--update-snapshots）指定時だけ撮影画像をベースラインとして保存する。
+    """
+
+    def __init__(
+        self,
+        page,
+        cache: BaselineCache,
+        baseline_dir: str,
+        output_dir: str,
+        update: bool = False,
+    ):
+        self.page = page
+        self.cache = cache
+        self.baseline_dir = baseline_dir
+        self.output_dir = output_dir
+        self.update = update
+
+    def resolve_regions(self, target, regions: dict, scale: float) -> list:
+        """{名前: (セレクタ, 許容値)} を撮影範囲の画素座標の Region に変換"""
+        origin = (0, 0)
+        if target is not None:
+            box = self.page.locator(target).bounding_box()
+            origin = (box["x"], box["y"])
+        resolved = []
+        for name, (selector, max_diff_ratio) in regions.items():
+            box = self.page.locator(selector).bounding_box()
+            if box is None:
+                continue
+            resolved.append(
+                Region(
+                    name,
+                    (
+                        int((box["x"] - origin[0]) * scale),
+                        int((box["y"] - origin[1]) * scale),
+                        int(box["width"] * scale),
+                        int(box["height"] * scale),
+                    ),
+                    max_diff_ratio,
+                )
+            )
+        return resolved
+
+    def __call__(
+        self,
+        name: str,
+        target: str = None,
+        regions: dict = None,
+        mask=(),
+        max_diff_ratio: float = MAX_DIFF_RATIO,
+        max_hash_distance: int = MAX_HASH_DISTANCE,
+    ) -> dict:
+        """target（省略時はページ全体）を撮影して比較し、結果を返す"""
+        viewport = self.page.viewport_size or {"width": 0, "height": 0}
+        key = f"{name}-{viewport['width']}x{viewport['height']}"
+        subject = self.page if target is None else self.page.locator(target)
+        png = subject.screenshot(
+            animations="disabled",
+            caret="hide",
+            mask=[self.page.locator(selector) for selector in mask],
+        )
+        baseline_path = os.path.join(self.baseline_dir, f"{key}.png")
+        result = {"name": key, "baseline": baseline_path}
+        exists = os.path.exists(baseline_path)
+        if not exists and not self.update:
+            # ベースラインは --update-snapshots で明示的に作成する
+            result["status"] = "missing"
+            return result
+        if self.update:
+            os.makedirs(self.baseline_dir, exist_ok=True)
+            with open(baseline_path, "wb") as f:
+                f.write(png)
+            result["status"] = "updated" if exists else "created"
+            return result
+
+        digest, baseline, baseline_hash = self.cache.load(baseline_path)
+        if hashlib.sha256(png).hexdigest() == digest:
+            result["status"] = "identical"
+            return result
+
+        # 知覚ハッシュで先に絞り込み、見た目が同じなら画素の比較を省く
+        actual = decode(png)
+        result["hash_distance"] = hamming(dhash(actual), baseline_hash)
+        if (
+            not regions
+            and actual.shape == baseline.shape
+            and result["hash_distance"] <= max_hash_distance
+        ):
+            result["status"] = "hash match"
+            return result
+
+        css_width = viewport["width"] if target is None else None
+        if css_width is None:
+            css_width = self.page.locator(target).bounding_box()["width"]
+        scale = actual.shape[1] / css_width if css_width else 1.0
+        comparison, changed = compare(
+            actual,
+            baseline,
+            self.resolve_regions(target, regions or {}, scale),
+            max_diff_ratio=max_diff_ratio,
+        )
+        result.update(comparison)
+        if comparison["match"]:
+            result["status"] = "within tolerance"
+            return result
+
+        result["status"] = "changed"
+        os.makedirs(self.output_dir, exist_ok=True)
+        result["actual"] = os.path.join(self.output_dir, f"{key}.actual.png")
+        with open(result["actual"], "wb") as f:
+            f.write(png)
+        if changed is not None:
+            result["diff"] = os.path.join(self.output_dir, f"{key}.diff.png")
+            with open(result["diff"], "wb") as f:
+                f.write(diff_image(baseline, changed))
+        return result
+
+
+def describe(result: dict) -> str:
+    """比較結果の表示用の1行"""
+    line = f"{result['name']}: {result['status']}"
+    if "reason" in result:
+        return f"{line} ({result['reason']})"
+    if "regions" in result:
+        failed = [
+            f"{r['name']} {r['changed_ratio']:.2%} > {r['limit']:.2%}"
+            for r in result["regions"]
+            if not r["passed"]
+        ]
+        line += f", {result['changed_pixels']} px changed"
+        line += f", dHash distance {result['hash_distance']}"
+        if failed:
+            line += f" [{'; '.join(failed)}]"
+    return line
+
+
+def heading(results: list) -> str:
+    """サマリーの見出し（状態ごとの件数）"""
+    statuses = Counter(result["status"] for result in results)
+    return "visual regression: " + ", ".join(
+        f"{count} {status}" for status, count in statuses.items()
+    )
+
+
+def describe_change(result: dict) -> str:
+    """サマリー表示用の行（ベースラインと同じ結果は表示しない）"""
+    return "" if result["status"] == "identical" else describe(result)
+
+
+# --visual / --update-snapshots 指定時だけ実行し、比較結果をサマリーに表示する
+VISUAL_REPORT = opt_in_report(
+    "visual",
+    ("visual", "update_snapshots"),
+    heading,
+    describe_change,
+    failed=lambda result: result["status"] in ("changed", "missing"),
+)